@@ -1,8 +1,6 @@
 import logging
-import asyncio
 from datetime import timedelta, datetime
-from typing import Any, Dict, Optional, List, Union
-import time
+from typing import Any, Callable, Dict, Optional, List, Tuple, Union
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
@@ -12,20 +10,24 @@ from homeassistant.const import (
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
     ATTR_TEMPERATURE,
-    STATE_ON,
-    STATE_OPEN,
 )
 from homeassistant.core import HomeAssistant, ServiceCall, callback, Event
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval, async_track_state_change_event
+from homeassistant.helpers.event import async_call_later, async_track_time_interval, async_track_state_change_event
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.entity_platform import async_get_platforms
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CONF_HEAT_PUMP,
+    CONF_LAG_HEAT_PUMPS,
+    CONF_STAGE_DELAY,
+    CONF_STAGE_ERROR,
     CONF_ROOM_SENSOR,
     CONF_OUTSIDE_SENSOR,
     CONF_AVERAGE_SENSOR,
@@ -33,91 +35,199 @@ from .const import (
     CONF_WINDOW_SENSORS,
     CONF_WINDOW_DELAY,
     CONF_BED_SENSORS,
+    CONF_SLEEP_AGGREGATION,
+    CONF_SLEEP_DEBOUNCE,
     CONF_HEAT_PUMP_CONTACT,
     CONF_COMFORT_TEMP,
     CONF_ECO_TEMP,
     CONF_BOOST_TEMP,
+    CONF_BOOST_DURATION,
     CONF_COOLING_TEMP,
     CONF_DEADBAND_BELOW,
     CONF_DEADBAND_ABOVE,
     CONF_MAX_HOUSE_TEMP,
     CONF_WEATHER_COMP_FACTOR,
+    CONF_CURVE_START_TEMP,
+    CONF_CURVE_MAX_OFFSET,
+    CONF_CURVE_POINTS,
+    CONF_CURVE_HYSTERESIS,
+    CONF_FORECAST_ENTITY,
+    CONF_FORECAST_FILE,
+    CONF_FORECAST_LOOKAHEAD,
+    CONF_PRICE_ENTITY,
+    CONF_PRICE_ATTRIBUTE,
+    CONF_PRICE_FILE,
+    CONF_TARIFF_PREHEAT,
+    CONF_TARIFF_THRESHOLD,
+    CONF_SCHEDULE,
+    CONF_SCHEDULE_PREHEAT,
     CONF_MAX_COMP_TEMP,
     CONF_MIN_COMP_TEMP,
     CONF_PRESENCE_TRACKER,
     CONF_LOW_TEMP_THRESHOLD,
     CONF_SAFETY_CUTOFF,
+    CONF_DEBUG_VERBOSITY,
+    CONF_ACTUATOR_MIN_INTERVAL,
+    CONF_ACTUATOR_BUDGET,
+    CONF_EVENT_HEARTBEAT,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_SENSOR_MAX_RATE,
+    CONF_SENSOR_FILTER,
+    CONF_SENSOR_FILTER_WINDOW,
+    CONF_ROOM_SENSORS,
+    CONF_ROOM_OUTLIER,
+    DEBUG_VERBOSITY_FULL,
     DEFAULT_COMFORT_TEMP,
     DEFAULT_ECO_TEMP,
     DEFAULT_BOOST_TEMP,
+    DEFAULT_BOOST_DURATION,
     DEFAULT_COOLING_TEMP,
     DEFAULT_DEADBAND,
     DEFAULT_MAX_HOUSE_TEMP,
     DEFAULT_WEATHER_COMP_FACTOR,
+    DEFAULT_CURVE_START_TEMP,
+    DEFAULT_CURVE_MAX_OFFSET,
+    DEFAULT_CURVE_HYSTERESIS,
+    DEFAULT_SETPOINT_STEP,
+    DEFAULT_FORECAST_LOOKAHEAD,
+    DEFAULT_PRICE_ATTRIBUTE,
+    DEFAULT_TARIFF_PREHEAT,
+    DEFAULT_TARIFF_THRESHOLD,
+    DEFAULT_SCHEDULE_PREHEAT,
+    DEFAULT_STAGE_DELAY,
+    DEFAULT_STAGE_ERROR,
     DEFAULT_MAX_COMP_TEMP,
     DEFAULT_MIN_COMP_TEMP,
     DEFAULT_LOW_TEMP_THRESHOLD,
     DEFAULT_SAFETY_CUTOFF,
     DEFAULT_WINDOW_DELAY,
+    DEFAULT_SLEEP_AGGREGATION,
+    DEFAULT_SLEEP_DEBOUNCE,
+    DEFAULT_DEBUG_VERBOSITY,
+    DEFAULT_ACTUATOR_MIN_INTERVAL,
+    DEFAULT_ACTUATOR_BUDGET,
+    DEFAULT_EVENT_HEARTBEAT,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_SENSOR_MAX_RATE,
+    DEFAULT_SENSOR_FILTER,
+    DEFAULT_SENSOR_FILTER_WINDOW,
+    DEFAULT_ROOM_OUTLIER,
     # Ventilation
     CONF_FAN_GROUP_A,
     CONF_FAN_GROUP_B,
     CONF_HUMIDITY_SENSOR_A,
     CONF_HUMIDITY_SENSOR_B,
+    CONF_OUTSIDE_HUMIDITY_SENSOR,
     CONF_VENT_CYCLE_TIME,
     CONF_VENT_DURATION,
     CONF_VENT_MAX_DURATION,
     CONF_HUMIDITY_THRESHOLD,
     CONF_VENT_AUTO_INTERVAL,
     CONF_VENT_FAN_SPEED,
+    CONF_HUMIDITY_RISE_RATE,
+    CONF_HUMIDITY_RISE_WINDOW,
+    CONF_VENT_CYCLE_MODE,
+    CONF_VENT_CYCLE_MIN,
+    CONF_VENT_CYCLE_MAX,
+    VENT_CYCLE_MODE_ADAPTIVE,
+    CONF_VENT_HEATING_COORDINATION,
+    CONF_VENT_HEATING_FAN_SPEED,
+    CONF_VENT_ZONES,
+    HEAVY_HEATING_DEFICIT,
     DEFAULT_VENT_CYCLE_TIME,
     DEFAULT_VENT_DURATION,
     DEFAULT_VENT_MAX_DURATION,
     DEFAULT_HUMIDITY_THRESHOLD,
     DEFAULT_VENT_AUTO_INTERVAL,
     DEFAULT_VENT_FAN_SPEED,
+    DEFAULT_HUMIDITY_RISE_RATE,
+    DEFAULT_HUMIDITY_RISE_WINDOW,
+    DEFAULT_VENT_CYCLE_MODE,
+    DEFAULT_VENT_CYCLE_MIN,
+    DEFAULT_VENT_CYCLE_MAX,
+    DEFAULT_VENT_HEATING_COORDINATION,
+    DEFAULT_VENT_HEATING_FAN_SPEED,
+)
+from .humidity import (
+    HumidityTrend,
+    HUMIDITY_BASELINE_MARGIN,
+    HUMIDITY_EXCHANGE_MARGIN,
+    absolute_humidity,
+    dew_point,
+)
+from .clock import SYSTEM_CLOCK, Clock
+from .state import ClimateState, CompressorState
+from .window import WINDOW_COOLDOWN, WindowMonitor, is_open_state
+from .sleep import SleepMonitor, bed_vote
+from .curve import curve_offset, parse_curve_points, quantize
+from .forecast import ForecastCache, forecast_items, load_forecast_file, parse_forecast
+from .tariff import TARIFF_COAST, TARIFF_PREHEAT, TariffPlan, load_price_file, parse_prices
+from .schedule import SCHEDULE_BOOST, SCHEDULE_ECO, SCHEDULE_OFF, WeeklySchedule, parse_schedule
+from .staging import StagingState
+from .actuator import CALL_DEFERRED, ActuatorGateway
+from .conditioning import LAST_KNOWN_HOLD, InputFilter, RoomFusion, parse_room_sensors, reading, reported_at
+from .ventilation import (
+    VentZone,
+    adaptive_cycle_time,
+    as_list,
+    parse_vent_zones,
+    recovery_efficiency,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.NUMBER, Platform.SWITCH, Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the domain: services are registered once for all entries."""
+    hass.data.setdefault(DOMAIN, {})
+    await async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Smart Climate Control from a config entry."""
     hass.data.setdefault(DOMAIN, {})
     
     coordinator = SmartClimateCoordinator(hass, entry)
+    setup_start = coordinator.clock.monotonic()
     await coordinator.async_initialize()
+    coordinator.startup_timings["initialize"] = round(coordinator.clock.monotonic() - setup_start, 3)
     
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "entry": entry,
     }
+
+    # Create our device up front, so linking does not have to wait for the entities
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.data.get(CONF_NAME, "Smart Climate Control"),
+        manufacturer="Custom",
+        model="Smart Climate Controller",
+    )
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    await _setup_device_links(hass, entry)
-    await async_setup_services(hass)
-    
-    # Standard heating/cooling update (60s)
-    entry.async_on_unload(
-        async_track_time_interval(
-            hass, coordinator.async_update, timedelta(seconds=60)
-        )
-    )
+    coordinator.startup_timings["setup_entry"] = round(coordinator.clock.monotonic() - setup_start, 3)
 
-    # Ventilation update (2s) - Faster check for cycle precision
-    entry.async_on_unload(
-        async_track_time_interval(
-            hass, coordinator.async_update_ventilation, timedelta(seconds=2)
-        )
-    )
+    async def _async_start(hass: HomeAssistant) -> None:
+        """Non-critical work, deferred until Home Assistant has started."""
+        started = coordinator.clock.monotonic()
+        await _setup_device_links(hass, entry)
+        for unsub in await coordinator.async_start_control():
+            entry.async_on_unload(unsub)
+        coordinator.startup_timings["deferred_start"] = round(coordinator.clock.monotonic() - started, 3)
+        coordinator.startup_timings["ready_after"] = round(coordinator.clock.monotonic() - setup_start, 3)
+        _LOGGER.debug(f"Smart Climate started: {coordinator.startup_timings}")
+
+    entry.async_on_unload(async_at_started(hass, _async_start))
     
     return True
 
 async def _setup_device_links(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Set up device links by moving heat pump entity to our device."""
-    await asyncio.sleep(1)
-    
     entity_reg = er.async_get(hass)
     device_reg = dr.async_get(hass)
     
@@ -174,8 +284,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
         await coordinator._release_control()
         await coordinator.stop_ventilation(reason="Unload")
-        if coordinator.window_listener_remove:
-            coordinator.window_listener_remove()
+        coordinator._remove_window_listeners()
+        coordinator._remove_sleep_listeners()
+        coordinator._remove_input_filters()
+        coordinator._end_boost()
+        coordinator._remove_tariff()
+        coordinator._remove_schedule()
+        coordinator.actuator.close()
         hass.data[DOMAIN].pop(entry.entry_id)
     
     return unload_ok
@@ -187,18 +302,14 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         """Handle force eco mode service."""
         for entry_id in hass.data[DOMAIN]:
             coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-            coordinator.force_eco_mode = call.data.get("enable", True)
-            if coordinator.force_eco_mode:
-                coordinator.force_comfort_mode = False
+            coordinator.climate.set_force_eco(call.data.get("enable", True))
             await coordinator.async_update()
     
     async def handle_force_comfort(call: ServiceCall) -> None:
         """Handle force comfort mode service."""
         for entry_id in hass.data[DOMAIN]:
             coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-            coordinator.force_comfort_mode = call.data.get("enable", True)
-            if coordinator.force_comfort_mode:
-                coordinator.force_eco_mode = False
+            coordinator.climate.set_force_comfort(call.data.get("enable", True))
             await coordinator.async_update()
     
     async def handle_reset_temperatures(call: ServiceCall) -> None:
@@ -207,58 +318,95 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
             await coordinator.reset_temperatures()
             
+    async def handle_boost(call: ServiceCall) -> None:
+        """Start (or stop) a timed boost to the boost temperature."""
+        enable = call.data.get("enable", True)
+        for entry_id in hass.data[DOMAIN]:
+            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
+            if enable:
+                await coordinator.async_start_boost(call.data.get("duration"))
+            else:
+                await coordinator.async_stop_boost()
+
     async def handle_trigger_ventilation(call: ServiceCall) -> None:
         """Manually trigger ventilation cycle."""
         duration = call.data.get("duration")
+        zone_name = call.data.get("zone")
         for entry_id in hass.data[DOMAIN]:
             coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-            if duration:
-                 coordinator.vent_run_duration = duration
-            await coordinator.start_ventilation_cycle(reason="Manual Service Call")
+            zones = [z for z in coordinator.vent_zones if zone_name is None or z.name == zone_name]
+            for zone in zones:
+                await coordinator.start_ventilation_cycle(reason="Manual Service Call", zone=zone, duration=duration)
     
     hass.services.async_register(DOMAIN, "force_eco", handle_force_eco)
     hass.services.async_register(DOMAIN, "force_comfort", handle_force_comfort)
     hass.services.async_register(DOMAIN, "reset_temperatures", handle_reset_temperatures)
+    hass.services.async_register(DOMAIN, "boost", handle_boost)
     hass.services.async_register(DOMAIN, "trigger_ventilation", handle_trigger_ventilation)
 
 class SmartClimateCoordinator:
     """Coordinator for Smart Climate Control with heating, cooling AND ventilation."""
     
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, clock: Optional[Clock] = None) -> None:
         """Initialize the coordinator."""
         self.hass = hass
         self.entry = entry
+        # Monotonic time for durations, wall time only for persisted timestamps
+        self.clock = clock or SYSTEM_CLOCK
         self.config = entry.data
         self.store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}")
         
         self.heat_pump_entity_id = self.config[CONF_HEAT_PUMP]
         
-        # State variables (Climate)
-        self.smart_control_enabled = True
-        self.override_mode = False
-        self.force_eco_mode = False
-        self.force_comfort_mode = False
-        self.current_action = "off"
-        self.current_hvac_mode = "heat"
-        self.last_avg_house_over_limit = False
-        self.sleep_mode_active = False
-        self.debug_text = "System initializing..."
-        self.smart_control_active = False
-        
-        # Window Logic Variables
-        self.window_open_start = None
-        self.window_cooldown_start = None # Tracks time after closing window
-        self.open_window_details = [] # List of currently open window names
-        self.window_listener_remove = None # Cleanup function for listeners
-
-        self.comfort_offset_applied = 0.0
-        self.min_runtime_remaining_minutes = 0
+        # Runtime state, grouped (see state.py)
+        self.climate = ClimateState()
+        self.window = WindowMonitor()
+        self._window_timer_cancel: Optional[Callable[[], None]] = None
+        self.sleep = SleepMonitor()
+        self.sleep_listener_remove: Optional[Callable[[], None]] = None
+        self._sleep_timer_cancel: Optional[Callable[[], None]] = None
+        self._boost_timer_cancel: Optional[Callable[[], None]] = None
+        self.curve_points = self._load_curve_points()
+        self.forecast = ForecastCache()
+        self.tariff = TariffPlan()
+        self.tariff_listener_remove: Optional[Callable[[], None]] = None
+        self._tariff_timer_cancel: Optional[Callable[[], None]] = None
+        self._tariff_file_hour: Optional[int] = None
+        self.schedule = WeeklySchedule()
+        self.schedule_mode: Optional[str] = None # Current block of the weekly schedule
+        self._schedule_timer_cancel: Optional[Callable[[], None]] = None
+        self.compressor = CompressorState() # Always the current lead unit
+        # Conditioned temperature inputs, fed by their state events
+        self.inputs: Dict[str, InputFilter] = {}
+        self.room = RoomFusion({self.config[CONF_ROOM_SENSOR]: 1.0}) # Room sensors fused into the room temperature
+        self.input_listener_remove: Optional[Callable[[], None]] = None
+        self._last_known: Optional[Tuple[float, float]] = None # (room temperature, monotonic time)
+        # Zone with several heat pumps: heat_pump_entity_id follows the rotating lead
+        self.staging = StagingState(self._zone_units())
+        self._lag_sent: Dict[str, Tuple[str, Optional[float], str]] = {}
+        # Every outgoing command goes through the gateway (dedup, rate limits)
+        self.actuator = ActuatorGateway(
+            hass, self.clock, self._async_call_later,
+            min_interval=self._get_config_value(CONF_ACTUATOR_MIN_INTERVAL, DEFAULT_ACTUATOR_MIN_INTERVAL),
+            budget=self._get_config_value(CONF_ACTUATOR_BUDGET, DEFAULT_ACTUATOR_BUDGET),
+        )
+
+        # Fast path: a tick with the same inputs and no deadline due is skipped
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._next_deadline: Optional[float] = None
+        self.skipped_updates = 0
+        # state_updated event: last payload, its sequence number and when it went out
+        self._event_payload: Optional[Dict[str, Any]] = None
+        self._event_seq = 0
+        self._event_sent_at: Optional[float] = None
+
+        # Debug text is rendered lazily from the last decision record
+        self._decision: Optional[Dict[str, Any]] = None
+        self._debug_static = "System initializing..."
+        self._debug_cache: Dict[str, str] = {}
         
-        self.last_sent_action = None
-        self.last_sent_temperature = None
-        self.last_sent_hvac_mode = None
+        self.window_listener_remove = None # Cleanup function for window listeners
         
-        self.last_heat_pump_start: Optional[float] = None
         self.min_runtime: float = self.entry.options.get("min_run_time", 0) * 60
         
         # Temperature settings
@@ -269,20 +417,27 @@ class SmartClimateCoordinator:
 
         # VENTILATION STATE
         self.vent_enabled = True
-        self.vent_is_running = False
-        self.vent_manual_mode = False
-        self.vent_start_time = None
-        self.vent_cycle_start_time = None
-        self.vent_current_phase = 0 
-        self.vent_reason = "Idle"
         self.last_vent_auto_run = None
         self.vent_run_duration = self._get_config_value(CONF_VENT_DURATION, DEFAULT_VENT_DURATION)
         self.vent_auto_interval = self._get_config_value(CONF_VENT_AUTO_INTERVAL, DEFAULT_VENT_AUTO_INTERVAL)
         self.humidity_threshold = self._get_config_value(CONF_HUMIDITY_THRESHOLD, DEFAULT_HUMIDITY_THRESHOLD)
         self.vent_cycle_time = self._get_config_value(CONF_VENT_CYCLE_TIME, DEFAULT_VENT_CYCLE_TIME)
         self.vent_fan_speed = self._get_config_value(CONF_VENT_FAN_SPEED, DEFAULT_VENT_FAN_SPEED)
-        self.vent_humidity_cooldown_end = 0 
+        self.humidity_rise_rate = self._get_config_value(CONF_HUMIDITY_RISE_RATE, DEFAULT_HUMIDITY_RISE_RATE)
+        self.humidity_trends: Dict[str, HumidityTrend] = {} # Rolling window per humidity sensor
+        # Absolute humidity (g/m³) - only populated when an outdoor humidity sensor is configured
+        self.indoor_abs_humidity: Optional[float] = None
+        self.outdoor_abs_humidity: Optional[float] = None
+        self.outdoor_dew_point: Optional[float] = None
+        self.vent_moisture_blocked = False # True when outdoor air would not dry the house
+        # Heating coordination
+        self.vent_deferred_reason: Optional[str] = None # Why a scheduled run is waiting
         self.last_vent_safety_check = 0 # Track last safety turn-off time
+        # Fan pairs: the main zone (groups A/B) first, then the extra zones from options
+        self.vent_zones: List[VentZone] = self._build_vent_zones()
+        
+        # Seconds spent in each setup stage, reported in diagnostics
+        self.startup_timings: Dict[str, float] = {}
         
         self.entry.add_update_listener(self.async_options_updated)
     
@@ -307,6 +462,82 @@ class SmartClimateCoordinator:
     @property
     def weather_comp_factor(self) -> float:
         return self._get_config_value(CONF_WEATHER_COMP_FACTOR, DEFAULT_WEATHER_COMP_FACTOR)
+
+    def _load_curve_points(self) -> List[tuple]:
+        try:
+            return parse_curve_points(self._get_config_value(CONF_CURVE_POINTS, ""))
+        except ValueError as err:
+            _LOGGER.warning(f"Ignoring invalid heating curve points: {err}")
+            return []
+
+    def _weather_compensation(self, outside_temp: float) -> float:
+        """Heating curve offset, only moved when it changed by more than the hysteresis."""
+        raw = curve_offset(
+            outside_temp,
+            self._get_config_value(CONF_CURVE_START_TEMP, DEFAULT_CURVE_START_TEMP),
+            self.weather_comp_factor,
+            self._get_config_value(CONF_CURVE_MAX_OFFSET, DEFAULT_CURVE_MAX_OFFSET),
+            self.curve_points,
+        )
+        hysteresis = self._get_config_value(CONF_CURVE_HYSTERESIS, DEFAULT_CURVE_HYSTERESIS)
+        return self.climate.apply_curve_offset(raw, hysteresis)
+
+    async def _refresh_forecast(self) -> None:
+        """Fetch the outside temperature forecast once per clock hour."""
+        now = self.clock.now()
+        if not self.forecast.needs_refresh(now):
+            return
+        entity_id = self._get_config_value(CONF_FORECAST_ENTITY, None)
+        path = self._get_config_value(CONF_FORECAST_FILE, "")
+        if not entity_id and not path:
+            return
+        points = None
+        try:
+            if path:
+                points = await self.hass.async_add_executor_job(load_forecast_file, self.hass.config.path(path))
+            else:
+                points = await self._fetch_weather_forecast(entity_id)
+        except (OSError, ValueError, HomeAssistantError) as err:
+            _LOGGER.warning(f"Forecast refresh failed, keeping the previous forecast: {err}")
+        self.forecast.store(points, now)
+
+    async def _fetch_weather_forecast(self, entity_id: str) -> Optional[list]:
+        if self.hass.services.has_service("weather", "get_forecasts"):
+            response = await self.hass.services.async_call(
+                "weather", "get_forecasts", {"entity_id": entity_id, "type": "hourly"},
+                blocking=True, return_response=True,
+            )
+            return parse_forecast(forecast_items(response))
+        # Before 2023.12 the forecast was a state attribute
+        state = self.hass.states.get(entity_id)
+        return parse_forecast(state.attributes.get("forecast")) if state else None
+
+    def _forecast_outside_temp(self) -> Optional[float]:
+        """Lowest forecast outside temperature within the lookahead, None without forecast."""
+        lookahead = self._get_config_value(CONF_FORECAST_LOOKAHEAD, DEFAULT_FORECAST_LOOKAHEAD)
+        if not lookahead or not self.forecast.points:
+            return None
+        now = self.clock.now()
+        lowest = self.forecast.min_between(now, now + lookahead * 3600)
+        return round(lowest, 1) if lowest is not None else None
+
+    def _setpoint_step(self) -> float:
+        """Temperature resolution of the heat pump.
+
+        target_temp_step is only an attribute when the device sets it, without
+        it the entity's precision (or half a degree) is used.
+        """
+        state = self.hass.states.get(self.heat_pump_entity_id)
+        if state is None:
+            return DEFAULT_SETPOINT_STEP
+        for attribute in ("target_temp_step", "precision"):
+            try:
+                step = float(state.attributes.get(attribute) or 0)
+            except (TypeError, ValueError):
+                continue
+            if step > 0:
+                return step
+        return DEFAULT_SETPOINT_STEP
     
     @property
     def max_comp_temp(self) -> float:
@@ -324,15 +555,98 @@ class SmartClimateCoordinator:
     def safety_cutoff_offset(self) -> float:
         return self._get_config_value(CONF_SAFETY_CUTOFF, DEFAULT_SAFETY_CUTOFF)
 
+    @property
+    def stage_delay(self) -> float:
+        return self._get_config_value(CONF_STAGE_DELAY, DEFAULT_STAGE_DELAY) * 60
+
+    @property
+    def stage_error(self) -> float:
+        return self._get_config_value(CONF_STAGE_ERROR, DEFAULT_STAGE_ERROR)
+
     @property
     def window_delay_minutes(self) -> float:
         return self._get_config_value(CONF_WINDOW_DELAY, DEFAULT_WINDOW_DELAY)
 
+    @property
+    def humidity_rise_window(self) -> float:
+        return self._get_config_value(CONF_HUMIDITY_RISE_WINDOW, DEFAULT_HUMIDITY_RISE_WINDOW)
+
+    @property
+    def vent_cycle_mode(self) -> str:
+        return self._get_config_value(CONF_VENT_CYCLE_MODE, DEFAULT_VENT_CYCLE_MODE)
+
+    @property
+    def vent_heating_coordination(self) -> bool:
+        return self._get_config_value(CONF_VENT_HEATING_COORDINATION, DEFAULT_VENT_HEATING_COORDINATION)
+
+    @property
+    def heat_pump_in_startup(self) -> bool:
+        """Heat pump is running but has not reached its minimum runtime yet."""
+        if self.climate.current_action != "on":
+            return False
+        return self.compressor.in_min_runtime(self.clock.monotonic(), self.min_runtime)
+
+    @property
+    def is_heavy_heating(self) -> bool:
+        """Heating with a large deficit or in cold weather, when ventilation costs most."""
+        decision = self._decision
+        if decision is None or decision["mode"] != "heat" or decision["action"] != "on":
+            return False
+        room_temp = decision["room_temp"]
+        if room_temp is not None and decision["base_temp"] - room_temp >= HEAVY_HEATING_DEFICIT:
+            return True
+        outside_temp = decision["outside_temp"]
+        return outside_temp is not None and outside_temp < self.low_temp_threshold
+
+    @property
+    def vent_effective_fan_speed(self) -> int:
+        """Fan speed of the main zone, capped while the heat pump works hard."""
+        return self._zone_fan_speed(self.vent_main_zone)
+
+    @property
+    def debug_verbosity(self) -> str:
+        return self._get_config_value(CONF_DEBUG_VERBOSITY, DEFAULT_DEBUG_VERBOSITY)
+
+    @property
+    def debug_text(self) -> str:
+        """Human readable status, rendered on demand and memoized per verbosity."""
+        if self._decision is None:
+            return self._debug_static
+        verbosity = self.debug_verbosity
+        text = self._debug_cache.get(verbosity)
+        if text is None:
+            text = self._format_debug_text(self._decision, verbosity)
+            self._debug_cache[verbosity] = text
+        return text
+
+    @debug_text.setter
+    def debug_text(self, value: str) -> None:
+        """Set a static status text (errors, disabled state)."""
+        self._decision = None
+        self._debug_static = value
+        self._debug_cache.clear()
+
+    @property
+    def last_decision(self) -> Optional[Dict[str, Any]]:
+        """Structured record of the last control decision."""
+        return self._decision
+
+    @property
+    def is_temperating(self) -> bool:
+        return self._decision is not None and "Temperating" in self._decision["reason"]
+
+    def _set_decision(self, record: Dict[str, Any]) -> None:
+        """Store a decision record, invalidating the rendered text only if it changed."""
+        if record == self._decision:
+            return
+        self._decision = record
+        self._debug_cache.clear()
+
     @property
     def is_comfort_mode_active(self) -> bool:
-        if self.force_comfort_mode: return True
-        if self.override_mode: return True
-        if self.force_eco_mode or self.sleep_mode_active: return False
+        if self.climate.force_comfort_mode: return True
+        if self.climate.override_mode: return True
+        if self.climate.force_eco_mode or self.climate.sleep_mode_active: return False
         return True
     
     @staticmethod
@@ -349,9 +663,23 @@ class SmartClimateCoordinator:
             coordinator.humidity_threshold = coordinator._get_config_value(CONF_HUMIDITY_THRESHOLD, DEFAULT_HUMIDITY_THRESHOLD)
             coordinator.vent_cycle_time = coordinator._get_config_value(CONF_VENT_CYCLE_TIME, DEFAULT_VENT_CYCLE_TIME)
             coordinator.vent_fan_speed = coordinator._get_config_value(CONF_VENT_FAN_SPEED, DEFAULT_VENT_FAN_SPEED)
+            coordinator.humidity_rise_rate = coordinator._get_config_value(CONF_HUMIDITY_RISE_RATE, DEFAULT_HUMIDITY_RISE_RATE)
+            coordinator.humidity_trends = {} # Window length may have changed
+            coordinator.curve_points = coordinator._load_curve_points()
+            coordinator._setup_staging()
+            coordinator._invalidate_fingerprint()
+            coordinator.actuator.min_interval = coordinator._get_config_value(CONF_ACTUATOR_MIN_INTERVAL, DEFAULT_ACTUATOR_MIN_INTERVAL)
+            coordinator.actuator.budget = coordinator._get_config_value(CONF_ACTUATOR_BUDGET, DEFAULT_ACTUATOR_BUDGET)
+            coordinator.forecast = ForecastCache() # Source may have changed
+            await coordinator._reload_vent_zones()
             
-            # Re-setup listeners in case window sensors changed
+            # Re-setup listeners in case window or bed sensors changed
             await coordinator._setup_window_listeners()
+            await coordinator._setup_sleep_listeners()
+            coordinator._setup_input_filters()
+            coordinator.tariff = TariffPlan() # Thresholds may have changed
+            await coordinator._setup_tariff()
+            coordinator._setup_schedule()
             
             await coordinator.async_update()
     
@@ -362,12 +690,18 @@ class SmartClimateCoordinator:
             "eco_temp": self.eco_temp,
             "boost_temp": self.boost_temp,
             "cooling_temp": self.cooling_temp,
-            "smart_control_enabled": self.smart_control_enabled,
-            "last_heat_pump_start": self.last_heat_pump_start,
+            "smart_control_enabled": self.climate.smart_control_enabled,
+            # Compressor timing: the start time only counts while the compressor is running
+            "compressor_running": self.climate.current_action == "on" and self.compressor.running,
+            "last_heat_pump_start": (
+                self.clock.to_wall(self.compressor.start) if self.compressor.start is not None else None
+            ),
             # Ventilation persistence
             "last_vent_auto_run": self.last_vent_auto_run,
             "vent_enabled": self.vent_enabled,
             "vent_fan_speed": self.vent_fan_speed,
+            # Zone staging: lead rotation balances this
+            "unit_runtime": {unit: self.staging.runtime_of(unit, self.clock.monotonic()) for unit in self.staging.units},
         })
 
     async def async_initialize(self) -> None:
@@ -378,24 +712,101 @@ class SmartClimateCoordinator:
             self.eco_temp = stored_data.get("eco_temp", self.eco_temp)
             self.boost_temp = stored_data.get("boost_temp", self.boost_temp)
             self.cooling_temp = stored_data.get("cooling_temp", self.cooling_temp)
-            self.smart_control_enabled = stored_data.get("smart_control_enabled", True)
-            self.last_heat_pump_start = stored_data.get("last_heat_pump_start")
+            self.climate.set_enabled(stored_data.get("smart_control_enabled", True))
+            if stored_data.get("compressor_running", True) and stored_data.get("last_heat_pump_start") is not None:
+                self.compressor.restore(self.clock.from_wall(stored_data["last_heat_pump_start"]))
             
             self.last_vent_auto_run = stored_data.get("last_vent_auto_run")
             self.vent_enabled = stored_data.get("vent_enabled", True)
             self.vent_fan_speed = stored_data.get("vent_fan_speed", self._get_config_value(CONF_VENT_FAN_SPEED, DEFAULT_VENT_FAN_SPEED))
+            self.staging = StagingState(self.staging.units, stored_data.get("unit_runtime"))
             
-        # Setup instant listeners for windows
-        await self._setup_window_listeners()
-        
         _LOGGER.info(f"Smart Climate initialized. Vent enabled: {self.vent_enabled}")
 
-    async def _setup_window_listeners(self):
-        """Setup listeners for window/door sensors for immediate reaction."""
-        # Remove existing listener if present
+    def _heat_pump_is_on(self) -> Optional[bool]:
+        """Whether the heat pump reports an active mode, None when its state is unknown."""
+        state = self.hass.states.get(self.heat_pump_entity_id)
+        if not state or state.state in ("unavailable", "unknown"):
+            return None
+        return state.state != "off"
+
+    async def async_reconcile_startup_state(self) -> None:
+        """Align restored state with what the heat pump is actually doing.
+
+        A restored compressor start only counts if the pump is still running,
+        otherwise min runtime would keep a stopped pump "on" after a restart.
+        """
+        restored_start = self.compressor.take_restored()
+        pump_on = self._heat_pump_is_on()
+
+        if pump_on:
+            self.climate.record_decision("on")
+            now = self.clock.monotonic()
+            # A start time in the future (clock change) is treated as starting now
+            self.compressor.started(min(restored_start, now) if restored_start is not None else now, restart=True)
+        else:
+            self.climate.record_decision("off")
+            self.compressor.stopped()
+        _LOGGER.info(
+            f"Startup reconciliation: heat pump {'on' if pump_on else 'off' if pump_on is False else 'unknown'}, "
+            f"compressor start {'kept' if pump_on and restored_start is not None else 'reset'}"
+        )
+
+    def _adopt_heat_pump_state(self, action: str, temperature: Optional[float], hvac_mode: str) -> bool:
+        """Use the pump's current state as the last sent command if it already matches the decision."""
+        state = self.hass.states.get(self.heat_pump_entity_id)
+        if not state:
+            return False
+        if action == "off":
+            matches = state.state == "off"
+        else:
+            matches = state.state == hvac_mode and state.attributes.get("temperature") == temperature
+        if matches:
+            self.compressor.command_sent(action, temperature, hvac_mode)
+            _LOGGER.info(f"Heat pump already {state.state} at {state.attributes.get('temperature')}°C - no startup command needed")
+        return matches
+
+    def _async_track_state(self, entity_ids: List[str], action: Callable) -> Callable[[], None]:
+        """Subscribe to state changes of entities (overridden by the replay tool)."""
+        return async_track_state_change_event(self.hass, entity_ids, action)
+
+    def _async_call_later(self, delay: float, action: Callable) -> Callable[[], None]:
+        """Run action after delay seconds (overridden by the replay tool)."""
+        return async_call_later(self.hass, delay, action)
+
+    def _async_track_interval(self, interval: float, action: Callable) -> Callable[[], None]:
+        """Run action every interval seconds (overridden by the replay tool)."""
+        return async_track_time_interval(self.hass, action, timedelta(seconds=interval))
+
+    async def async_start_control(self, ventilation: bool = True) -> List[Callable[[], None]]:
+        """Deferred start once Home Assistant runs: listeners, plans, reconcile, the update loops.
+
+        Returns the unsubscribers of the update loops.
+        """
+        await self._setup_window_listeners()
+        await self._setup_sleep_listeners()
+        self._setup_input_filters()
+        await self._setup_tariff()
+        self._setup_schedule()
+        await self.async_reconcile_startup_state()
+        # Heating/cooling every 60 s, ventilation every 2 s for cycle precision
+        unsubs = [self._async_track_interval(60, self.async_update)]
+        if ventilation:
+            unsubs.append(self._async_track_interval(2, self.async_update_ventilation))
+        await self.async_update()
+        return unsubs
+
+    def _remove_window_listeners(self) -> None:
         if self.window_listener_remove:
             self.window_listener_remove()
             self.window_listener_remove = None
+        if self._window_timer_cancel:
+            self._window_timer_cancel()
+            self._window_timer_cancel = None
+
+    async def _setup_window_listeners(self):
+        """Setup listeners for window/door sensors and sync the window state machine."""
+        self._remove_window_listeners()
 
         sensors = []
         # Get sensors from options or config (as list)
@@ -408,12 +819,39 @@ class SmartClimateCoordinator:
         door_sensor = self.config.get(CONF_DOOR_SENSOR)
         if door_sensor:
             sensors.append(door_sensor)
+
+        # Seed from the current states, a running stop or cooldown survives option changes
+        now = self.clock.monotonic()
+        self.window.set_delay(self.window_delay_minutes * 60)
+        for entity_id in list(self.window.open_since):
+            if entity_id not in sensors:
+                self.window.update(entity_id, False, now)
+        for entity_id in sensors:
+            state = self.hass.states.get(entity_id)
+            self.window.update(entity_id, is_open_state(state), now, state.name if state else None)
+        self._schedule_window_timer()
         
         if sensors:
             _LOGGER.info(f"Setting up immediate listeners for window sensors: {sensors}")
-            self.window_listener_remove = async_track_state_change_event(
-                self.hass, sensors, self._handle_window_state_change
-            )
+            self.window_listener_remove = self._async_track_state(sensors, self._handle_window_state_change)
+
+    def _schedule_window_timer(self) -> None:
+        """Arm a timer for the window state machine's next timed transition."""
+        if self._window_timer_cancel:
+            self._window_timer_cancel()
+            self._window_timer_cancel = None
+        deadline = self.window.next_deadline()
+        if deadline is not None:
+            delay = max(0.0, deadline - self.clock.monotonic())
+            self._window_timer_cancel = self._async_call_later(delay, self._handle_window_timer)
+
+    async def _handle_window_timer(self, now=None) -> None:
+        """Open delay or restore cooldown expired: act now, not on the next tick."""
+        self._window_timer_cancel = None
+        if self.window.advance(self.clock.monotonic()):
+            _LOGGER.info(f"Window state: {self.window.state} (open: {self.window.open_details})")
+        self._schedule_window_timer()
+        await self.async_update()
 
     @callback
     async def _handle_window_state_change(self, event: Event):
@@ -421,6 +859,288 @@ class SmartClimateCoordinator:
         entity_id = event.data.get("entity_id")
         new_state = event.data.get("new_state")
         _LOGGER.debug(f"Window sensor changed: {entity_id} -> {new_state.state if new_state else 'None'}. Triggering immediate update.")
+        if self.window.update(entity_id, is_open_state(new_state), self.clock.monotonic(), new_state.name if new_state else None):
+            _LOGGER.info(f"Window state: {self.window.state} (open: {self.window.open_details})")
+        self._schedule_window_timer()
+        await self.async_update()
+
+    def _remove_sleep_listeners(self) -> None:
+        if self.sleep_listener_remove:
+            self.sleep_listener_remove()
+            self.sleep_listener_remove = None
+        if self._sleep_timer_cancel:
+            self._sleep_timer_cancel()
+            self._sleep_timer_cancel = None
+
+    async def _setup_sleep_listeners(self) -> None:
+        """Subscribe to every bed sensor and sync the sleep monitor with their current states."""
+        self._remove_sleep_listeners()
+
+        bed_sensors = self._get_config_value(CONF_BED_SENSORS, [])
+        if isinstance(bed_sensors, str):
+            bed_sensors = [bed_sensors]
+
+        now = self.clock.monotonic()
+        self.sleep.configure(
+            self._get_config_value(CONF_SLEEP_AGGREGATION, DEFAULT_SLEEP_AGGREGATION),
+            self._get_config_value(CONF_SLEEP_DEBOUNCE, DEFAULT_SLEEP_DEBOUNCE),
+        )
+        for entity_id in list(self.sleep.votes):
+            if entity_id not in bed_sensors:
+                self.sleep.remove(entity_id, now)
+        for entity_id in bed_sensors:
+            self.sleep.update(entity_id, bed_vote(self.hass.states.get(entity_id)), now)
+        self._apply_sleep_state()
+        self._schedule_sleep_timer()
+
+        if bed_sensors:
+            _LOGGER.info(f"Setting up listeners for bed sensors ({self.sleep.aggregation}): {bed_sensors}")
+            self.sleep_listener_remove = self._async_track_state(bed_sensors, self._handle_bed_state_change)
+
+    def _apply_sleep_state(self) -> None:
+        if self.climate.sleep_mode_active != self.sleep.active:
+            _LOGGER.info(f"Sleep mode {'active' if self.sleep.active else 'inactive'} ({sum(self.sleep.votes.values())}/{len(self.sleep.votes)} beds occupied)")
+        self.climate.set_sleep(self.sleep.active)
+
+    def _schedule_sleep_timer(self) -> None:
+        """Arm a timer for the end of the bed debounce."""
+        if self._sleep_timer_cancel:
+            self._sleep_timer_cancel()
+            self._sleep_timer_cancel = None
+        deadline = self.sleep.next_deadline()
+        if deadline is not None:
+            delay = max(0.0, deadline - self.clock.monotonic())
+            self._sleep_timer_cancel = self._async_call_later(delay, self._handle_sleep_timer)
+
+    async def _handle_sleep_timer(self, now=None) -> None:
+        self._sleep_timer_cancel = None
+        changed = self.sleep.advance(self.clock.monotonic())
+        self._schedule_sleep_timer()
+        if changed:
+            self._apply_sleep_state()
+            await self.async_update()
+
+    @callback
+    async def _handle_bed_state_change(self, event: Event):
+        """A bed sensor changed: update the aggregate, sleep mode follows after the debounce."""
+        entity_id = event.data.get("entity_id")
+        changed = self.sleep.update(entity_id, bed_vote(event.data.get("new_state")), self.clock.monotonic())
+        self._schedule_sleep_timer()
+        if changed:
+            self._apply_sleep_state()
+            await self.async_update()
+
+    def _remove_input_filters(self) -> None:
+        if self.input_listener_remove:
+            self.input_listener_remove()
+            self.input_listener_remove = None
+
+    def _setup_input_filters(self) -> None:
+        """One filter per temperature sensor, seeded from its current state and fed by its events."""
+        self._remove_input_filters()
+        try:
+            weights = parse_room_sensors(self._get_config_value(CONF_ROOM_SENSORS, None), self.config[CONF_ROOM_SENSOR])
+        except (ValueError, TypeError) as err:
+            _LOGGER.warning(f"Invalid room sensors, using the room sensor only: {err}")
+            weights = {self.config[CONF_ROOM_SENSOR]: 1.0}
+        self.room = RoomFusion(weights, self._get_config_value(CONF_ROOM_OUTLIER, DEFAULT_ROOM_OUTLIER))
+        entities = []
+        for entity_id in (*weights, self.config.get(CONF_AVERAGE_SENSOR), self.config.get(CONF_OUTSIDE_SENSOR)):
+            if entity_id and entity_id not in entities:
+                entities.append(entity_id)
+        self.inputs = {}
+        for entity_id in entities:
+            flt = InputFilter(
+                self._get_config_value(CONF_SENSOR_FILTER, DEFAULT_SENSOR_FILTER),
+                self._get_config_value(CONF_SENSOR_FILTER_WINDOW, DEFAULT_SENSOR_FILTER_WINDOW),
+                self._get_config_value(CONF_SENSOR_MAX_RATE, DEFAULT_SENSOR_MAX_RATE),
+                self._get_config_value(CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT) * 60,
+            )
+            state = self.hass.states.get(entity_id)
+            flt.update(reading(state), self._reported_monotonic(state))
+            self.inputs[entity_id] = flt
+        if entities:
+            self.input_listener_remove = self._async_track_state(entities, self._handle_input_state_change)
+
+    def _reported_monotonic(self, state) -> float:
+        if state is None:
+            return self.clock.monotonic()
+        return min(self.clock.from_wall(reported_at(state)), self.clock.monotonic())
+
+    async def _handle_input_state_change(self, event: Event) -> None:
+        entity_id = event.data.get("entity_id")
+        flt = self.inputs.get(entity_id)
+        if flt is not None:
+            new_state = event.data.get("new_state")
+            flt.update(reading(new_state), self._reported_monotonic(new_state))
+            if entity_id in self.room.weights:
+                self._fuse_room(self.clock.monotonic())
+
+    def _input_value(self, entity_id: Optional[str], now: float) -> Optional[float]:
+        """Conditioned reading of a temperature sensor, None if unavailable or stale."""
+        if not entity_id:
+            return None
+        flt = self.inputs.get(entity_id)
+        if flt is None:
+            # Filters not set up yet (before Home Assistant started)
+            return reading(self.hass.states.get(entity_id))
+        value = flt.current(now)
+        if value is None and flt.available and flt.stale_after:
+            # Same value reported again does not fire a state event, check last_reported once it looks stale
+            state = self.hass.states.get(entity_id)
+            if reading(state) == flt.raw:
+                flt.reported(self._reported_monotonic(state))
+                value = flt.current(now)
+        return value
+
+    def _fuse_room(self, now: float) -> Optional[float]:
+        """Fuse the room sensors again and note when the next member goes stale."""
+        # A stale member leaves the due time in the past, so it is checked again on each use
+        # (its unchanged value reported again fires no state event)
+        stale = [self.inputs[entity_id].stale_at() for entity_id in self.room.weights if entity_id in self.inputs]
+        return self.room.fuse(
+            {entity_id: self._input_value(entity_id, now) for entity_id in self.room.weights},
+            min((at for at in stale if at is not None), default=None),
+        )
+
+    def _room_temperature(self, now: Optional[float] = None) -> Optional[float]:
+        """Fused room temperature, only recomputed when a member reported or went stale."""
+        now = self.clock.monotonic() if now is None else now
+        if not self.inputs or (self.room.due is not None and now >= self.room.due):
+            return self._fuse_room(now)
+        return self.room.value
+
+    def _conditioned_inputs(self) -> Tuple[Optional[float], Optional[str], float, Optional[float]]:
+        """(room temperature, its source, outside temperature, house average) for a decision.
+
+        The room temperature falls back to the house average, then to the last
+        known value for LAST_KNOWN_HOLD, so a short sensor dropout does not stop
+        the heat pump but a dead or stuck sensor does.
+        """
+        now = self.clock.monotonic()
+        avg_house_temp = self._input_value(self.config.get(CONF_AVERAGE_SENSOR), now)
+        room_temp, source = self._room_temperature(now), "room"
+        if room_temp is None and avg_house_temp is not None:
+            room_temp, source = avg_house_temp, "average"
+        if room_temp is not None:
+            self._last_known = (room_temp, now)
+        elif self._last_known is not None and now - self._last_known[1] < LAST_KNOWN_HOLD:
+            room_temp, source = self._last_known[0], "last_known"
+        else:
+            source = None
+        outside_temp = self._input_value(self.config.get(CONF_OUTSIDE_SENSOR), now)
+        return room_temp, source, 5.0 if outside_temp is None else outside_temp, avg_house_temp
+
+    def _remove_tariff(self) -> None:
+        if self.tariff_listener_remove:
+            self.tariff_listener_remove()
+            self.tariff_listener_remove = None
+        if self._tariff_timer_cancel:
+            self._tariff_timer_cancel()
+            self._tariff_timer_cancel = None
+
+    async def _setup_tariff(self) -> None:
+        """Load the price series and follow the price sensor's changes."""
+        self._remove_tariff()
+        self._tariff_file_hour = None
+        price_entity = self._get_config_value(CONF_PRICE_ENTITY, None)
+        if price_entity:
+            _LOGGER.info(f"Following energy prices from {price_entity}")
+            self.tariff_listener_remove = self._async_track_state([price_entity], self._handle_price_change)
+        await self._refresh_tariff()
+
+    async def _refresh_tariff(self) -> bool:
+        """Rebuild the tariff plan if the prices changed. The file source is re-read once per hour."""
+        path = self._get_config_value(CONF_PRICE_FILE, "")
+        price_entity = self._get_config_value(CONF_PRICE_ENTITY, None)
+        if path:
+            hour = int(self.clock.now() // 3600)
+            if hour == self._tariff_file_hour:
+                return False
+            self._tariff_file_hour = hour
+            try:
+                prices = await self.hass.async_add_executor_job(load_price_file, self.hass.config.path(path))
+            except (OSError, ValueError) as err:
+                _LOGGER.warning(f"Price file could not be read, keeping the previous plan: {err}")
+                return False
+        elif price_entity:
+            prices = self._prices_from_entity(price_entity)
+        else:
+            prices = []
+
+        changed = self.tariff.rebuild(
+            prices,
+            self._get_config_value(CONF_TARIFF_PREHEAT, DEFAULT_TARIFF_PREHEAT),
+            self._get_config_value(CONF_TARIFF_THRESHOLD, DEFAULT_TARIFF_THRESHOLD),
+        )
+        if changed:
+            _LOGGER.info(f"Tariff plan rebuilt from {len(prices)} price slots, {len(self.tariff.starts)} transitions")
+            self._schedule_tariff_timer()
+        return changed
+
+    def _prices_from_entity(self, entity_id: str) -> list:
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            return []
+        items = []
+        for attribute in self._get_config_value(CONF_PRICE_ATTRIBUTE, DEFAULT_PRICE_ATTRIBUTE).split(","):
+            value = state.attributes.get(attribute.strip())
+            if isinstance(value, list):
+                items.extend(value)
+        return parse_prices(items)
+
+    def _schedule_tariff_timer(self) -> None:
+        """Arm a timer for the next transition of the tariff plan."""
+        if self._tariff_timer_cancel:
+            self._tariff_timer_cancel()
+            self._tariff_timer_cancel = None
+        now = self.clock.now()
+        next_change = self.tariff.next_change(now)
+        if next_change is not None:
+            self._tariff_timer_cancel = self._async_call_later(next_change - now, self._handle_tariff_timer)
+
+    async def _handle_tariff_timer(self, now=None) -> None:
+        self._tariff_timer_cancel = None
+        self._schedule_tariff_timer()
+        await self.async_update()
+
+    async def _handle_price_change(self, event: Event) -> None:
+        if await self._refresh_tariff():
+            await self.async_update()
+
+    def _remove_schedule(self) -> None:
+        if self._schedule_timer_cancel:
+            self._schedule_timer_cancel()
+            self._schedule_timer_cancel = None
+
+    def _setup_schedule(self) -> None:
+        """Compile the weekly schedule and arm the timer for its next transition."""
+        self._remove_schedule()
+        try:
+            self.schedule = parse_schedule(
+                self._get_config_value(CONF_SCHEDULE, None),
+                self._get_config_value(CONF_SCHEDULE_PREHEAT, DEFAULT_SCHEDULE_PREHEAT),
+            )
+        except ValueError as err:
+            _LOGGER.warning(f"Ignoring invalid schedule: {err}")
+            self.schedule = WeeklySchedule()
+        self._apply_schedule()
+
+    def _apply_schedule(self) -> None:
+        local_now = dt_util.as_local(dt_util.utc_from_timestamp(self.clock.now()))
+        mode = self.schedule.mode_at(local_now)
+        if mode != self.schedule_mode:
+            _LOGGER.info(f"Schedule: {self.schedule_mode} -> {mode}")
+        self.schedule_mode = mode
+        next_at = self.schedule.next_transition(local_now)
+        if next_at is not None:
+            # UTC difference, the wall clock distance is off by the DST shift in between
+            delay = (dt_util.as_utc(next_at) - dt_util.as_utc(local_now)).total_seconds()
+            self._schedule_timer_cancel = self._async_call_later(max(delay, 1), self._handle_schedule_timer)
+
+    async def _handle_schedule_timer(self, now=None) -> None:
+        self._schedule_timer_cancel = None
+        self._apply_schedule()
         await self.async_update()
 
     # ========================================================================================
@@ -428,193 +1148,392 @@ class SmartClimateCoordinator:
     # ========================================================================================
     
     async def async_update_ventilation(self, now=None) -> None:
-        """Main loop for ventilation control (runs frequently)."""
+        """Main loop for ventilation control (runs frequently).
+
+        One shared engine drives every zone: humidity triggers and phase timing
+        are evaluated per zone, the schedule and heating coordination are shared.
+        """
         if not self.vent_enabled:
             if self.vent_is_running:
                 await self.stop_ventilation("Ventilation Disabled")
             return
 
-        if not self.vent_is_running:
-            # SAFETY CHECK: Ensure fans are off if system thinks they should be off
-            # Checks every 60 seconds
-            now_ts = time.time()
-            if self.last_vent_safety_check is None or (now_ts - self.last_vent_safety_check) > 60:
-                 self.last_vent_safety_check = now_ts
-                 # Force turn off fan groups just in case
-                 await self._turn_off_fans(self._get_config_value(CONF_FAN_GROUP_A, []))
-                 await self._turn_off_fans(self._get_config_value(CONF_FAN_GROUP_B, []))
-
-            await self._check_ventilation_triggers()
-        
-        if self.vent_is_running:
-            await self._manage_ventilation_cycle()
+        # SAFETY CHECK: Ensure fans of idle zones are off if system thinks they should be off
+        # Checks every 60 seconds
+        now_ts = self.clock.monotonic()
+        if self.last_vent_safety_check is None or (now_ts - self.last_vent_safety_check) > 60:
+            self.last_vent_safety_check = now_ts
+            for zone in self.vent_zones:
+                if not zone.is_running:
+                    # Force turn off fan groups just in case
+                    await self._turn_off_fans(zone.fans)
+
+        await self._update_humidity_trends()
+
+        # Heating coordination: an open window stops heating, so pause the fans as well
+        if self.vent_heating_coordination and self.window.stop_active:
+            for zone in self.vent_zones:
+                if zone.is_running and not zone.is_paused:
+                    _LOGGER.info(f"Window open - pausing ventilation in {zone.name}")
+                    zone.pause()
+                    await self._turn_off_fans(zone.fans)
+            return
+        for zone in self.vent_zones:
+            if zone.is_paused:
+                _LOGGER.info(f"Windows closed - resuming ventilation in {zone.name}")
+                zone.resume(self.clock.monotonic())
+                await self._apply_fan_directions(zone)
+
+        await self._check_ventilation_triggers()
+
+        for zone in self.vent_zones:
+            if zone.is_running:
+                await self._manage_ventilation_cycle(zone)
+
+    def _build_vent_zones(self) -> List[VentZone]:
+        """Main zone from fan groups A/B plus any extra zones from the vent_zones option."""
+        zones = [VentZone(
+            name="Main",
+            fans_a=as_list(self._get_config_value(CONF_FAN_GROUP_A, [])),
+            fans_b=as_list(self._get_config_value(CONF_FAN_GROUP_B, [])),
+            humidity_a=as_list(self._get_config_value(CONF_HUMIDITY_SENSOR_A, None)),
+            humidity_b=as_list(self._get_config_value(CONF_HUMIDITY_SENSOR_B, None)),
+        )]
+        try:
+            zones.extend(parse_vent_zones(self._get_config_value(CONF_VENT_ZONES, [])))
+        except ValueError as e:
+            _LOGGER.error(f"Invalid ventilation zones, using main zone only: {e}")
+        return zones
+
+    async def _reload_vent_zones(self) -> None:
+        """Rebuild zones after an options change, keeping zones whose config is unchanged."""
+        current = {zone.config_key: zone for zone in self.vent_zones}
+        zones = []
+        for zone in self._build_vent_zones():
+            zones.append(current.pop(zone.config_key, zone))
+        for zone in current.values():
+            if zone.is_running:
+                await self._stop_zone(zone, "Zone removed")
+        self.vent_zones = zones
+
+    @property
+    def vent_is_running(self) -> bool:
+        return any(zone.is_running for zone in self.vent_zones)
+
+    @property
+    def vent_main_zone(self) -> VentZone:
+        return self.vent_zones[0]
+
+    def _zone_threshold(self, zone: VentZone) -> float:
+        if zone.humidity_threshold is not None:
+            return zone.humidity_threshold
+        return self.humidity_threshold
+
+    def _zone_fan_speed(self, zone: VentZone) -> int:
+        """Zone fan speed, capped while the heat pump works hard."""
+        speed = zone.fan_speed if zone.fan_speed is not None else self.vent_fan_speed
+        if self.vent_heating_coordination and self.is_heavy_heating:
+            speed = min(speed, self._get_config_value(CONF_VENT_HEATING_FAN_SPEED, DEFAULT_VENT_HEATING_FAN_SPEED))
+        return int(speed)
 
     async def _get_max_humidity(self, sensor_conf: Union[str, List[str], None]) -> float:
-        if not sensor_conf:
-            return 0.0
-        
-        sensors = sensor_conf
-        if isinstance(sensors, str):
-            sensors = [sensors]
-            
         max_hum = 0.0
-        for sensor_id in sensors:
+        for sensor_id in as_list(sensor_conf):
             val = await self._get_sensor_value(sensor_id)
             if val is not None and val > max_hum:
                 max_hum = val
         return max_hum
 
+    async def _update_humidity_trends(self) -> None:
+        """Feed current humidity readings into the per-sensor rolling windows."""
+        if self.humidity_rise_rate <= 0:
+            return
+        now_ts = self.clock.monotonic()
+        sensors = {sensor_id for zone in self.vent_zones for sensor_id in zone.humidity_a + zone.humidity_b}
+        for sensor_id in sensors:
+            val = await self._get_sensor_value(sensor_id)
+            if val is None:
+                continue
+            trend = self.humidity_trends.get(sensor_id)
+            if trend is None:
+                trend = HumidityTrend(self.humidity_rise_window * 60)
+                self.humidity_trends[sensor_id] = trend
+            trend.add(now_ts, val)
+
+    def _get_humidity_rise(self, zone: VentZone) -> tuple[float, Optional[float], Optional[str], int]:
+        """Return the fastest humidity rise in a zone as (rate, baseline, sensor, phase).
+
+        The phase is the one that exhausts the fan group of the rising sensor.
+        """
+        best = (0.0, None, None, 1)
+        now_ts = self.clock.monotonic()
+        for phase, sensors in ((1, zone.humidity_a), (2, zone.humidity_b)):
+            for sensor_id in sensors:
+                trend = self.humidity_trends.get(sensor_id)
+                if trend is None:
+                    continue
+                rate, baseline = trend.rise(now_ts)
+                if rate > best[0]:
+                    best = (rate, baseline, sensor_id, phase)
+        return best
+
+    async def _moisture_exchange_helps(self, indoor_rh: float, running: bool = False) -> bool:
+        """Check whether exchanging air actually lowers indoor water content.
+
+        Compares absolute humidity indoors (room temperature) and outdoors. Without
+        an outdoor humidity sensor, or with missing readings, ventilation is allowed.
+        A running moisture run continues until outdoor air is no longer drier at all.
+        """
+        outdoor_sensor = self._get_config_value(CONF_OUTSIDE_HUMIDITY_SENSOR, None)
+        if not outdoor_sensor:
+            return True
+        outdoor_rh = await self._get_sensor_value(outdoor_sensor)
+        outside_temp = await self._get_sensor_value(self.config.get(CONF_OUTSIDE_SENSOR))
+        indoor_temp = self._room_temperature()
+        if outdoor_rh is None or outside_temp is None or indoor_temp is None:
+            return True
+
+        self.indoor_abs_humidity = round(absolute_humidity(indoor_temp, indoor_rh), 2)
+        self.outdoor_abs_humidity = round(absolute_humidity(outside_temp, outdoor_rh), 2)
+        self.outdoor_dew_point = round(dew_point(outside_temp, outdoor_rh), 1)
+
+        margin = 0.0 if running else HUMIDITY_EXCHANGE_MARGIN
+        self.vent_moisture_blocked = self.outdoor_abs_humidity >= self.indoor_abs_humidity - margin
+        if self.vent_moisture_blocked:
+            _LOGGER.debug(
+                f"Moisture ventilation skipped: outdoor {self.outdoor_abs_humidity} g/m³ "
+                f"vs indoor {self.indoor_abs_humidity} g/m³"
+            )
+        return not self.vent_moisture_blocked
+
     async def _check_ventilation_triggers(self):
-        """Check if we should start ventilation."""
+        """Check if idle zones should start ventilating."""
         
-        # B. Humidity Trigger (Modified with Cooldown check)
-        # Only check humidity if not in cooldown period
-        if time.time() > self.vent_humidity_cooldown_end:
-            hum_a = await self._get_max_humidity(self._get_config_value(CONF_HUMIDITY_SENSOR_A, None))
-            hum_b = await self._get_max_humidity(self._get_config_value(CONF_HUMIDITY_SENSOR_B, None))
+        # B. Humidity Trigger (per zone, Modified with Cooldown check)
+        for zone in self.vent_zones:
+            if zone.is_running:
+                continue
+            # Only check humidity if not in cooldown period
+            if self.clock.monotonic() <= zone.humidity_cooldown_end:
+                continue
+
+            threshold = self._zone_threshold(zone)
+            hum_a = await self._get_max_humidity(zone.humidity_a)
+            hum_b = await self._get_max_humidity(zone.humidity_b)
             
             max_hum = 0
             target_phase = 1 
             
-            if hum_a > self.humidity_threshold:
+            if hum_a > threshold:
                 max_hum = max(max_hum, hum_a)
                 target_phase = 1 
                 
-            if hum_b > self.humidity_threshold:
+            if hum_b > threshold:
                 max_hum = max(max_hum, hum_b)
                 if hum_b > hum_a:
                     target_phase = 2
             
-            if max_hum > self.humidity_threshold:
-                self.vent_run_duration = self._get_config_value(CONF_VENT_DURATION, DEFAULT_VENT_DURATION)
-                await self.start_ventilation_cycle(f"High Humidity ({max_hum:.1f}%)", start_phase=target_phase)
-                return
-        else:
-             # Just for debug/trace if needed, we skip humidity check due to cooldown
-             pass
+            if max_hum > threshold and await self._moisture_exchange_helps(max_hum):
+                await self.start_ventilation_cycle(f"High Humidity ({max_hum:.1f}%)", start_phase=target_phase, zone=zone)
+                continue
 
-        # C. Auto Schedule Trigger
-        if self.vent_auto_interval > 0:
-            now_ts = time.time()
+            # Rate-of-change trigger (e.g. shower) - reacts before the static threshold is reached
+            if self.humidity_rise_rate > 0:
+                rate, baseline, source, rise_phase = self._get_humidity_rise(zone)
+                if rate >= self.humidity_rise_rate and await self._moisture_exchange_helps(
+                    self.humidity_trends[source].latest
+                ):
+                    await self.start_ventilation_cycle(
+                        f"Humidity Rise ({rate:.1f}%/min)", start_phase=rise_phase, zone=zone,
+                        humidity_source=source, humidity_baseline=baseline
+                    )
+
+        # C. Auto Schedule Trigger (shared - a scheduled run ventilates every idle zone)
+        self.vent_deferred_reason = None
+        if self.vent_auto_interval > 0 and not all(zone.is_running for zone in self.vent_zones):
+            now_ts = self.clock.now() # Persisted, so the interval is tracked on the wall clock
             if self.last_vent_auto_run is None:
                 self.last_vent_auto_run = now_ts
                 await self.async_save_state()
             else:
                 elapsed_hours = (now_ts - self.last_vent_auto_run) / 3600
-                if elapsed_hours >= self.vent_auto_interval:
-                    self.vent_run_duration = self._get_config_value(CONF_VENT_DURATION, DEFAULT_VENT_DURATION)
+                if elapsed_hours >= self.vent_auto_interval and self.vent_heating_coordination and self.heat_pump_in_startup:
+                    # Don't pull cold air in while the compressor is still coming up to temperature
+                    self.vent_deferred_reason = "Heat pump start-up"
+                elif elapsed_hours >= self.vent_auto_interval:
                     await self.start_ventilation_cycle(f"Scheduled Run ({self.vent_auto_interval}h)")
                     self.last_vent_auto_run = now_ts
                     await self.async_save_state()
 
-    async def start_ventilation_cycle(self, reason: str, start_phase: int = 1):
-        if self.vent_is_running:
-            return 
-            
-        _LOGGER.info(f"Starting Ventilation: {reason}")
-        self.vent_is_running = True
-        self.vent_reason = reason
-        self.vent_start_time = time.time()
-        self.vent_cycle_start_time = time.time()
-        self.vent_current_phase = start_phase
-        
-        await self._apply_fan_directions(self.vent_current_phase)
-        
-        self.hass.bus.async_fire(f"{DOMAIN}_ventilation_started", {
-            "reason": reason,
-            "duration": self.vent_run_duration
-        })
+    async def start_ventilation_cycle(
+        self, reason: str, start_phase: int = 1, zone: Optional[VentZone] = None,
+        humidity_source: Optional[str] = None, humidity_baseline: Optional[float] = None,
+        duration: Optional[float] = None, manual: bool = False,
+    ):
+        """Start a run in one zone, or in every idle zone when no zone is given."""
+        zones = [zone] if zone is not None else self.vent_zones
+        for target in zones:
+            if target.is_running:
+                continue
 
-    async def stop_ventilation(self, reason: str):
-        _LOGGER.info(f"Stopping Ventilation: {reason}")
-        self.vent_is_running = False
-        self.vent_manual_mode = False
-        self.vent_reason = "Idle"
-        self.vent_current_phase = 0
-        
-        await self._turn_off_fans(self._get_config_value(CONF_FAN_GROUP_A, []))
-        await self._turn_off_fans(self._get_config_value(CONF_FAN_GROUP_B, []))
+            run_duration = duration if duration else self.vent_run_duration
+            _LOGGER.info(f"Starting Ventilation ({target.name}): {reason}")
+            target.start(
+                self.clock.monotonic(), reason, start_phase, run_duration,
+                humidity_source=humidity_source, humidity_baseline=humidity_baseline, manual=manual
+            )
+            await self._update_cycle_time(target)
 
-    async def _manage_ventilation_cycle(self):
-        """Manage direction switching and max duration."""
-        now = time.time()
+            await self._apply_fan_directions(target)
+
+            self.hass.bus.async_fire(f"{DOMAIN}_ventilation_started", {
+                "reason": reason,
+                "zone": target.name,
+                "duration": run_duration
+            })
+
+    async def stop_ventilation(self, reason: str, zone: Optional[VentZone] = None):
+        """Stop one zone, or every zone when no zone is given."""
+        for target in [zone] if zone is not None else self.vent_zones:
+            await self._stop_zone(target, reason)
+
+    async def _stop_zone(self, zone: VentZone, reason: str) -> None:
+        if zone.is_running:
+            _LOGGER.info(f"Stopping Ventilation ({zone.name}): {reason}")
+        zone.stop()
+        await self._turn_off_fans(zone.fans)
+
+    async def _manage_ventilation_cycle(self, zone: VentZone):
+        """Manage direction switching and max duration of one zone."""
+        now = self.clock.monotonic()
+        threshold = self._zone_threshold(zone)
         
         # 0. UPGRADE CHECK: If running Scheduled/Other but humidity rises, switch mode!
         # This prevents "clashing" where scheduled run ignores humidity.
-        if "Humidity" not in self.vent_reason and not self.vent_manual_mode:
-             hum_a = await self._get_max_humidity(self._get_config_value(CONF_HUMIDITY_SENSOR_A, None))
-             hum_b = await self._get_max_humidity(self._get_config_value(CONF_HUMIDITY_SENSOR_B, None))
+        if "Humidity" not in zone.reason and not zone.manual_mode:
+             hum_a = await self._get_max_humidity(zone.humidity_a)
+             hum_b = await self._get_max_humidity(zone.humidity_b)
              current_max = max(hum_a, hum_b)
              
-             if current_max > self.humidity_threshold:
-                  _LOGGER.info(f"High humidity ({current_max}%) detected during '{self.vent_reason}'. Switching to Humidity Mode.")
-                  self.vent_reason = f"Humidity (Merge: {self.vent_reason})"
+             if current_max > threshold and await self._moisture_exchange_helps(current_max):
+                  _LOGGER.info(f"High humidity ({current_max}%) detected during '{zone.reason}' in {zone.name}. Switching to Humidity Mode.")
+                  zone.merge_humidity(f"Humidity (Merge: {zone.reason})")
                   # Now it will be subject to Humidity Stop Logic (Hysteresis)
+             elif self.humidity_rise_rate > 0:
+                  rate, baseline, source, _ = self._get_humidity_rise(zone)
+                  if rate >= self.humidity_rise_rate and await self._moisture_exchange_helps(
+                      self.humidity_trends[source].latest
+                  ):
+                       _LOGGER.info(f"Humidity rising ({rate:.1f}%/min on {source}) during '{zone.reason}'. Switching to Humidity Mode.")
+                       zone.merge_humidity(f"Humidity Rise (Merge: {zone.reason})", source, baseline)
 
         # 1. Check Duration Limits
         max_duration_min = self._get_config_value(CONF_VENT_MAX_DURATION, DEFAULT_VENT_MAX_DURATION)
-        limit_min = min(self.vent_run_duration, max_duration_min)
-        run_time_min = (now - self.vent_start_time) / 60
+        limit_min = min(zone.run_duration, max_duration_min)
+        run_time_min = (now - zone.start_time) / 60
         
         # 2. Humidity Stop Logic (Hysteresis)
-        if "Humidity" in self.vent_reason:
-            hum_a = await self._get_max_humidity(self._get_config_value(CONF_HUMIDITY_SENSOR_A, None))
-            hum_b = await self._get_max_humidity(self._get_config_value(CONF_HUMIDITY_SENSOR_B, None))
+        if "Humidity" in zone.reason:
+            hum_a = await self._get_max_humidity(zone.humidity_a)
+            hum_b = await self._get_max_humidity(zone.humidity_b)
             current_max = max(hum_a, hum_b)
-            
-            # --- FIX: Update reason text dynamically to show current humidity ---
-            if "Merge" not in self.vent_reason:
-                self.vent_reason = f"High Humidity ({current_max:.1f}%)"
-            # ------------------------------------------------------------------
 
-            # If humidity drops below threshold - 5% hysteresis
-            if current_max < (self.humidity_threshold - 5):
-                 await self.stop_ventilation("Humidity normalized")
-                 return
+            # Outdoor air as wet as indoor air (e.g. rain): exchange no longer dries the house.
+            # Pure moisture runs stop, merged scheduled runs keep going for fresh air.
+            if not await self._moisture_exchange_helps(current_max, running=True):
+                if "Merge" not in zone.reason:
+                    await self._stop_zone(zone, "Outdoor air too humid")
+                    return
+            elif zone.humidity_baseline is not None:
+                # Rise-triggered run: stop once the source sensor is back at its pre-event level
+                source_hum = await self._get_sensor_value(zone.humidity_source)
+                if source_hum is not None:
+                    if "Merge" not in zone.reason:
+                        zone.set_reason(f"Humidity Rise ({source_hum:.1f}% -> {zone.humidity_baseline:.1f}%)")
+                    if (source_hum <= zone.humidity_baseline + HUMIDITY_BASELINE_MARGIN
+                            and current_max < threshold):
+                        await self._stop_zone(zone, "Humidity back to baseline")
+                        return
+            else:
+                # --- FIX: Update reason text dynamically to show current humidity ---
+                if "Merge" not in zone.reason:
+                    zone.set_reason(f"High Humidity ({current_max:.1f}%)")
+                # ------------------------------------------------------------------
+
+                # If humidity drops below threshold - 5% hysteresis
+                if current_max < (threshold - 5):
+                     await self._stop_zone(zone, "Humidity normalized")
+                     return
 
         # 3. Timeout Logic with Cooldown
-        if run_time_min >= limit_min and not self.vent_manual_mode:
+        if run_time_min >= limit_min and not zone.manual_mode:
             # If we timed out while trying to clear Humidity, we need a cooldown
             # to prevent infinite loops if it's raining outside.
-            if "Humidity" in self.vent_reason:
-                self.vent_humidity_cooldown_end = now + (15 * 60) # 15 minutes cooldown
-                _LOGGER.info("Humidity run timed out. Enforcing 15m cooldown before retry.")
+            if "Humidity" in zone.reason:
+                zone.start_cooldown(now + (15 * 60)) # 15 minutes cooldown
+                _LOGGER.info(f"Humidity run timed out in {zone.name}. Enforcing 15m cooldown before retry.")
             
-            await self.stop_ventilation(f"Duration reached ({limit_min}m)")
+            await self._stop_zone(zone, f"Duration reached ({limit_min}m)")
             return
 
         # 4. Phase Switching
-        cycle_elapsed = now - self.vent_cycle_start_time
-        if cycle_elapsed >= self.vent_cycle_time:
-            self.vent_cycle_start_time = now
-            if self.vent_current_phase == 1:
-                self.vent_current_phase = 2
-            else:
-                self.vent_current_phase = 1
+        if zone.applied_fan_speed != self._zone_fan_speed(zone):
+            # Heavy heating started or ended - re-apply the current phase at the new speed
+            await self._apply_fan_directions(zone)
+
+        cycle_elapsed = now - zone.cycle_start_time
+        if cycle_elapsed >= zone.effective_cycle_time:
+            zone.flip(now)
+            await self._update_cycle_time(zone)
             
-            _LOGGER.debug(f"Ventilation switching to Phase {self.vent_current_phase}")
-            await self._apply_fan_directions(self.vent_current_phase)
-
-    async def _apply_fan_directions(self, phase: int):
-        fans_a = self._get_config_value(CONF_FAN_GROUP_A, [])
-        fans_b = self._get_config_value(CONF_FAN_GROUP_B, [])
-        dir_a = "forward" if phase == 1 else "reverse"
-        dir_b = "reverse" if phase == 1 else "forward"
-        await self._set_fans(fans_a, dir_a)
-        await self._set_fans(fans_b, dir_b)
-
-    async def _set_fans(self, fan_list, direction):
+            _LOGGER.debug(f"Ventilation ({zone.name}) switching to Phase {zone.phase} ({zone.effective_cycle_time}s)")
+            await self._apply_fan_directions(zone)
+
+    async def _update_cycle_time(self, zone: VentZone) -> None:
+        """Pick the phase length for the next phase and estimate heat recovery.
+
+        In adaptive mode the phase follows the indoor/outdoor temperature difference
+        and fan speed within the configured bounds, otherwise the fixed cycle time is used.
+        """
+        fan_speed = self._zone_fan_speed(zone)
+        cycle_time = self.vent_cycle_time
+        if self.vent_cycle_mode == VENT_CYCLE_MODE_ADAPTIVE:
+            indoor_temp = self._room_temperature()
+            outside_temp = await self._get_sensor_value(self.config.get(CONF_OUTSIDE_SENSOR))
+            if indoor_temp is not None and outside_temp is not None:
+                cycle_time = adaptive_cycle_time(
+                    indoor_temp - outside_temp,
+                    fan_speed,
+                    self._get_config_value(CONF_VENT_CYCLE_MIN, DEFAULT_VENT_CYCLE_MIN),
+                    self._get_config_value(CONF_VENT_CYCLE_MAX, DEFAULT_VENT_CYCLE_MAX),
+                )
+        zone.set_cycle(cycle_time, round(recovery_efficiency(cycle_time, fan_speed), 2))
+
+    async def async_refresh_fan_speed(self) -> None:
+        """Re-apply the current phase of running zones after a speed change."""
+        for zone in self.vent_zones:
+            if zone.is_running and not zone.is_paused:
+                await self._apply_fan_directions(zone)
+
+    async def _apply_fan_directions(self, zone: VentZone):
+        dir_a, dir_b = zone.directions
+        speed = self._zone_fan_speed(zone)
+        zone.fans_applied(speed)
+        await self._set_fans(zone.fans_a, dir_a, speed)
+        await self._set_fans(zone.fans_b, dir_b, speed)
+
+    async def _set_fans(self, fan_list, direction, speed):
         if not fan_list: return
         if isinstance(fan_list, str):
             fan_list = [fan_list]
         for fan in fan_list:
             try:
-                await self.hass.services.async_call(
+                await self.actuator.call(
                     "fan", "set_percentage", 
-                    {"entity_id": fan, "percentage": self.vent_fan_speed}, 
+                    {"entity_id": fan, "percentage": speed}, 
                     blocking=False
                 )
-                await self.hass.services.async_call(
+                await self.actuator.call(
                     "fan", "set_direction", 
                     {"entity_id": fan, "direction": direction}, 
                     blocking=False
@@ -628,7 +1547,7 @@ class SmartClimateCoordinator:
             fan_list = [fan_list]
         for fan in fan_list:
             try:
-                await self.hass.services.async_call(
+                await self.actuator.call(
                     "fan", "turn_off", {"entity_id": fan}, blocking=False
                 )
             except Exception as e:
@@ -641,40 +1560,56 @@ class SmartClimateCoordinator:
     async def async_update(self, now=None) -> None:
         """Update climate control logic."""
         try:
-            if not self.smart_control_enabled:
-                if self.smart_control_active:
+            if not self.climate.smart_control_enabled:
+                if self.climate.smart_control_active:
                     await self._release_control()
                 return
             
-            self.smart_control_active = True
+            self.climate.activate()
+
+            room_temp, room_source, outside_temp, avg_house_temp = self._conditioned_inputs()
+            fingerprint = self._input_fingerprint(room_temp, outside_temp, avg_house_temp)
+            if fingerprint == self._fingerprint and not self._verification_pending() and (
+                self._next_deadline is None or self.clock.monotonic() < self._next_deadline
+            ):
+                self.skipped_updates += 1
+                if self._event_payload is not None and self._event_heartbeat_due():
+                    self._send_state_event()
+                return
+            self._fingerprint = None # Set again once this evaluation went through
             
-            # Get sensor values
-            room_temp = await self._get_sensor_value(self.config[CONF_ROOM_SENSOR])
-            outside_temp = None
-            if self.config.get(CONF_OUTSIDE_SENSOR):
-                outside_temp = await self._get_sensor_value(self.config[CONF_OUTSIDE_SENSOR], 5.0)
-            else:
-                outside_temp = 5.0
+            if room_source not in ("room", None):
+                _LOGGER.debug(f"Room sensor not usable, using {room_source} temperature {room_temp}")
+
+            if self._get_config_value(CONF_PRICE_FILE, ""):
+                await self._refresh_tariff()
+
+            # A colder forecast within the lookahead is acted on now (earlier compensation and temperating)
+            await self._refresh_forecast()
+            forecast_outside_temp = self._forecast_outside_temp()
+            control_outside_temp = outside_temp
+            if forecast_outside_temp is not None and forecast_outside_temp < outside_temp:
+                control_outside_temp = forecast_outside_temp
             
             # Check windows (returns True if heating should stop)
             window_open_stop_heating = await self._check_window_status()
+            self.window.set_stop(window_open_stop_heating)
             
             # For HEATING mode
-            if self.current_hvac_mode == "heat":
-                avg_house_temp = await self._get_sensor_value(self.config.get(CONF_AVERAGE_SENSOR))
+            if self.climate.current_hvac_mode == "heat":
                 await self._check_sleep_status()
                 base_temp = self._determine_base_temperature()
                 
                 action, temperature, reason = await self._calculate_heating_control(
-                    room_temp, outside_temp, avg_house_temp, base_temp, window_open_stop_heating
+                    room_temp, control_outside_temp, avg_house_temp, base_temp, window_open_stop_heating
                 )
                 
                 original_temperature = temperature
-                self.comfort_offset_applied = 0.0
+                comfort_offset = 0.0
                 is_temperating = "Temperating" in reason
                 
                 # Apply Offset logic
-                if self.current_hvac_mode == "heat" and action == "on" and temperature is not None:
+                if self.climate.current_hvac_mode == "heat" and action == "on" and temperature is not None:
                     if not is_temperating and self.is_comfort_mode_active:
                         offset_value = self.entry.options.get("comfort_temp_offset")
                         if offset_value is None:
@@ -682,65 +1617,176 @@ class SmartClimateCoordinator:
                         
                         if offset_value > 0:
                             temperature += offset_value
-                            self.comfort_offset_applied = offset_value
+                            comfort_offset = offset_value
                 
                 # Apply weather compensation for heating
                 weather_compensation = 0
                 has_outside_sensor = self.config.get(CONF_OUTSIDE_SENSOR) is not None
                 
-                if action == "on" and has_outside_sensor and outside_temp < 0 and temperature is not None:
-                    weather_compensation = min(abs(outside_temp) * self.weather_comp_factor, 5.0)
+                if action == "on" and has_outside_sensor and temperature is not None:
+                    weather_compensation = self._weather_compensation(control_outside_temp)
                     temperature = min(temperature + weather_compensation, self.max_comp_temp)
                     temperature = max(temperature, self.min_comp_temp)
-                    temperature = round(temperature)
+                    temperature = quantize(temperature, self._setpoint_step())
                 
+                stages = self._update_staging(action, room_temp, base_temp, window_open_stop_heating)
+
                 # Min runtime calculation for debug
-                self.min_runtime_remaining_minutes = 0
-                if self.last_heat_pump_start is not None and action == "on":
-                    elapsed = time.time() - self.last_heat_pump_start
-                    remaining = max(0, self.min_runtime - elapsed)
+                min_runtime_remaining = 0
+                runtime = self.compressor.runtime(self.clock.monotonic())
+                if runtime is not None and action == "on":
+                    remaining = max(0, self.min_runtime - runtime)
                     if remaining > 0:
-                        self.min_runtime_remaining_minutes = int(remaining / 60)
+                        min_runtime_remaining = int(remaining / 60)
                 
-                self.debug_text = self._format_debug_text(
-                    action, temperature, room_temp, None, outside_temp, reason,
-                    original_temperature, weather_compensation, has_outside_sensor, "heat"
-                )
+                self._set_decision({
+                    "mode": "heat",
+                    "action": action,
+                    "temperature": temperature,
+                    "reason": reason,
+                    "room_temp": room_temp,
+                    "room_source": room_source,
+                    "avg_house_temp": avg_house_temp,
+                    "outside_temp": outside_temp if has_outside_sensor else None,
+                    "forecast_outside_temp": forecast_outside_temp,
+                    "base_temp": base_temp,
+                    "original_temperature": original_temperature,
+                    "weather_compensation": weather_compensation,
+                    "comfort_offset": comfort_offset,
+                    "preset": self._active_preset_name(),
+                    "tariff": self.tariff.mode_at(self.clock.now()),
+                    "schedule": self.schedule_mode,
+                    "window_stop": window_open_stop_heating,
+                    "sleep_active": self.climate.sleep_mode_active,
+                    "min_runtime_remaining": min_runtime_remaining,
+                    "stages": stages,
+                })
             
             # For COOLING mode
             else:
-                self.comfort_offset_applied = 0.0
-                self.min_runtime_remaining_minutes = 0
+                comfort_offset = 0.0
+                min_runtime_remaining = 0
                 
                 base_temp = self.cooling_temp
                 action, temperature, reason = await self._calculate_cooling_control(
                     room_temp, base_temp, window_open_stop_heating
                 )
+                stages = self._update_staging(action, room_temp, base_temp, window_open_stop_heating)
                 
-                self.debug_text = self._format_debug_text(
-                    action, temperature, room_temp, None, None, reason,
-                    None, 0, False, "cool"
-                )
+                self._set_decision({
+                    "mode": "cool",
+                    "action": action,
+                    "temperature": temperature,
+                    "reason": reason,
+                    "room_temp": room_temp,
+                    "room_source": room_source,
+                    "base_temp": base_temp,
+                    "window_stop": window_open_stop_heating,
+                    "min_runtime_remaining": min_runtime_remaining,
+                    "stages": stages,
+                })
             
-            self.current_action = action
+            self.climate.record_decision(action, comfort_offset, min_runtime_remaining)
             # MÓDOSÍTÁS: A window_open_stop_heating értéket átadjuk bypass_protection-ként
             # Így ha ablak miatt kell leállni, nem számít a minimum működési idő.
-            await self._control_heat_pump_directly(action, temperature, self.current_hvac_mode, bypass_protection=window_open_stop_heating)
+            await self._control_heat_pump_directly(action, temperature, self.climate.current_hvac_mode, bypass_protection=window_open_stop_heating)
+            if stages is not None:
+                await self._control_lag_units(action, temperature, self.climate.current_hvac_mode)
             await self._verify_heat_pump_with_contact_sensor()
             
-            self.hass.bus.async_fire(f"{DOMAIN}_state_updated", {
-                "entry_id": self.entry.entry_id,
-                "action": action,
-                "temperature": temperature,
-                "debug": self.debug_text,
-                "comfort_offset_applied": self.comfort_offset_applied,
-                "min_runtime_remaining_minutes": self.min_runtime_remaining_minutes
-            })
+            self._fire_state_event(action, temperature)
+            self._fingerprint = fingerprint
+            self._next_deadline = self._evaluation_deadline()
             
         except Exception as e:
             _LOGGER.error(f"Error in climate control update: {e}")
             self.debug_text = f"Error: {str(e)}"
     
+    def _fire_state_event(self, action: str, temperature: Optional[float]) -> None:
+        """Fire state_updated when action, target or mode changed, or the heartbeat is due."""
+        payload = {
+            "entry_id": self.entry.entry_id,
+            "action": action,
+            "temperature": temperature,
+            "mode": self.climate.current_hvac_mode,
+            "preset": self._active_preset_name(),
+        }
+        if payload == self._event_payload and not self._event_heartbeat_due():
+            return
+        self._event_payload = payload
+        self._send_state_event()
+
+    def _send_state_event(self) -> None:
+        self._event_seq += 1
+        self._event_sent_at = self.clock.monotonic()
+        self.hass.bus.async_fire(f"{DOMAIN}_state_updated", {**self._event_payload, "seq": self._event_seq})
+
+    def _event_heartbeat_due(self) -> bool:
+        heartbeat = self._get_config_value(CONF_EVENT_HEARTBEAT, DEFAULT_EVENT_HEARTBEAT)
+        return bool(heartbeat) and self._event_sent_at is not None and (
+            self.clock.monotonic() - self._event_sent_at >= heartbeat * 60
+        )
+
+    def _input_fingerprint(
+        self, room_temp: Optional[float], outside_temp: float, avg_house_temp: Optional[float],
+    ) -> Tuple[Any, ...]:
+        """Everything a decision depends on, cheap to collect.
+
+        The conditioned temperatures, presence and contact state values (not
+        timestamps, attribute-only updates do not matter), modes and targets,
+        the time dependent lookups (tariff slot, forecast window, clock hour
+        for the hourly refreshes) and the previous decision's own feedback
+        (action, compensation hysteresis).
+        """
+        states = self.hass.states
+        sensors = [room_temp, outside_temp, avg_house_temp]
+        for entity_id in (self.config.get(CONF_PRESENCE_TRACKER), self.config.get(CONF_HEAT_PUMP_CONTACT)):
+            state = states.get(entity_id) if entity_id else None
+            sensors.append(state.state if state else None)
+        climate = self.climate
+        wall_now = self.clock.now()
+        return (
+            *sensors,
+            climate.current_hvac_mode, climate.current_action, climate.override_mode, climate.force_eco_mode,
+            climate.force_comfort_mode, climate.boost_until, climate.sleep_mode_active, climate.curve_offset,
+            climate.last_avg_house_over_limit,
+            self.comfort_temp, self.eco_temp, self.boost_temp, self.cooling_temp,
+            self.window.state, self.sleep.active, self.schedule_mode, self.tariff.mode_at(wall_now),
+            int(wall_now // 3600), self._forecast_outside_temp(), self.staging.lead, self.staging.stages,
+        )
+
+    def _verification_pending(self) -> bool:
+        """Heat pump commanded on while its contact sensor says it is not running.
+
+        Every cycle retries and notifies then (see _verify_heat_pump_with_contact_sensor),
+        so unchanged inputs must not skip it.
+        """
+        contact_sensor = self.config.get(CONF_HEAT_PUMP_CONTACT)
+        if not contact_sensor or self.climate.current_action != "on":
+            return False
+        state = self.hass.states.get(contact_sensor)
+        return state is not None and state.state != "on"
+
+    def _evaluation_deadline(self) -> Optional[float]:
+        """Monotonic time the next tick must evaluate even with unchanged inputs."""
+        now = self.clock.monotonic()
+        if self.compressor.in_min_runtime(now, self.min_runtime):
+            # Min runtime expiry and its countdown in the status
+            return now
+        deadlines = [flt.stale_at() for flt in self.inputs.values()]
+        if self._last_known is not None:
+            deadlines.append(self._last_known[1] + LAST_KNOWN_HOLD)
+        if self.staging.stages and self.staging.stage_changed is not None:
+            deadlines.append(self.staging.stage_changed + self.stage_delay)
+        if self.staging.error_since is not None:
+            deadlines.append(self.staging.error_since + self.stage_delay)
+        upcoming = [deadline for deadline in deadlines if deadline is not None and deadline > now]
+        return min(upcoming) if upcoming else None
+
+    def _invalidate_fingerprint(self) -> None:
+        """Evaluate on the next tick (options or control state changed outside the inputs)."""
+        self._fingerprint = None
+
     async def _get_sensor_value(self, entity_id: str, default: Optional[float] = None) -> Optional[float]:
         """Get sensor value with validation."""
         if not entity_id:
@@ -759,111 +1805,21 @@ class SmartClimateCoordinator:
         return default
     
     async def _check_window_status(self) -> bool:
-        """Check status of windows with hysteresis (cooldown) on close."""
-        open_sensors_ids = []
-        open_sensors_names = []
-        
-        configured_delay = self.window_delay_minutes
-        
-        # 1. Collect all window sensors
-        window_sensors = self._get_config_value(CONF_WINDOW_SENSORS, [])
-        # Ensure it is a list
-        if isinstance(window_sensors, str):
-            window_sensors = [window_sensors]
-            
-        door_sensor = self.config.get(CONF_DOOR_SENSOR)
-        
-        # Helper to check if a sensor is open
-        def is_open(entity_id):
-            if not entity_id: return False
-            st = self.hass.states.get(entity_id)
-            return st and st.state in [STATE_ON, "true", STATE_OPEN]
-
-        # Check Window Sensors
-        for sensor_id in window_sensors:
-            if is_open(sensor_id):
-                open_sensors_ids.append(sensor_id)
-                st = self.hass.states.get(sensor_id)
-                open_sensors_names.append(st.name if st.name else sensor_id)
-
-        # Check Door Sensor
-        if is_open(door_sensor):
-            open_sensors_ids.append(door_sensor)
-            st = self.hass.states.get(door_sensor)
-            open_sensors_names.append(st.name if st.name else door_sensor)
-
-        # Update detailed status for sensor.py
-        self.open_window_details = open_sensors_names
-        
-        now = time.time()
-        
-        # LOGIC:
-        if open_sensors_ids:
-            # CASE: Window is OPEN
-            
-            # Reset cooldown because window is open again
-            self.window_cooldown_start = None
-            
-            # Start timer if this is the first detection
-            if self.window_open_start is None:
-                self.window_open_start = now
-                _LOGGER.info(f"Window/Door open detected: {open_sensors_names}. Timer started.")
-                return False # Allow delay time before acting
-            else:
-                elapsed_minutes = (now - self.window_open_start) / 60
-                
-                if elapsed_minutes > configured_delay:
-                    return True # Stop Heating/Cooling
-                else:
-                    return False # Within delay
-        else:
-            # CASE: Window is CLOSED
-            
-            # If we were previously in "Window Open" mode (timer active)
-            if self.window_open_start is not None:
-                
-                # Check if we ACTUALLY reached the limit where we stopped the heat.
-                # If we closed the window BEFORE the delay passed, we should NOT enter cooldown,
-                # just reset everything.
-                elapsed_since_open = (now - self.window_open_start) / 60
-                
-                if elapsed_since_open < configured_delay:
-                    # We closed it before the timer triggered a stop.
-                    # Just reset.
-                    _LOGGER.info(f"Window closed before delay ({elapsed_since_open:.1f}m < {configured_delay}m). Resetting timer, no cooldown.")
-                    self.window_open_start = None
-                    self.window_cooldown_start = None
-                    return False
-
-                # If we haven't started cooldown yet, start it now
-                if self.window_cooldown_start is None:
-                    self.window_cooldown_start = now
-                    _LOGGER.info("All windows closed after being open > delay. Starting restore cooldown.")
-                
-                # Check cooldown duration
-                cooldown_elapsed = (now - self.window_cooldown_start) / 60
-                
-                if cooldown_elapsed < configured_delay:
-                    # Still cooling down / waiting to restore
-                    return True # Keep Heating OFF
-                else:
-                    # Cooldown complete
-                    _LOGGER.info("Window restore cooldown complete. Resuming climate control.")
-                    self.window_open_start = None
-                    self.window_cooldown_start = None
-                    return False
-            else:
-                # Normal operation, no windows tracking
-                self.window_cooldown_start = None
-                return False
+        """Whether an open window keeps climate off (open beyond delay, or restore cooldown).
+
+        The state machine is kept current by the sensor events and its timer,
+        this only applies a transition that fell due in between.
+        """
+        if self.window.advance(self.clock.monotonic()):
+            _LOGGER.info(f"Window state: {self.window.state} (open: {self.window.open_details})")
+            self._schedule_window_timer()
+        return self.window.stop_climate
 
     async def _check_sleep_status(self) -> None:
-        """Check if sleep mode should be active."""
-        bed_sensors = self.config.get(CONF_BED_SENSORS, [])
-        if len(bed_sensors) >= 1:
-            bed_sensor = self.hass.states.get(bed_sensors[0])
-            if bed_sensor:
-                self.sleep_mode_active = (bed_sensor.state == "on")
+        """Check if sleep mode should be active (kept current by the bed sensor events)."""
+        if self.sleep.advance(self.clock.monotonic()):
+            self._schedule_sleep_timer()
+        self._apply_sleep_state()
             
     async def _check_presence_status(self) -> bool:
         """Check if someone is home."""
@@ -887,9 +1843,15 @@ class SmartClimateCoordinator:
         else: return state_value not in ['away', 'not_home', 'not home', 'off', '0', 'false', 'unknown', 'unavailable']
 
     def _determine_base_temperature(self) -> float:
-        if self.force_comfort_mode: return self.comfort_temp
-        elif self.force_eco_mode or self.sleep_mode_active: return self.eco_temp
-        elif self.override_mode: return self.comfort_temp
+        if self.climate.boost_active: return self.boost_temp
+        if self.climate.force_comfort_mode: return self.comfort_temp
+        elif self.climate.force_eco_mode or self.climate.sleep_mode_active: return self.eco_temp
+        elif self.climate.override_mode: return self.comfort_temp
+        if self.schedule_mode == SCHEDULE_BOOST: return self.boost_temp
+        if self.schedule_mode == SCHEDULE_ECO: return self.eco_temp
+        if self.tariff.mode_at(self.clock.now()) == TARIFF_COAST:
+            return self.eco_temp
+        # Pre-heat keeps the comfort base, it only starts heating earlier (see _calculate_heating_control)
         return self.comfort_temp
     
     async def _calculate_heating_control(
@@ -900,34 +1862,44 @@ class SmartClimateCoordinator:
         # 1. Window Safety Logic (Highest Priority)
         if window_open_stop:
             status_msg = "Window/Door open"
-            if self.window_cooldown_start is not None:
+            if self.window.state == WINDOW_COOLDOWN:
                 status_msg = "Window closed - Waiting restore"
             return "off", base_temp, status_msg
             
-        if self.last_heat_pump_start is not None:
-            elapsed = time.time() - self.last_heat_pump_start
-            if elapsed < self.min_runtime:
-                return "on", base_temp, f"Minimum runtime active"
+        if self.compressor.in_min_runtime(self.clock.monotonic(), self.min_runtime):
+            return "on", base_temp, f"Minimum runtime active"
                 
-        if self.override_mode: return "on", base_temp, "Manual override"
+        if self.climate.override_mode: return "on", base_temp, "Manual override"
+        if self.schedule_mode == SCHEDULE_OFF and not self.climate.boost_active:
+            return "off", base_temp, "Schedule off"
         someone_home = await self._check_presence_status()
         if not someone_home: return "off", base_temp, "Nobody home"
 
         if avg_house_temp is not None:
-            if self.last_avg_house_over_limit:
+            if self.climate.last_avg_house_over_limit:
                 if avg_house_temp > (self.max_house_temp - 0.5): return "off", base_temp, "House temp limit"
             elif avg_house_temp > self.max_house_temp:
-                self.last_avg_house_over_limit = True
+                self.climate.set_house_over_limit(True)
                 return "off", base_temp, "House temp limit"
             else:
-                self.last_avg_house_over_limit = False
+                self.climate.set_house_over_limit(False)
                 
         if room_temp is None: return "off", base_temp, "No room temp data"
+        if self.climate.boost_active and room_temp < base_temp:
+            # Fast recovery: heat straight up to the boost target, no deadband wait
+            return "on", base_temp, f"Boost ({room_temp:.1f}°C < {base_temp:.1f}°C)"
         turn_on_temp = base_temp - self.deadband_below
         turn_off_temp = base_temp + self.deadband_above
+        if (
+            base_temp == self.comfort_temp
+            and not self.climate.boost_active
+            and self.tariff.mode_at(self.clock.now()) == TARIFF_PREHEAT
+        ):
+            # Cheap slot before an expensive one: charge up to the top of the comfort band, not above it
+            turn_on_temp = base_temp
         
         if room_temp <= turn_on_temp:
-            self.last_heat_pump_start = time.time()
+            self.compressor.started(self.clock.monotonic(), restart=True)
             return "on", base_temp, f"Heating needed ({room_temp:.1f}°C <= {turn_on_temp:.1f}°C)"
         elif room_temp >= turn_off_temp:
             if self.is_comfort_mode_active and outside_temp < self.low_temp_threshold:
@@ -937,10 +1909,9 @@ class SmartClimateCoordinator:
             else:
                 return "off", base_temp, f"Too hot ({room_temp:.1f}°C >= {turn_off_temp:.1f}°C)"
         else:
-            if self.current_action == "on" and self.last_heat_pump_start is not None:
-                elapsed = time.time() - self.last_heat_pump_start
-                if elapsed < self.min_runtime: return "on", base_temp, "Min runtime active"
-            return self.current_action, base_temp, "In deadband"
+            if self.climate.current_action == "on" and self.compressor.in_min_runtime(self.clock.monotonic(), self.min_runtime):
+                return "on", base_temp, "Min runtime active"
+            return self.climate.current_action, base_temp, "In deadband"
     
     async def _calculate_cooling_control(
         self, room_temp: Optional[float], base_temp: float, window_open_stop: bool
@@ -948,7 +1919,7 @@ class SmartClimateCoordinator:
         
         if window_open_stop:
              status_msg = "Window/Door open"
-             if self.window_cooldown_start is not None:
+             if self.window.state == WINDOW_COOLDOWN:
                  status_msg = "Window closed - Waiting restore"
              return "off", base_temp, status_msg
              
@@ -961,21 +1932,93 @@ class SmartClimateCoordinator:
         
         if room_temp >= turn_on_temp: return "on", base_temp, f"Cooling needed ({room_temp:.1f}°C >= {turn_on_temp:.1f}°C)"
         elif room_temp <= turn_off_temp: return "off", base_temp, f"Too cold ({room_temp:.1f}°C <= {turn_off_temp:.1f}°C)"
-        else: return self.current_action, base_temp, "In deadband"
+        else: return self.climate.current_action, base_temp, "In deadband"
     
+    def _zone_units(self) -> List[str]:
+        """Main heat pump followed by the configured lag units."""
+        units = [self.config[CONF_HEAT_PUMP]]
+        for unit in as_list(self._get_config_value(CONF_LAG_HEAT_PUMPS, [])):
+            if unit not in units:
+                units.append(unit)
+        return units
+
+    def _setup_staging(self) -> None:
+        """Rebuild the zone after the lag units changed, keeping the runtime totals."""
+        units = self._zone_units()
+        if units == self.staging.units:
+            return
+        now = self.clock.monotonic()
+        runtime = {unit: self.staging.runtime_of(unit, now) for unit in self.staging.units}
+        self.staging = StagingState(units, runtime)
+        self._lag_sent.clear()
+        if self.heat_pump_entity_id != units[0]:
+            self.heat_pump_entity_id = units[0]
+            self.compressor.forget_sent()
+
+    def _update_staging(self, action: str, room_temp: Optional[float], base_temp: float, bypass_protection: bool) -> Optional[int]:
+        """Stage the zone's units for this decision. None without lag units."""
+        if len(self.staging.units) < 2:
+            return None
+        now = self.clock.monotonic()
+        # A lead kept on by min runtime still counts as running
+        on = action == "on" or (not bypass_protection and self.compressor.in_min_runtime(now, self.min_runtime))
+        error = None
+        if room_temp is not None:
+            error = base_temp - room_temp if self.climate.current_hvac_mode == "heat" else room_temp - base_temp
+        lead = self.staging.lead
+        if self.staging.update(on, error, now, self.stage_delay, self.stage_error):
+            _LOGGER.info(f"Zone staging: {self.staging.stages}/{len(self.staging.units)} units ({', '.join(self.staging.active) or 'none'})")
+        if self.staging.lead != lead:
+            # Only happens while the whole zone is off
+            _LOGGER.info(f"Zone lead rotated: {lead} -> {self.staging.lead}")
+            self.heat_pump_entity_id = self.staging.lead
+            self._lag_sent.pop(self.staging.lead, None)
+            self.compressor.forget_sent()
+        return self.staging.stages
+
+    async def _control_lag_units(self, action: str, temperature: Optional[float], hvac_mode: str) -> None:
+        """Send the lead's setpoint to the engaged lag units and turn the others off."""
+        active = self.staging.active
+        for unit in self.staging.order[1:]:
+            wanted = (action, temperature, hvac_mode) if unit in active and temperature is not None else ("off", None, hvac_mode)
+            if self._lag_sent.get(unit) == wanted:
+                continue
+            state = self.hass.states.get(unit)
+            if not state:
+                _LOGGER.error(f"Heat pump entity {unit} not found")
+                continue
+            self._lag_sent[unit] = wanted
+            if wanted[0] == "off" and state.state == "off":
+                continue
+            if wanted[0] == "on":
+                _LOGGER.info(f"Sending lag unit command: {unit} mode={hvac_mode}, temp={temperature}°C")
+                await self.actuator.call(
+                    "climate", "set_temperature",
+                    {"entity_id": unit, "temperature": temperature, "hvac_mode": hvac_mode},
+                    blocking=True,
+                )
+            else:
+                _LOGGER.info(f"Turning off lag unit {unit}")
+                await self.actuator.call("climate", "turn_off", {"entity_id": unit}, blocking=True)
+
     async def _control_heat_pump_directly(self, action: str, temperature: Optional[float], hvac_mode: str, bypass_protection: bool = False) -> None:
         """Control the heat pump entity directly with minimum runtime enforcement."""
-        now = time.time()
+        now = self.clock.monotonic()
     
         # Ellenőrizzük, ha kikapcsolásra készül, hogy a minimum futásidő letelt-e
         # MÓDOSÍTÁS: Csak akkor blokkoljuk a leállást, ha NINCS bypass (azaz nem vészleállás/ablaknyitás)
-        if action == "off" and self.last_heat_pump_start is not None and not bypass_protection:
-            runtime = now - self.last_heat_pump_start
+        runtime = self.compressor.runtime(now)
+        if action == "off" and runtime is not None and not bypass_protection:
             if runtime < self.min_runtime:
                 _LOGGER.info(f"Minimum runtime not reached ({runtime:.0f}s < {self.min_runtime}s), keeping heat pump on.")
                 return
     
-        if action == self.last_sent_action and temperature == self.last_sent_temperature and hvac_mode == self.last_sent_hvac_mode:
+        if self.compressor.first_command():
+            # First command after a restart: skip it when the pump is already where we want it
+            if self.compressor.last_sent_action is None and self._adopt_heat_pump_state(action, temperature, hvac_mode):
+                return
+
+        if self.compressor.is_last_sent(action, temperature, hvac_mode):
             return
     
         heat_pump_state = self.hass.states.get(self.heat_pump_entity_id)
@@ -985,18 +2028,15 @@ class SmartClimateCoordinator:
     
         current_hvac_mode = heat_pump_state.state
     
-        self.last_sent_action = action
-        self.last_sent_temperature = temperature
-        self.last_sent_hvac_mode = hvac_mode
+        self.compressor.command_sent(action, temperature, hvac_mode)
     
         if action == "on" and temperature is not None:
-            if self.last_heat_pump_start is None:
-                self.last_heat_pump_start = now
+            self.compressor.started(now)
             await self.async_save_state()
             
             for attempt in range(3):
                 _LOGGER.info(f"Sending heat pump command: mode={hvac_mode}, temp={temperature}°C (attempt {attempt+1}/3)")
-                await self.hass.services.async_call(
+                result = await self.actuator.call(
                     "climate",
                     "set_temperature",
                     {
@@ -1005,9 +2045,14 @@ class SmartClimateCoordinator:
                         "hvac_mode": hvac_mode,
                     },
                     blocking=True,
+                    force=attempt > 0,
                 )
+                if result == CALL_DEFERRED:
+                    # Not sent yet, there is nothing to acknowledge
+                    _LOGGER.info("Heat pump command deferred by the actuator limits")
+                    break
     
-                await asyncio.sleep(8)
+                await self.clock.sleep(8)
                 new_state = self.hass.states.get(self.heat_pump_entity_id)
     
                 if not new_state:
@@ -1029,20 +2074,25 @@ class SmartClimateCoordinator:
                         f" Heat pump did not respond properly on attempt {attempt+1}: "
                         f"mode={new_mode}, hvac_action={hvac_action}, temp={new_temp}"
                     )
-                    await asyncio.sleep(3)
+                    await self.clock.sleep(3)
             else:
                 _LOGGER.error(f" Failed to start heat pump after 3 attempts")
         elif action == "off":
+            if self.compressor.running:
+                # Compressor stops - a stale start time must not count towards the next run
+                self.compressor.stopped()
+                await self.async_save_state()
             for attempt in range(3):
                 _LOGGER.info(f"Turning off heat pump (attempt {attempt+1}/3)")
-                await self.hass.services.async_call(
+                await self.actuator.call(
                     "climate",
                     SERVICE_TURN_OFF,
                     {"entity_id": self.heat_pump_entity_id},
                     blocking=True,
+                    force=attempt > 0,
                 )
     
-                await asyncio.sleep(12)
+                await self.clock.sleep(12)
     
                 new_state = self.hass.states.get(self.heat_pump_entity_id)
                 if not new_state:
@@ -1053,7 +2103,7 @@ class SmartClimateCoordinator:
                     break
                 else:
                     _LOGGER.warning(f"Heat pump still on after attempt {attempt+1}, current state: {new_state.state}")
-                    await asyncio.sleep(5)
+                    await self.clock.sleep(5)
     
     async def _verify_heat_pump_with_contact_sensor(self) -> None:
         """Verify heat pump is actually running using contact sensor."""
@@ -1061,10 +2111,13 @@ class SmartClimateCoordinator:
         if not contact_sensor:
             return
         
-        if self.current_action != "on":
+        if self.climate.current_action != "on":
+            return
+        if self.actuator.is_pending(self.heat_pump_entity_id):
+            # The command has not been sent yet
             return
         
-        await asyncio.sleep(20)
+        await self.clock.sleep(20)
         
         vent_state = self.hass.states.get(contact_sensor)
         if not vent_state:
@@ -1078,32 +2131,36 @@ class SmartClimateCoordinator:
             
             heat_pump_state = self.hass.states.get(self.heat_pump_entity_id)
             if heat_pump_state:
-                current_temp = heat_pump_state.attributes.get('temperature', self.comfort_temp if self.current_hvac_mode == "heat" else self.cooling_temp)
+                current_temp = heat_pump_state.attributes.get('temperature', self.comfort_temp if self.climate.current_hvac_mode == "heat" else self.cooling_temp)
                 
-                await self.hass.services.async_call(
+                result = await self.actuator.call(
                     "climate",
                     "set_temperature",
                     {
                         "entity_id": self.heat_pump_entity_id,
                         "temperature": current_temp,
-                        "hvac_mode": self.current_hvac_mode,
+                        "hvac_mode": self.climate.current_hvac_mode,
                     },
                     blocking=True,
+                    force=True, # Same state again on purpose
                 )
+                if result == CALL_DEFERRED:
+                    _LOGGER.info("Heat pump retry deferred by the actuator limits, verifying on the next cycle")
+                    return
                 
-                await asyncio.sleep(20)
+                await self.clock.sleep(20)
                 verify_state = self.hass.states.get(contact_sensor)
                 
                 if verify_state and verify_state.state == "on":
                     _LOGGER.info(f" Heat pump started after retry")
-                    await self.hass.services.async_call(
+                    await self.actuator.call(
                         "persistent_notification",
                         "dismiss",
                         {"notification_id": "smart_climate_heat_pump_alert"}
                     )
                 else:
                     _LOGGER.error(f" Heat pump still not running after retry")
-                    await self.hass.services.async_call(
+                    await self.actuator.call(
                         "persistent_notification",
                         "create",
                         {
@@ -1114,7 +2171,7 @@ class SmartClimateCoordinator:
                     )
         else:
             _LOGGER.debug(f" Heat pump verified running via contact sensor")
-            await self.hass.services.async_call(
+            await self.actuator.call(
                 "persistent_notification",
                 "dismiss",
                 {"notification_id": "smart_climate_heat_pump_alert"}
@@ -1122,32 +2179,73 @@ class SmartClimateCoordinator:
     
     async def _release_control(self) -> None:
         if self.hass.states.get(self.heat_pump_entity_id):
-             await self.hass.services.async_call("climate", "turn_off", {"entity_id": self.heat_pump_entity_id}, blocking=False)
-        self.smart_control_active = False
-        self.last_sent_action = None
-        self.current_action = "off"
+             await self.actuator.call("climate", "turn_off", {"entity_id": self.heat_pump_entity_id}, blocking=False, force=True)
+        for unit in self.staging.active[1:]:
+            await self.actuator.call("climate", "turn_off", {"entity_id": unit}, blocking=False, force=True)
+        self.staging.update(False, None, self.clock.monotonic(), 0, 0)
+        self._lag_sent.clear()
+        self._invalidate_fingerprint()
+        self.climate.release()
+        self.compressor.forget_sent()
+        self.window.set_stop(False)
         self.debug_text = "Smart control disabled"
     
-    def _format_debug_text(self, action, temperature, room_temp, avg_house_temp, outside_temp, reason, original_temperature, weather_compensation, has_outside_sensor, mode="heat") -> str:
+    def _active_preset_name(self) -> str:
+        if self.climate.boost_active: return "Boost"
+        if self.climate.override_mode: return "Force Comfort"
+        if self.climate.force_eco_mode: return "Force Eco"
+        if self.schedule_mode in (SCHEDULE_ECO, SCHEDULE_BOOST, SCHEDULE_OFF): return f"Schedule {self.schedule_mode.capitalize()}"
+        tariff_mode = self.tariff.mode_at(self.clock.now())
+        if tariff_mode == TARIFF_PREHEAT: return "Pre-heat (cheap)"
+        if tariff_mode == TARIFF_COAST: return "Coast (expensive)"
+        return "Comfort"
+
+    @staticmethod
+    def _format_debug_text(decision: Dict[str, Any], verbosity: str) -> str:
+        """Render a decision record as status text (compact state or full trace)."""
+        action = decision["action"]
+        temperature = decision["temperature"]
+        reason = decision["reason"]
+        room_temp = decision["room_temp"]
         room_str = f"{room_temp:.1f}" if room_temp is not None else "N/A"
-        avg_str = f"{avg_house_temp:.1f}" if avg_house_temp is not None else "N/A"
-        outside_str = f"{outside_temp:.1f}°C" if has_outside_sensor and outside_temp is not None else "N/A"
-        runtime_info = f" | Min runtime: {self.min_runtime_remaining_minutes} min" if self.min_runtime_remaining_minutes > 0 else ""
-        if mode == "cool":
-            if action == "off": return f"COOL OFF | R: {room_str}°C | {reason}{runtime_info}"
-            else: return f"COOL ON | {temperature}°C | R: {room_str}°C | {reason}{runtime_info}"
-        if action == "off":
-            return f"OFF | R: {room_str}°C | H: {avg_str}°C | O: {outside_str} | {reason}{runtime_info}"
+        remaining = decision["min_runtime_remaining"]
+        runtime_info = f" | Min runtime: {remaining} min" if remaining > 0 else ""
+
+        if decision["mode"] == "cool":
+            if action == "off": text = f"COOL OFF | R: {room_str}°C | {reason}{runtime_info}"
+            else: text = f"COOL ON | {temperature}°C | R: {room_str}°C | {reason}{runtime_info}"
         else:
-            mode_str = "Comfort"
-            if self.override_mode: mode_str = "Force Comfort"
-            elif self.force_eco_mode: mode_str = "Force Eco"
-            temp_str = f"{temperature}°C"
-            if weather_compensation > 0: temp_str = f"{temperature}°C (B:{original_temperature} +{weather_compensation})"
-            return f"ON | {mode_str} {temp_str} | R: {room_str}°C | H: {avg_str}°C | O: {outside_str} | {reason}{runtime_info}"
+            avg_house_temp = decision["avg_house_temp"]
+            outside_temp = decision["outside_temp"]
+            avg_str = f"{avg_house_temp:.1f}" if avg_house_temp is not None else "N/A"
+            outside_str = f"{outside_temp:.1f}°C" if outside_temp is not None else "N/A"
+            if action == "off":
+                text = f"OFF | R: {room_str}°C | H: {avg_str}°C | O: {outside_str} | {reason}{runtime_info}"
+            else:
+                weather_compensation = decision["weather_compensation"]
+                temp_str = f"{temperature}°C"
+                if weather_compensation > 0: temp_str = f"{temperature}°C (B:{decision['original_temperature']} +{weather_compensation})"
+                text = f"ON | {decision['preset']} {temp_str} | R: {room_str}°C | H: {avg_str}°C | O: {outside_str} | {reason}{runtime_info}"
+
+        if verbosity != DEBUG_VERBOSITY_FULL:
+            return text
+
+        # Full trace: append every input that went into the decision
+        trace = [f"base={decision['base_temp']}", f"window_stop={decision['window_stop']}"]
+        if decision.get("stages") is not None:
+            trace.append(f"stages={decision['stages']}")
+        if decision.get("room_source") not in ("room", None):
+            trace.append(f"room_src={decision['room_source']}")
+        if decision["mode"] == "heat":
+            trace.append(f"offset=+{decision['comfort_offset']}")
+            trace.append(f"comp=+{decision['weather_compensation']}")
+            trace.append(f"sleep={decision['sleep_active']}")
+            if decision.get("forecast_outside_temp") is not None:
+                trace.append(f"forecast={decision['forecast_outside_temp']:.1f}")
+        return f"{text} || {' '.join(trace)}"
 
     async def enable_smart_control(self, enable: bool) -> None:
-        self.smart_control_enabled = enable
+        self.climate.set_enabled(enable)
         await self.async_save_state()
         if not enable: await self._release_control()
         await self.async_update()
@@ -1166,6 +2264,38 @@ class SmartClimateCoordinator:
             return {"hvac_mode": state.state, "temperature": state.attributes.get("temperature"), "hvac_action": state.attributes.get("hvac_action")}
         return {}
     
+    @property
+    def boost_duration(self) -> float:
+        return self._get_config_value(CONF_BOOST_DURATION, DEFAULT_BOOST_DURATION)
+
+    async def async_start_boost(self, duration: Optional[float] = None) -> None:
+        """Heat to the boost temperature for duration minutes (default from options), then revert."""
+        minutes = duration if duration is not None else self.boost_duration
+        self._end_boost()
+        self.climate.start_boost(self.clock.monotonic() + minutes * 60)
+        self._boost_timer_cancel = self._async_call_later(minutes * 60, self._handle_boost_timer)
+        _LOGGER.info(f"Boost started: {self.boost_temp}°C for {minutes} min")
+        await self.async_update()
+
+    async def async_stop_boost(self) -> None:
+        if not self.climate.boost_active:
+            return
+        self._end_boost()
+        _LOGGER.info("Boost stopped")
+        await self.async_update()
+
+    def _end_boost(self) -> None:
+        if self._boost_timer_cancel:
+            self._boost_timer_cancel()
+            self._boost_timer_cancel = None
+        self.climate.end_boost()
+
+    async def _handle_boost_timer(self, now=None) -> None:
+        self._boost_timer_cancel = None
+        self.climate.end_boost()
+        _LOGGER.info("Boost expired, reverting to the normal target")
+        await self.async_update()
+
     async def reset_temperatures(self) -> None:
         self.comfort_temp = DEFAULT_COMFORT_TEMP
         self.eco_temp = DEFAULT_ECO_TEMP
@@ -0,0 +1,177 @@
+"""Single exit for the coordinator's outgoing service calls.
+
+Heat pumps, fans and notifications are all commanded through the gateway:
+
+- a call repeating the state last sent to the same target is dropped (it is
+  re-sent after DEDUP_REFRESH, so a device changed by hand converges again),
+- calls of one service to one target are kept min_interval apart and the whole
+  entry stays within a calls-per-minute budget. A call over either limit is
+  deferred, a newer call for the same target and service replaces the deferred one.
+
+Turning off and dismissing (the safety paths) are never dropped or deferred.
+
+Dropped and merged calls are counted, the latest ones are kept for diagnostics.
+"""
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+DEDUP_REFRESH = 600 # Seconds an identical state is not sent again
+BUDGET_WINDOW = 60 # Seconds, the budget is calls per minute
+OFF_SERVICES = ("turn_off", "dismiss") # Reset everything else sent to the target, always sent at once
+RECENT_DROPS = 20
+
+CALL_SENT = "sent"
+CALL_DEDUPLICATED = "deduplicated"
+CALL_DEFERRED = "deferred" # Queued behind the limits, sent later by the gateway
+
+
+class ActuatorGateway:
+    """Deduplicating, rate limited service calls of one coordinator."""
+
+    __slots__ = (
+        "hass", "clock", "min_interval", "budget", "stats", "recent",
+        "_call_later", "_desired", "_last_call", "_sent_times", "_pending", "_timer_cancel", "_timer_due",
+    )
+
+    def __init__(self, hass, clock, call_later: Callable, min_interval: float = 0, budget: int = 0) -> None:
+        self.hass = hass
+        self.clock = clock
+        self.min_interval = min_interval # Seconds between calls to one target (0 = off)
+        self.budget = budget # Calls per minute for the entry (0 = unlimited)
+        self.stats = {"sent": 0, "deduplicated": 0, "merged": 0, "deferred": 0}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_DROPS)
+        self._call_later = call_later
+        self._desired: Dict[str, Dict[str, Tuple[Dict[str, Any], float]]] = {} # target -> service -> (data, sent at)
+        self._last_call: Dict[Tuple[str, str], float] = {} # (target, service) -> monotonic time
+        self._sent_times: Deque[float] = deque()
+        self._pending: Dict[Tuple[str, str], Tuple[str, Dict[str, Any], float]] = {} # (target, service) -> (domain, data, queued at)
+        self._timer_cancel: Optional[Callable[[], None]] = None
+        self._timer_due: Optional[float] = None
+
+    @staticmethod
+    def _target(data: Dict[str, Any]) -> str:
+        return str(data.get("entity_id") or data.get("notification_id") or "")
+
+    async def call(
+        self, domain: str, service: str, data: Dict[str, Any], blocking: bool = False, force: bool = False,
+    ) -> str:
+        """Send a service call now or defer it: CALL_SENT, CALL_DEDUPLICATED or CALL_DEFERRED.
+
+        force skips deduplication (retries of a command that was not acknowledged).
+        """
+        now = self.clock.monotonic()
+        target = self._target(data)
+        key = (target, service)
+        if service in OFF_SERVICES:
+            # Anything still queued for the target is overridden
+            for pending in [k for k in self._pending if k[0] == target]:
+                self._record("merged", self._pending.pop(pending)[0], pending[1], target, now)
+            await self._send(domain, service, data, blocking, now)
+            return CALL_SENT
+        if not force and self._is_current(target, service, data, now):
+            self._record("deduplicated", domain, service, target, now)
+            return CALL_DEDUPLICATED
+        if key in self._pending:
+            self._record("merged", domain, service, target, now)
+            self._pending[key] = (domain, data, self._pending[key][2])
+            return CALL_DEFERRED
+        delay = self._delay(key, now)
+        if delay > 0:
+            self.stats["deferred"] += 1
+            self._pending[key] = (domain, data, now)
+            self._arm(now + delay)
+            return CALL_DEFERRED
+        await self._send(domain, service, data, blocking, now)
+        return CALL_SENT
+
+    def is_pending(self, target: str) -> bool:
+        """A deferred call to target is waiting to be sent."""
+        return any(key[0] == target for key in self._pending)
+
+    def close(self) -> None:
+        """Drop deferred calls (entry unloaded)."""
+        if self._timer_cancel:
+            self._timer_cancel()
+            self._timer_cancel = None
+        self._timer_due = None
+        self._pending.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "min_interval": self.min_interval,
+            "budget": self.budget,
+            "stats": dict(self.stats),
+            "pending": [f"{domain}.{service} {target}" for (target, service), (domain, _, _) in self._pending.items()],
+            "recent": list(self.recent),
+        }
+
+    def _is_current(self, target: str, service: str, data: Dict[str, Any], now: float) -> bool:
+        if not target:
+            return False
+        sent = self._desired.get(target, {}).get(service)
+        return sent is not None and sent[0] == data and now - sent[1] < DEDUP_REFRESH
+
+    def _delay(self, key: Tuple[str, str], now: float) -> float:
+        """Seconds until a call (target, service) fits both limits."""
+        delay = 0.0
+        if self.min_interval and key in self._last_call:
+            delay = self._last_call[key] + self.min_interval - now
+        if self.budget:
+            while self._sent_times and now - self._sent_times[0] >= BUDGET_WINDOW:
+                self._sent_times.popleft()
+            if len(self._sent_times) >= self.budget:
+                delay = max(delay, self._sent_times[0] + BUDGET_WINDOW - now)
+        return max(delay, 0.0)
+
+    async def _send(self, domain: str, service: str, data: Dict[str, Any], blocking: bool, now: float) -> None:
+        target = self._target(data)
+        self.stats["sent"] += 1
+        self._sent_times.append(now)
+        self._last_call[(target, service)] = now
+        desired = self._desired.setdefault(target, {})
+        if service in OFF_SERVICES:
+            desired.clear()
+        else:
+            for off in OFF_SERVICES:
+                desired.pop(off, None)
+        desired[service] = (data, now)
+        try:
+            await self.hass.services.async_call(domain, service, data, blocking=blocking)
+        except Exception:
+            # Not applied, the next identical call must go out
+            desired.pop(service, None)
+            raise
+
+    def _arm(self, due: float) -> None:
+        if self._timer_due is not None and self._timer_due <= due:
+            return
+        if self._timer_cancel:
+            self._timer_cancel()
+        self._timer_due = due
+        self._timer_cancel = self._call_later(max(due - self.clock.monotonic(), 0), self._handle_timer)
+
+    async def _handle_timer(self, _now=None) -> None:
+        """Send the deferred calls that fit the limits now, oldest first."""
+        self._timer_cancel = None
+        self._timer_due = None
+        for key in sorted(self._pending, key=lambda k: self._pending[k][2]):
+            if key not in self._pending:
+                continue # Overridden while an earlier call was sent
+            now = self.clock.monotonic()
+            delay = self._delay(key, now)
+            if delay > 0:
+                self._arm(now + delay)
+                continue
+            domain, data, _ = self._pending.pop(key)
+            try:
+                await self._send(domain, key[1], data, False, now)
+            except Exception as err:
+                _LOGGER.warning(f"Deferred {domain}.{key[1]} for {key[0]} failed: {err}")
+
+    def _record(self, kind: str, domain: str, service: str, target: str, now: float) -> None:
+        self.stats[kind] += 1
+        self.recent.append({"kind": kind, "call": f"{domain}.{service}", "target": target, "at": round(self.clock.to_wall(now))})
+        _LOGGER.debug(f"Actuator call {kind}: {domain}.{service} {target}")
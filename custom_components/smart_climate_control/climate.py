@@ -64,22 +64,17 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
                 self._attr_hvac_mode = last_state.state
                 
                 if last_state.state == HVACMode.OFF:
-                    self.coordinator.smart_control_enabled = False
+                    self.coordinator.climate.set_enabled(False)
                 else:
-                    self.coordinator.smart_control_enabled = True
+                    self.coordinator.climate.set_enabled(True)
                     
                     # Set the hvac mode in coordinator
                     if last_state.state == HVACMode.HEAT:
-                        self.coordinator.current_hvac_mode = "heat"
-                        self.coordinator.override_mode = True
-                        self.coordinator.force_eco_mode = False
+                        self.coordinator.climate.select_mode("heat", override=True)
                     elif last_state.state == HVACMode.COOL:
-                        self.coordinator.current_hvac_mode = "cool"
-                        self.coordinator.override_mode = False
-                        self.coordinator.force_eco_mode = False
+                        self.coordinator.climate.select_mode("cool")
                     else:  # AUTO
-                        self.coordinator.current_hvac_mode = "heat"
-                        self.coordinator.override_mode = False
+                        self.coordinator.climate.select_mode("heat")
                         
             if (temp := last_state.attributes.get(ATTR_TEMPERATURE)) is not None:
                 self._attr_target_temperature = float(temp)
@@ -87,11 +82,11 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
     @property
     def hvac_mode(self) -> HVACMode:
         """Return current operation mode."""
-        if not self.coordinator.smart_control_enabled:
+        if not self.coordinator.climate.smart_control_enabled:
             return HVACMode.OFF
-        elif self.coordinator.current_hvac_mode == "cool":
+        elif self.coordinator.climate.current_hvac_mode == "cool":
             return HVACMode.COOL
-        elif self.coordinator.override_mode:
+        elif self.coordinator.climate.override_mode:
             return HVACMode.HEAT
         else:
             return HVACMode.AUTO
@@ -99,9 +94,9 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
     @property
     def hvac_action(self) -> HVACAction:
         """Return the current running hvac operation."""
-        if not self.coordinator.smart_control_enabled or self.coordinator.current_action == "off":
+        if not self.coordinator.climate.smart_control_enabled or self.coordinator.climate.current_action == "off":
             return HVACAction.OFF
-        elif self.coordinator.current_hvac_mode == "cool":
+        elif self.coordinator.climate.current_hvac_mode == "cool":
             return HVACAction.COOLING
         else:
             return HVACAction.HEATING
@@ -122,11 +117,11 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
-        if not self.coordinator.smart_control_enabled:
+        if not self.coordinator.climate.smart_control_enabled:
             return self._attr_target_temperature
         
         # Return appropriate temperature based on mode
-        if self.coordinator.current_hvac_mode == "cool":
+        if self.coordinator.climate.current_hvac_mode == "cool":
             return self.coordinator.cooling_temp
         else:
             return self.coordinator._determine_base_temperature()
@@ -140,19 +135,19 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
             "eco_temp": self.coordinator.eco_temp,
             "boost_temp": self.coordinator.boost_temp,
             "cooling_temp": self.coordinator.cooling_temp,
-            "smart_control_enabled": self.coordinator.smart_control_enabled,
+            "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
             "deadband_below": self.coordinator.deadband_below,
             "deadband_above": self.coordinator.deadband_above,
-            "current_mode": self.coordinator.current_hvac_mode,
+            "current_mode": self.coordinator.climate.current_hvac_mode,
         }
         
         # Add heating-specific attributes only when in heating mode
-        if self.coordinator.current_hvac_mode == "heat":
+        if self.coordinator.climate.current_hvac_mode == "heat":
             attrs.update({
                 "active_mode": self._get_active_mode(),
-                "force_comfort": self.coordinator.override_mode,
-                "force_eco": self.coordinator.force_eco_mode,
-                "sleep_active": self.coordinator.sleep_mode_active,
+                "force_comfort": self.coordinator.climate.override_mode,
+                "force_eco": self.coordinator.climate.force_eco_mode,
+                "sleep_active": self.coordinator.climate.sleep_mode_active,
                 "max_house_temp": self.coordinator.max_house_temp,
                 "weather_comp_factor": self.coordinator.weather_comp_factor,
             })
@@ -161,12 +156,12 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
 
     def _get_active_mode(self) -> str:
         """Get the active temperature mode."""
-        if not self.coordinator.smart_control_enabled:
+        if not self.coordinator.climate.smart_control_enabled:
             return "disabled"
-        elif self.coordinator.override_mode:
+        elif self.coordinator.climate.override_mode:
             return "force_comfort"
-        elif self.coordinator.force_eco_mode or self.coordinator.sleep_mode_active:
-            return "force_eco" if self.coordinator.force_eco_mode else "sleep_eco"
+        elif self.coordinator.climate.force_eco_mode or self.coordinator.climate.sleep_mode_active:
+            return "force_eco" if self.coordinator.climate.force_eco_mode else "sleep_eco"
         else:
             return "comfort"
 
@@ -176,7 +171,7 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
             self._attr_target_temperature = temperature
             
             # Update the appropriate temperature based on current mode
-            if self.coordinator.current_hvac_mode == "cool":
+            if self.coordinator.climate.current_hvac_mode == "cool":
                 self.coordinator.cooling_temp = temperature
             else:
                 # For heating, update based on active mode
@@ -190,7 +185,7 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
                 "eco_temp": self.coordinator.eco_temp,
                 "boost_temp": self.coordinator.boost_temp,
                 "cooling_temp": self.coordinator.cooling_temp,
-                "smart_control_enabled": self.coordinator.smart_control_enabled,
+                "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
             })
             
             await self.coordinator.async_update()
@@ -210,21 +205,15 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
             
             if hvac_mode == HVACMode.HEAT:
                 # Force heating mode
-                self.coordinator.current_hvac_mode = "heat"
-                self.coordinator.override_mode = True
-                self.coordinator.force_eco_mode = False
+                self.coordinator.climate.select_mode("heat", override=True)
                 _LOGGER.info("Climate: Set to HEAT mode - force comfort active")
             elif hvac_mode == HVACMode.COOL:
                 # Cooling mode (simplified)
-                self.coordinator.current_hvac_mode = "cool"
-                self.coordinator.override_mode = False
-                self.coordinator.force_eco_mode = False
+                self.coordinator.climate.select_mode("cool")
                 _LOGGER.info("Climate: Set to COOL mode")
             else:  # AUTO mode
                 # Auto heating mode (Comfort)
-                self.coordinator.current_hvac_mode = "heat"
-                self.coordinator.override_mode = False
-                self.coordinator.force_eco_mode = False
+                self.coordinator.climate.select_mode("heat")
                 _LOGGER.info("Climate: Set to AUTO mode (heating with comfort default)")
                 
         await self.coordinator.async_update()
@@ -0,0 +1,35 @@
+"""Time source for the coordinator.
+
+All durations (min runtime, window timers, ventilation phases, cooldowns) are
+measured on the monotonic clock so wall clock steps cannot stretch or cut them.
+The wall clock is only used for timestamps that are persisted across restarts.
+Replay and benchmarks inject their own clock to run faster than real time.
+"""
+import asyncio
+import time
+
+
+class Clock:
+    """System clock: real monotonic time, wall time and asyncio sleep."""
+
+    def monotonic(self) -> float:
+        """Seconds on the monotonic clock, for durations."""
+        return time.monotonic()
+
+    def now(self) -> float:
+        """Wall clock epoch seconds, for persisted timestamps."""
+        return time.time()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def to_wall(self, monotonic_ts: float) -> float:
+        """Convert a monotonic timestamp to wall time (for storage)."""
+        return self.now() - (self.monotonic() - monotonic_ts)
+
+    def from_wall(self, wall_ts: float) -> float:
+        """Convert a stored wall timestamp back to the monotonic clock."""
+        return self.monotonic() - (self.now() - wall_ts)
+
+
+SYSTEM_CLOCK = Clock()
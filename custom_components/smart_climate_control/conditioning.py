@@ -0,0 +1,178 @@
+"""Input conditioning for the temperature sensors.
+
+Every temperature sensor gets an InputFilter fed from its state events, so a
+reading is parsed once when it arrives instead of on every tick:
+
+- a jump faster than max_rate is held back until the next reading confirms
+  it (a real step) or not (a glitch), the first reading after the sensor was
+  unavailable is always taken,
+- an optional EMA or median over the last readings smooths noise,
+- the time of the last report tells a stuck sensor from a live one: after
+  stale_after without a report the value is no longer used.
+
+Several room sensors are fused into one room temperature: the weighted mean of
+the usable ones, where with three or more a reading too far from their median
+is left out as an outlier. The fusion is redone when one of them reports (or
+goes stale), not on every tick.
+"""
+import math
+from collections import deque
+from statistics import median
+from typing import Any, Deque, Dict, List, Optional
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+
+from .const import SENSOR_FILTER_EMA, SENSOR_FILTER_MEDIAN, SENSOR_FILTER_NONE
+from .state import _Snapshot
+
+LAST_KNOWN_HOLD = 30 * 60 # Seconds a last known room temperature bridges a sensor dropout
+
+
+def reading(state) -> Optional[float]:
+    """Numeric reading of a state object, None if it has none."""
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        return None
+    try:
+        value = float(state.state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def reported_at(state) -> float:
+    """Wall time of the sensor's last report (last_reported where HA has it)."""
+    return (getattr(state, "last_reported", None) or state.last_updated).timestamp()
+
+
+def parse_room_sensors(raw: Any, primary: str) -> Dict[str, float]:
+    """Room sensors and their weights: the primary sensor plus the room_sensors option.
+
+    The option is a list of entity ids (weight 1) or a mapping of entity id to
+    weight, the primary sensor keeps weight 1 unless the mapping names it.
+    Raises ValueError on malformed input.
+    """
+    if isinstance(raw, str):
+        raw = [raw] if raw else []
+    if isinstance(raw, list):
+        raw = {entity_id: 1.0 for entity_id in raw}
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError("room_sensors must be a list of entities or a mapping of entity to weight")
+    weights = {primary: 1.0}
+    for entity_id, weight in raw.items():
+        if not isinstance(entity_id, str) or not entity_id.startswith("sensor."):
+            raise ValueError(f"'{entity_id}' is not a sensor entity")
+        weight = float(1.0 if weight is None else weight)
+        if not weight > 0:
+            raise ValueError(f"Weight of {entity_id} must be positive")
+        weights[entity_id] = weight
+    return weights
+
+
+class InputFilter(_Snapshot):
+    """Conditioned value of one sensor."""
+
+    __slots__ = (
+        "mode", "window", "max_rate", "stale_after",
+        "value", "raw", "updated", "available", "rejected",
+        "_samples", "_suspect",
+    )
+
+    def __init__(
+        self, mode: str = SENSOR_FILTER_NONE, window: int = 5, max_rate: float = 0, stale_after: float = 0,
+    ) -> None:
+        self.mode = mode
+        self.window = max(int(window), 1) # Readings in the median / EMA span
+        self.max_rate = max_rate # °C per minute (0 = off)
+        self.stale_after = stale_after # Seconds (0 = never stale)
+        self.value: Optional[float] = None # Conditioned value
+        self.raw: Optional[float] = None # Last accepted reading
+        self.updated: Optional[float] = None # Monotonic time of the last report
+        self.available = False
+        self.rejected = 0 # Readings held back as implausible
+        self._samples: Deque[float] = deque(maxlen=self.window)
+        self._suspect: Optional[float] = None # Held back reading waiting for confirmation
+
+    def update(self, raw: Optional[float], at: float) -> None:
+        """Feed a reading reported at monotonic time at (None: no reading)."""
+        if raw is None:
+            self.available = False
+            return
+        if self.max_rate and self.raw is not None and self.available:
+            minutes = max(at - self.updated, 1.0) / 60
+            if abs(raw - self.raw) > self.max_rate * minutes:
+                if self._suspect is None or abs(raw - self._suspect) > abs(raw - self.raw):
+                    self._suspect = raw
+                    self.rejected += 1
+                    return
+                # Confirmed by the next reading: a real step, restart the filter at the new level
+                self._samples.clear()
+                self.value = None
+        self._suspect = None
+        self.raw = raw
+        self.updated = at
+        self.available = True
+        self._samples.append(raw)
+        if self.mode == SENSOR_FILTER_EMA and self.value is not None:
+            self.value = round(self.value + 2 / (self.window + 1) * (raw - self.value), 2)
+        elif self.mode == SENSOR_FILTER_MEDIAN:
+            self.value = median(self._samples)
+        else:
+            self.value = raw
+
+    def reported(self, at: float) -> None:
+        """The sensor reported its unchanged value again."""
+        if self.available and self.updated is not None and at > self.updated:
+            self.updated = at
+
+    def current(self, now: float) -> Optional[float]:
+        """Conditioned value, None while unavailable or stale."""
+        if not self.available or self.value is None:
+            return None
+        if self.stale_after and now - self.updated >= self.stale_after:
+            return None
+        return self.value
+
+    def stale_at(self) -> Optional[float]:
+        """Monotonic time the value goes stale, None if it cannot."""
+        if not self.available or not self.stale_after or self.updated is None:
+            return None
+        return self.updated + self.stale_after
+
+
+class RoomFusion(_Snapshot):
+    """Room temperature fused from the conditioned readings of the room sensors."""
+
+    __slots__ = ("weights", "outlier", "value", "used", "outliers", "due")
+
+    def __init__(self, weights: Dict[str, float], outlier: float = 0) -> None:
+        self.weights = dict(weights) # Entity id -> weight, primary sensor first
+        self.outlier = outlier # °C from the median that rejects a reading (0 = off)
+        self.value: Optional[float] = None
+        self.used: List[str] = [] # Sensors in the current value
+        self.outliers: List[str] = [] # Sensors left out as outliers
+        self.due: Optional[float] = 0.0 # Monotonic time to fuse again (a member goes stale), None if only on reports
+
+    def fuse(self, values: Dict[str, Optional[float]], due: Optional[float] = None) -> Optional[float]:
+        """Recompute from the members' current values (None: unavailable or stale).
+
+        due is when to fuse again without a report, the next member going stale.
+        """
+        self.due = due
+        live = {entity_id: value for entity_id, value in values.items() if value is not None}
+        kept = live
+        if self.outlier and len(live) >= 3:
+            # Needs a majority to tell which reading is off, two sensors are simply averaged
+            mid = median(live.values())
+            kept = {entity_id: value for entity_id, value in live.items() if abs(value - mid) <= self.outlier} or live
+        self.used = list(kept)
+        self.outliers = [entity_id for entity_id in live if entity_id not in kept]
+        if len(kept) == 1:
+            self.value = next(iter(kept.values()))
+        elif kept:
+            total = sum(self.weights[entity_id] for entity_id in kept)
+            self.value = round(sum(value * self.weights[entity_id] for entity_id, value in kept.items()) / total, 2)
+        else:
+            self.value = None
+        return self.value
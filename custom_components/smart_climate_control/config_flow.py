@@ -19,37 +19,97 @@ from .const import (
     CONF_WINDOW_SENSORS,
     CONF_WINDOW_DELAY,
     CONF_BED_SENSORS,
+    CONF_SLEEP_AGGREGATION,
+    CONF_SLEEP_DEBOUNCE,
+    SLEEP_AGGREGATION_ANY,
+    SLEEP_AGGREGATION_ALL,
+    SLEEP_AGGREGATION_MAJORITY,
     CONF_PRESENCE_TRACKER,
     CONF_HEAT_PUMP_CONTACT,
     CONF_COMFORT_TEMP,
     CONF_ECO_TEMP,
     CONF_BOOST_TEMP,
+    CONF_BOOST_DURATION,
     CONF_DEADBAND_BELOW,
     CONF_DEADBAND_ABOVE,
     CONF_MAX_HOUSE_TEMP,
     CONF_WEATHER_COMP_FACTOR,
+    CONF_CURVE_START_TEMP,
+    CONF_CURVE_MAX_OFFSET,
+    CONF_CURVE_POINTS,
+    CONF_CURVE_HYSTERESIS,
+    CONF_FORECAST_ENTITY,
+    CONF_FORECAST_FILE,
+    CONF_FORECAST_LOOKAHEAD,
+    CONF_PRICE_ENTITY,
+    CONF_PRICE_ATTRIBUTE,
+    CONF_PRICE_FILE,
+    CONF_TARIFF_PREHEAT,
+    CONF_TARIFF_THRESHOLD,
+    CONF_SCHEDULE,
+    CONF_SCHEDULE_PREHEAT,
+    CONF_LAG_HEAT_PUMPS,
+    CONF_STAGE_DELAY,
+    CONF_STAGE_ERROR,
     CONF_MAX_COMP_TEMP,
     CONF_MIN_COMP_TEMP,
     CONF_COMFORT_OFFSET,
     CONF_MIN_RUN_TIME,
     CONF_LOW_TEMP_THRESHOLD,
     CONF_SAFETY_CUTOFF,
+    CONF_DEBUG_VERBOSITY,
+    CONF_ACTUATOR_MIN_INTERVAL,
+    CONF_ACTUATOR_BUDGET,
+    CONF_EVENT_HEARTBEAT,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_SENSOR_MAX_RATE,
+    CONF_SENSOR_FILTER,
+    CONF_SENSOR_FILTER_WINDOW,
+    CONF_ROOM_SENSORS,
+    CONF_ROOM_OUTLIER,
+    SENSOR_FILTER_NONE,
+    SENSOR_FILTER_EMA,
+    SENSOR_FILTER_MEDIAN,
+    DEBUG_VERBOSITY_COMPACT,
+    DEBUG_VERBOSITY_FULL,
     CONF_FAN_GROUP_A,
     CONF_FAN_GROUP_B,
     CONF_HUMIDITY_SENSOR_A,
     CONF_HUMIDITY_SENSOR_B,
+    CONF_OUTSIDE_HUMIDITY_SENSOR,
     CONF_VENT_CYCLE_TIME,
     CONF_VENT_DURATION,
     CONF_VENT_MAX_DURATION,
     CONF_HUMIDITY_THRESHOLD,
     CONF_VENT_AUTO_INTERVAL,
     CONF_VENT_FAN_SPEED,
+    CONF_HUMIDITY_RISE_RATE,
+    CONF_HUMIDITY_RISE_WINDOW,
+    CONF_VENT_CYCLE_MODE,
+    CONF_VENT_CYCLE_MIN,
+    CONF_VENT_CYCLE_MAX,
+    VENT_CYCLE_MODE_FIXED,
+    VENT_CYCLE_MODE_ADAPTIVE,
+    CONF_VENT_HEATING_COORDINATION,
+    CONF_VENT_HEATING_FAN_SPEED,
+    CONF_VENT_ZONES,
     DEFAULT_COMFORT_TEMP,
     DEFAULT_ECO_TEMP,
     DEFAULT_BOOST_TEMP,
+    DEFAULT_BOOST_DURATION,
     DEFAULT_DEADBAND,
     DEFAULT_MAX_HOUSE_TEMP,
     DEFAULT_WEATHER_COMP_FACTOR,
+    DEFAULT_CURVE_START_TEMP,
+    DEFAULT_CURVE_MAX_OFFSET,
+    DEFAULT_CURVE_HYSTERESIS,
+    DEFAULT_FORECAST_LOOKAHEAD,
+    DEFAULT_PRICE_ATTRIBUTE,
+    DEFAULT_TARIFF_PREHEAT,
+    DEFAULT_TARIFF_THRESHOLD,
+    DEFAULT_SCHEDULE_PREHEAT,
+    DEFAULT_STAGE_DELAY,
+    DEFAULT_STAGE_ERROR,
     DEFAULT_MAX_COMP_TEMP,
     DEFAULT_MIN_COMP_TEMP,
     DEFAULT_COMFORT_OFFSET,
@@ -57,13 +117,35 @@ from .const import (
     DEFAULT_LOW_TEMP_THRESHOLD,
     DEFAULT_SAFETY_CUTOFF,
     DEFAULT_WINDOW_DELAY,
+    DEFAULT_SLEEP_AGGREGATION,
+    DEFAULT_SLEEP_DEBOUNCE,
+    DEFAULT_DEBUG_VERBOSITY,
+    DEFAULT_ACTUATOR_MIN_INTERVAL,
+    DEFAULT_ACTUATOR_BUDGET,
+    DEFAULT_EVENT_HEARTBEAT,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_SENSOR_MAX_RATE,
+    DEFAULT_SENSOR_FILTER,
+    DEFAULT_SENSOR_FILTER_WINDOW,
+    DEFAULT_ROOM_OUTLIER,
     DEFAULT_VENT_CYCLE_TIME,
     DEFAULT_VENT_DURATION,
     DEFAULT_VENT_MAX_DURATION,
     DEFAULT_HUMIDITY_THRESHOLD,
     DEFAULT_VENT_AUTO_INTERVAL,
     DEFAULT_VENT_FAN_SPEED,
+    DEFAULT_HUMIDITY_RISE_RATE,
+    DEFAULT_HUMIDITY_RISE_WINDOW,
+    DEFAULT_VENT_CYCLE_MODE,
+    DEFAULT_VENT_CYCLE_MIN,
+    DEFAULT_VENT_CYCLE_MAX,
+    DEFAULT_VENT_HEATING_COORDINATION,
+    DEFAULT_VENT_HEATING_FAN_SPEED,
 )
+from .conditioning import parse_room_sensors
+from .curve import parse_curve_points
+from .schedule import parse_schedule
+from .ventilation import parse_vent_zones
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -224,9 +306,21 @@ class SmartClimateConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_HUMIDITY_SENSOR_B): selector.EntitySelector(
                     selector.EntitySelectorConfig(domain="sensor", device_class="humidity", multiple=True)
                 ),
+                vol.Optional(CONF_OUTSIDE_HUMIDITY_SENSOR): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="sensor", device_class="humidity")
+                ),
                 vol.Optional(CONF_VENT_CYCLE_TIME, default=DEFAULT_VENT_CYCLE_TIME): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=30, max=300, step=5, mode="box", unit_of_measurement="sec")
                 ),
+                vol.Optional(CONF_VENT_CYCLE_MODE, default=DEFAULT_VENT_CYCLE_MODE): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=[VENT_CYCLE_MODE_FIXED, VENT_CYCLE_MODE_ADAPTIVE], mode="dropdown")
+                ),
+                vol.Optional(CONF_VENT_CYCLE_MIN, default=DEFAULT_VENT_CYCLE_MIN): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=30, max=300, step=5, mode="box", unit_of_measurement="sec")
+                ),
+                vol.Optional(CONF_VENT_CYCLE_MAX, default=DEFAULT_VENT_CYCLE_MAX): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=30, max=300, step=5, mode="box", unit_of_measurement="sec")
+                ),
                 vol.Optional(CONF_VENT_DURATION, default=DEFAULT_VENT_DURATION): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=10, max=240, step=10, mode="slider", unit_of_measurement="min")
                 ),
@@ -242,14 +336,23 @@ class SmartClimateConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_VENT_FAN_SPEED, default=DEFAULT_VENT_FAN_SPEED): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=10, max=100, step=1, mode="slider", unit_of_measurement="%")
                 ),
+                vol.Optional(CONF_HUMIDITY_RISE_RATE, default=DEFAULT_HUMIDITY_RISE_RATE): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=10, step=0.5, mode="slider", unit_of_measurement="%/min")
+                ),
+                vol.Optional(CONF_HUMIDITY_RISE_WINDOW, default=DEFAULT_HUMIDITY_RISE_WINDOW): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=30, step=1, mode="slider", unit_of_measurement="min")
+                ),
+                vol.Optional(CONF_VENT_HEATING_COORDINATION, default=DEFAULT_VENT_HEATING_COORDINATION): selector.BooleanSelector(),
+                vol.Optional(CONF_VENT_HEATING_FAN_SPEED, default=DEFAULT_VENT_HEATING_FAN_SPEED): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=10, max=100, step=1, mode="slider", unit_of_measurement="%")
+                ),
             }),
         )
 
     async def async_step_beds(self, user_input: Optional[Dict[str, Any]] = None):
         """Handle the bed sensor step."""
         if user_input is not None:
-            if user_input.get("bed_sensor"):
-                self.data[CONF_BED_SENSORS] = [user_input["bed_sensor"]]
+            self.data.update(user_input)
             
             return self.async_create_entry(
                 title=self.data[CONF_NAME],
@@ -259,11 +362,21 @@ class SmartClimateConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="beds",
             data_schema=vol.Schema({
-                vol.Optional("bed_sensor"): selector.EntitySelector(
+                vol.Optional(CONF_BED_SENSORS): selector.EntitySelector(
                     selector.EntitySelectorConfig(
-                        domain=["binary_sensor", "input_boolean", "sensor"]
+                        domain=["binary_sensor", "input_boolean", "sensor"],
+                        multiple=True
+                    )
+                ),
+                vol.Optional(CONF_SLEEP_AGGREGATION, default=DEFAULT_SLEEP_AGGREGATION): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[SLEEP_AGGREGATION_ANY, SLEEP_AGGREGATION_ALL, SLEEP_AGGREGATION_MAJORITY],
+                        mode="dropdown"
                     )
                 ),
+                vol.Optional(CONF_SLEEP_DEBOUNCE, default=DEFAULT_SLEEP_DEBOUNCE): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=900, step=10, mode="slider", unit_of_measurement="s")
+                ),
             }),
         )
 
@@ -284,9 +397,32 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None):
         """Manage the options."""
+        errors = {}
         if user_input is not None:
-            self._options.update(user_input)
-            return await self.async_step_ventilation_options()
+            # Cleared optional fields are left out of user_input
+            user_input.setdefault(CONF_CURVE_POINTS, "")
+            user_input.setdefault(CONF_FORECAST_ENTITY, None)
+            user_input.setdefault(CONF_FORECAST_FILE, "")
+            user_input.setdefault(CONF_PRICE_ENTITY, None)
+            user_input.setdefault(CONF_PRICE_FILE, "")
+            user_input.setdefault(CONF_SCHEDULE, None)
+            user_input.setdefault(CONF_LAG_HEAT_PUMPS, [])
+            user_input.setdefault(CONF_ROOM_SENSORS, None)
+            try:
+                parse_curve_points(user_input.get(CONF_CURVE_POINTS))
+            except ValueError:
+                errors[CONF_CURVE_POINTS] = "invalid_heating_curve"
+            try:
+                parse_schedule(user_input.get(CONF_SCHEDULE))
+            except (ValueError, TypeError):
+                errors[CONF_SCHEDULE] = "invalid_schedule"
+            try:
+                parse_room_sensors(user_input.get(CONF_ROOM_SENSORS), self._config_entry.data[CONF_ROOM_SENSOR])
+            except (ValueError, TypeError):
+                errors[CONF_ROOM_SENSORS] = "invalid_room_sensors"
+            if not errors:
+                self._options.update(user_input)
+                return await self.async_step_ventilation_options()
 
         # Robusztus segédfüggvények a beállítások betöltéséhez
         def get_opt(key, default):
@@ -325,6 +461,12 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                 ): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=16, max=25, step=0.5, mode="slider", unit_of_measurement="°C")
                 ),
+                vol.Optional(
+                    CONF_BOOST_DURATION,
+                    default=get_opt(CONF_BOOST_DURATION, DEFAULT_BOOST_DURATION)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=5, max=480, step=5, mode="slider", unit_of_measurement="min")
+                ),
                 vol.Optional(
                     CONF_DEADBAND_BELOW,
                     default=get_opt(CONF_DEADBAND_BELOW, DEFAULT_DEADBAND)
@@ -349,6 +491,98 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                 ): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=0, max=1, step=0.1, mode="slider")
                 ),
+                vol.Optional(
+                    CONF_CURVE_START_TEMP,
+                    default=get_opt(CONF_CURVE_START_TEMP, DEFAULT_CURVE_START_TEMP)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=-10, max=20, step=0.5, mode="slider", unit_of_measurement="°C")
+                ),
+                vol.Optional(
+                    CONF_CURVE_MAX_OFFSET,
+                    default=get_opt(CONF_CURVE_MAX_OFFSET, DEFAULT_CURVE_MAX_OFFSET)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=10, step=0.5, mode="slider", unit_of_measurement="°C")
+                ),
+                vol.Optional(
+                    CONF_CURVE_POINTS,
+                    description={"suggested_value": get_opt(CONF_CURVE_POINTS, "")}
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_CURVE_HYSTERESIS,
+                    default=get_opt(CONF_CURVE_HYSTERESIS, DEFAULT_CURVE_HYSTERESIS)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=2, step=0.1, mode="slider", unit_of_measurement="°C")
+                ),
+                vol.Optional(
+                    CONF_FORECAST_ENTITY,
+                    description={"suggested_value": get_opt(CONF_FORECAST_ENTITY, None)}
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="weather")
+                ),
+                vol.Optional(
+                    CONF_FORECAST_FILE,
+                    description={"suggested_value": get_opt(CONF_FORECAST_FILE, "")}
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_FORECAST_LOOKAHEAD,
+                    default=get_opt(CONF_FORECAST_LOOKAHEAD, DEFAULT_FORECAST_LOOKAHEAD)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=12, step=1, mode="slider", unit_of_measurement="h")
+                ),
+                vol.Optional(
+                    CONF_PRICE_ENTITY,
+                    description={"suggested_value": get_opt(CONF_PRICE_ENTITY, None)}
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="sensor")
+                ),
+                vol.Optional(
+                    CONF_PRICE_ATTRIBUTE,
+                    default=get_opt(CONF_PRICE_ATTRIBUTE, DEFAULT_PRICE_ATTRIBUTE)
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_PRICE_FILE,
+                    description={"suggested_value": get_opt(CONF_PRICE_FILE, "")}
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_TARIFF_PREHEAT,
+                    default=get_opt(CONF_TARIFF_PREHEAT, DEFAULT_TARIFF_PREHEAT)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=6, step=0.5, mode="slider", unit_of_measurement="h")
+                ),
+                vol.Optional(
+                    CONF_TARIFF_THRESHOLD,
+                    default=get_opt(CONF_TARIFF_THRESHOLD, DEFAULT_TARIFF_THRESHOLD)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=100, step=5, mode="slider", unit_of_measurement="%")
+                ),
+                vol.Optional(
+                    CONF_SCHEDULE,
+                    description={"suggested_value": get_opt(CONF_SCHEDULE, None)}
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_SCHEDULE_PREHEAT,
+                    default=get_opt(CONF_SCHEDULE_PREHEAT, DEFAULT_SCHEDULE_PREHEAT)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=180, step=5, mode="slider", unit_of_measurement="min")
+                ),
+                vol.Optional(
+                    CONF_LAG_HEAT_PUMPS,
+                    default=get_list_opt(CONF_LAG_HEAT_PUMPS)
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="climate", multiple=True)
+                ),
+                vol.Optional(
+                    CONF_STAGE_DELAY,
+                    default=get_opt(CONF_STAGE_DELAY, DEFAULT_STAGE_DELAY)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=60, step=1, mode="slider", unit_of_measurement="min")
+                ),
+                vol.Optional(
+                    CONF_STAGE_ERROR,
+                    default=get_opt(CONF_STAGE_ERROR, DEFAULT_STAGE_ERROR)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0.1, max=3, step=0.1, mode="slider", unit_of_measurement="°C")
+                ),
                 vol.Optional(
                     CONF_MAX_COMP_TEMP,
                     default=get_opt(CONF_MAX_COMP_TEMP, DEFAULT_MAX_COMP_TEMP)
@@ -411,14 +645,113 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                         multiple=True
                     )
                 ),
+                vol.Optional(
+                    CONF_BED_SENSORS,
+                    default=get_list_opt(CONF_BED_SENSORS)
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain=["binary_sensor", "input_boolean", "sensor"],
+                        multiple=True
+                    )
+                ),
+                vol.Optional(
+                    CONF_SLEEP_AGGREGATION,
+                    default=get_opt(CONF_SLEEP_AGGREGATION, DEFAULT_SLEEP_AGGREGATION)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[SLEEP_AGGREGATION_ANY, SLEEP_AGGREGATION_ALL, SLEEP_AGGREGATION_MAJORITY],
+                        mode="dropdown"
+                    )
+                ),
+                vol.Optional(
+                    CONF_SLEEP_DEBOUNCE,
+                    default=get_opt(CONF_SLEEP_DEBOUNCE, DEFAULT_SLEEP_DEBOUNCE)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                     min=0, max=900, step=10, mode="slider", unit_of_measurement="s"
+                    )
+                ),
+                vol.Optional(
+                    CONF_DEBUG_VERBOSITY,
+                    default=get_opt(CONF_DEBUG_VERBOSITY, DEFAULT_DEBUG_VERBOSITY)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[DEBUG_VERBOSITY_COMPACT, DEBUG_VERBOSITY_FULL],
+                        mode="dropdown"
+                    )
+                ),
+                vol.Optional(
+                    CONF_ACTUATOR_MIN_INTERVAL,
+                    default=get_opt(CONF_ACTUATOR_MIN_INTERVAL, DEFAULT_ACTUATOR_MIN_INTERVAL)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=300, step=5, mode="slider", unit_of_measurement="s")
+                ),
+                vol.Optional(
+                    CONF_ACTUATOR_BUDGET,
+                    default=get_opt(CONF_ACTUATOR_BUDGET, DEFAULT_ACTUATOR_BUDGET)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=120, step=1, mode="box", unit_of_measurement="calls/min")
+                ),
+                vol.Optional(
+                    CONF_EVENT_HEARTBEAT,
+                    default=get_opt(CONF_EVENT_HEARTBEAT, DEFAULT_EVENT_HEARTBEAT)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=120, step=5, mode="slider", unit_of_measurement="min")
+                ),
+                vol.Optional(
+                    CONF_SENSOR_STALE_TIMEOUT,
+                    default=get_opt(CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=240, step=5, mode="slider", unit_of_measurement="min")
+                ),
+                vol.Optional(
+                    CONF_SENSOR_MAX_RATE,
+                    default=get_opt(CONF_SENSOR_MAX_RATE, DEFAULT_SENSOR_MAX_RATE)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=5, step=0.1, mode="slider", unit_of_measurement="°C/min")
+                ),
+                vol.Optional(
+                    CONF_SENSOR_FILTER,
+                    default=get_opt(CONF_SENSOR_FILTER, DEFAULT_SENSOR_FILTER)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[SENSOR_FILTER_NONE, SENSOR_FILTER_EMA, SENSOR_FILTER_MEDIAN],
+                        mode="dropdown"
+                    )
+                ),
+                vol.Optional(
+                    CONF_SENSOR_FILTER_WINDOW,
+                    default=get_opt(CONF_SENSOR_FILTER_WINDOW, DEFAULT_SENSOR_FILTER_WINDOW)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=15, step=1, mode="slider")
+                ),
+                vol.Optional(
+                    CONF_ROOM_SENSORS,
+                    description={"suggested_value": get_opt(CONF_ROOM_SENSORS, None)}
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_ROOM_OUTLIER,
+                    default=get_opt(CONF_ROOM_OUTLIER, DEFAULT_ROOM_OUTLIER)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=5, step=0.1, mode="slider", unit_of_measurement="°C")
+                ),
             }),
+            errors=errors,
         )
 
     async def async_step_ventilation_options(self, user_input: Optional[Dict[str, Any]] = None):
         """Manage the ventilation options."""
+        errors = {}
         if user_input is not None:
-            self._options.update(user_input)
-            return self.async_create_entry(title="", data=self._options)
+            # Cleared optional fields are left out of user_input
+            user_input.setdefault(CONF_OUTSIDE_HUMIDITY_SENSOR, None)
+            try:
+                parse_vent_zones(user_input.get(CONF_VENT_ZONES))
+            except (ValueError, TypeError):
+                errors[CONF_VENT_ZONES] = "invalid_vent_zones"
+            if not errors:
+                self._options.update(user_input)
+                return self.async_create_entry(title="", data=self._options)
 
         # Robusztus segédfüggvények (ugyanaz, mint az init lépésben)
         def get_opt(key, default):
@@ -442,6 +775,21 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                 ): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=30, max=300, step=5, mode="box", unit_of_measurement="sec")
                 ),
+                vol.Optional(
+                    CONF_VENT_CYCLE_MODE, default=get_opt(CONF_VENT_CYCLE_MODE, DEFAULT_VENT_CYCLE_MODE)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=[VENT_CYCLE_MODE_FIXED, VENT_CYCLE_MODE_ADAPTIVE], mode="dropdown")
+                ),
+                vol.Optional(
+                    CONF_VENT_CYCLE_MIN, default=get_opt(CONF_VENT_CYCLE_MIN, DEFAULT_VENT_CYCLE_MIN)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=30, max=300, step=5, mode="box", unit_of_measurement="sec")
+                ),
+                vol.Optional(
+                    CONF_VENT_CYCLE_MAX, default=get_opt(CONF_VENT_CYCLE_MAX, DEFAULT_VENT_CYCLE_MAX)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=30, max=300, step=5, mode="box", unit_of_measurement="sec")
+                ),
                 vol.Optional(
                     CONF_VENT_DURATION, default=get_opt(CONF_VENT_DURATION, DEFAULT_VENT_DURATION)
                 ): selector.NumberSelector(
@@ -482,10 +830,39 @@ class SmartClimateOptionsFlow(config_entries.OptionsFlow):
                 ): selector.EntitySelector(
                     selector.EntitySelectorConfig(domain="sensor", device_class="humidity", multiple=True)
                 ),
+                vol.Optional(
+                    CONF_OUTSIDE_HUMIDITY_SENSOR,
+                    description={"suggested_value": get_opt(CONF_OUTSIDE_HUMIDITY_SENSOR, None)}
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="sensor", device_class="humidity")
+                ),
                 vol.Optional(
                     CONF_VENT_FAN_SPEED, default=get_opt(CONF_VENT_FAN_SPEED, DEFAULT_VENT_FAN_SPEED)
                 ): selector.NumberSelector(
                     selector.NumberSelectorConfig(min=10, max=100, step=1, mode="slider", unit_of_measurement="%")
                 ),
+                vol.Optional(
+                    CONF_HUMIDITY_RISE_RATE, default=get_opt(CONF_HUMIDITY_RISE_RATE, DEFAULT_HUMIDITY_RISE_RATE)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=10, step=0.5, mode="slider", unit_of_measurement="%/min")
+                ),
+                vol.Optional(
+                    CONF_HUMIDITY_RISE_WINDOW, default=get_opt(CONF_HUMIDITY_RISE_WINDOW, DEFAULT_HUMIDITY_RISE_WINDOW)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=1, max=30, step=1, mode="slider", unit_of_measurement="min")
+                ),
+                vol.Optional(
+                    CONF_VENT_HEATING_COORDINATION,
+                    default=get_opt(CONF_VENT_HEATING_COORDINATION, DEFAULT_VENT_HEATING_COORDINATION)
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_VENT_HEATING_FAN_SPEED, default=get_opt(CONF_VENT_HEATING_FAN_SPEED, DEFAULT_VENT_HEATING_FAN_SPEED)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=10, max=100, step=1, mode="slider", unit_of_measurement="%")
+                ),
+                vol.Optional(
+                    CONF_VENT_ZONES, default=get_opt(CONF_VENT_ZONES, [])
+                ): selector.ObjectSelector(),
             }),
+            errors=errors,
         )
\ No newline at end of file
@@ -1,6 +1,9 @@
 DOMAIN = "smart_climate_control"
 
 CONF_HEAT_PUMP = "heat_pump"
+CONF_LAG_HEAT_PUMPS = "lag_heat_pumps"        # Further heat pumps of the zone, staged after the main one
+CONF_STAGE_DELAY = "stage_delay"              # Minutes between stage changes (error must persist this long)
+CONF_STAGE_ERROR = "stage_error"              # Degrees below target that engage the next unit
 CONF_ROOM_SENSOR = "room_sensor"
 CONF_OUTSIDE_SENSOR = "outside_sensor"
 CONF_AVERAGE_SENSOR = "average_sensor"
@@ -9,42 +12,107 @@ CONF_DOOR_SENSOR = "door_sensor"
 CONF_WINDOW_SENSORS = "window_sensors"
 CONF_WINDOW_DELAY = "window_delay"
 CONF_BED_SENSORS = "bed_sensors"
+CONF_SLEEP_AGGREGATION = "sleep_aggregation"  # any | all | majority of the bed sensors
+CONF_SLEEP_DEBOUNCE = "sleep_debounce"        # Seconds a bed change must hold before sleep mode follows
 CONF_PRESENCE_TRACKER = "presence_tracker"
 CONF_COMFORT_TEMP = "comfort_temp"
 CONF_ECO_TEMP = "eco_temp"
 CONF_BOOST_TEMP = "boost_temp"
+CONF_BOOST_DURATION = "boost_duration"        # Minutes a boost runs before reverting
 CONF_COOLING_TEMP = "cooling_temp"
 CONF_DEADBAND_BELOW = "deadband_below"
 CONF_DEADBAND_ABOVE = "deadband_above"
 CONF_MAX_HOUSE_TEMP = "max_house_temp"
-CONF_WEATHER_COMP_FACTOR = "weather_comp_factor"
+CONF_WEATHER_COMP_FACTOR = "weather_comp_factor"  # Heating curve slope (°C per °C below the start)
+CONF_CURVE_START_TEMP = "curve_start_temp"    # Outside temp where compensation starts
+CONF_CURVE_MAX_OFFSET = "curve_max_offset"    # Largest compensation of the sloped curve
+CONF_CURVE_POINTS = "curve_points"            # Optional piecewise curve "outside:offset, ..." (overrides the slope)
+CONF_CURVE_HYSTERESIS = "curve_hysteresis"    # Compensation change needed before the setpoint follows
+CONF_FORECAST_ENTITY = "forecast_entity"      # weather entity with an hourly forecast
+CONF_FORECAST_FILE = "forecast_file"          # Local forecast file (JSON/CSV) instead of the weather entity
+CONF_FORECAST_LOOKAHEAD = "forecast_lookahead"  # Hours ahead a colder forecast is acted on (0 = off)
+CONF_PRICE_ENTITY = "price_entity"            # Sensor with the price series in its attributes
+CONF_PRICE_ATTRIBUTE = "price_attribute"      # Attribute(s) holding the price list, comma separated
+CONF_PRICE_FILE = "price_file"                # Local price file (CSV/JSON) instead of the sensor
+CONF_TARIFF_PREHEAT = "tariff_preheat"        # Hours before an expensive period that may pre-heat
+CONF_TARIFF_THRESHOLD = "tariff_threshold"    # % above the average price that counts as expensive
 # CONF_SCHEDULE_ENTITY eltávolítva
+CONF_SCHEDULE = "schedule"                    # Built-in weekly schedule (mapping of days to blocks)
+CONF_SCHEDULE_PREHEAT = "schedule_preheat"    # Minutes comfort/boost blocks start early
 CONF_MAX_COMP_TEMP = "max_comp_temp"
 CONF_MIN_COMP_TEMP = "min_comp_temp"
 CONF_COMFORT_OFFSET = "comfort_temp_offset"
 CONF_MIN_RUN_TIME = "min_run_time"
 CONF_LOW_TEMP_THRESHOLD = "low_temp_threshold"
 CONF_SAFETY_CUTOFF = "safety_cutoff"
+CONF_DEBUG_VERBOSITY = "debug_verbosity"      # compact | full
+CONF_ACTUATOR_MIN_INTERVAL = "actuator_min_interval"  # Seconds between commands to one device (0 = off)
+CONF_ACTUATOR_BUDGET = "actuator_budget"      # Commands per minute for the whole entry (0 = unlimited)
+CONF_EVENT_HEARTBEAT = "event_heartbeat"      # Minutes after which an unchanged state_updated event is repeated (0 = never)
+CONF_SENSOR_STALE_TIMEOUT = "sensor_stale_timeout"  # Minutes without a report before a temperature sensor is ignored (0 = off)
+CONF_SENSOR_MAX_RATE = "sensor_max_rate"      # °C per minute a reading may move before it needs confirmation (0 = off)
+CONF_SENSOR_FILTER = "sensor_filter"          # none | ema | median
+CONF_SENSOR_FILTER_WINDOW = "sensor_filter_window"  # Readings in the median / EMA span
+CONF_ROOM_SENSORS = "room_sensors"            # Further room sensors fused with the room sensor (list, or mapping of entity to weight)
+CONF_ROOM_OUTLIER = "room_outlier"            # °C from the median of 3+ room sensors that leaves a reading out (0 = off)
+
+DEBUG_VERBOSITY_COMPACT = "compact"
+DEBUG_VERBOSITY_FULL = "full"
+
+SLEEP_AGGREGATION_ANY = "any"
+SLEEP_AGGREGATION_ALL = "all"
+SLEEP_AGGREGATION_MAJORITY = "majority"
+
+SENSOR_FILTER_NONE = "none"
+SENSOR_FILTER_EMA = "ema"
+SENSOR_FILTER_MEDIAN = "median"
 
 # Ventilation Constants
 CONF_FAN_GROUP_A = "fan_group_a"
 CONF_FAN_GROUP_B = "fan_group_b"
 CONF_HUMIDITY_SENSOR_A = "humidity_sensor_a"
 CONF_HUMIDITY_SENSOR_B = "humidity_sensor_b"
+CONF_OUTSIDE_HUMIDITY_SENSOR = "outside_humidity_sensor"  # Enables absolute humidity checks
 CONF_VENT_CYCLE_TIME = "vent_cycle_time"        # Time in seconds for one direction
 CONF_VENT_DURATION = "vent_duration"            # Duration of a standard run in minutes
 CONF_VENT_MAX_DURATION = "vent_max_duration"    # Max safety duration in minutes
 CONF_HUMIDITY_THRESHOLD = "humidity_threshold"  # RH% threshold to trigger ventilation
 CONF_VENT_AUTO_INTERVAL = "vent_auto_interval"  # Hours between auto runs
 CONF_VENT_FAN_SPEED = "vent_fan_speed"          # Fan speed in percentage
+CONF_HUMIDITY_RISE_RATE = "humidity_rise_rate"  # RH%/min rise that starts a run (0 = off)
+CONF_HUMIDITY_RISE_WINDOW = "humidity_rise_window"  # Rolling window in minutes for the rise rate
+CONF_VENT_CYCLE_MODE = "vent_cycle_mode"        # fixed | adaptive phase length
+CONF_VENT_CYCLE_MIN = "vent_cycle_min"          # Shortest adaptive phase in seconds
+CONF_VENT_CYCLE_MAX = "vent_cycle_max"          # Longest adaptive phase in seconds
+CONF_VENT_HEATING_COORDINATION = "vent_heating_coordination"  # Let heating state steer ventilation
+CONF_VENT_HEATING_FAN_SPEED = "vent_heating_fan_speed"        # Fan speed cap (%) during heavy heating
+CONF_VENT_ZONES = "vent_zones"  # Extra fan pairs (list of zone mappings), the A/B groups form the main zone
+
+VENT_CYCLE_MODE_FIXED = "fixed"
+VENT_CYCLE_MODE_ADAPTIVE = "adaptive"
 
 DEFAULT_COMFORT_TEMP = 20.0
 DEFAULT_ECO_TEMP = 18.0
 DEFAULT_BOOST_TEMP = 23.0
+DEFAULT_BOOST_DURATION = 60 # minutes
 DEFAULT_COOLING_TEMP = 22.0
 DEFAULT_DEADBAND = 0.5
 DEFAULT_MAX_HOUSE_TEMP = 25.0
 DEFAULT_WEATHER_COMP_FACTOR = 0.5
+DEFAULT_CURVE_START_TEMP = 0.0
+DEFAULT_CURVE_MAX_OFFSET = 5.0
+DEFAULT_CURVE_HYSTERESIS = 0.3
+DEFAULT_SETPOINT_STEP = 0.5 # When the heat pump reports neither target_temp_step nor precision
+DEFAULT_FORECAST_LOOKAHEAD = 3 # hours
+DEFAULT_PRICE_ATTRIBUTE = "raw_today, raw_tomorrow" # Nord Pool
+DEFAULT_TARIFF_PREHEAT = 2 # hours
+DEFAULT_TARIFF_THRESHOLD = 20 # %
+DEFAULT_SCHEDULE_PREHEAT = 0 # minutes
+DEFAULT_STAGE_DELAY = 15 # minutes
+DEFAULT_STAGE_ERROR = 0.5 # °C
+DEFAULT_ACTUATOR_MIN_INTERVAL = 0 # seconds
+DEFAULT_ACTUATOR_BUDGET = 0 # calls per minute (unlimited)
+DEFAULT_EVENT_HEARTBEAT = 0 # minutes
 DEFAULT_MAX_COMP_TEMP = 25.0
 DEFAULT_MIN_COMP_TEMP = 16.0
 DEFAULT_COMFORT_OFFSET = 0.5
@@ -52,6 +120,14 @@ DEFAULT_MIN_RUN_TIME = 30
 DEFAULT_LOW_TEMP_THRESHOLD = 5.0
 DEFAULT_SAFETY_CUTOFF = 1.0
 DEFAULT_WINDOW_DELAY = 1.0
+DEFAULT_SLEEP_AGGREGATION = SLEEP_AGGREGATION_ANY
+DEFAULT_SLEEP_DEBOUNCE = 60
+DEFAULT_DEBUG_VERBOSITY = DEBUG_VERBOSITY_COMPACT
+DEFAULT_SENSOR_STALE_TIMEOUT = 0 # minutes (off)
+DEFAULT_SENSOR_MAX_RATE = 0 # °C per minute (off)
+DEFAULT_SENSOR_FILTER = SENSOR_FILTER_NONE
+DEFAULT_SENSOR_FILTER_WINDOW = 5
+DEFAULT_ROOM_OUTLIER = 1.5 # °C
 
 # Ventilation Defaults
 DEFAULT_VENT_CYCLE_TIME = 75      # seconds
@@ -59,4 +135,12 @@ DEFAULT_VENT_DURATION = 60        # minutes
 DEFAULT_VENT_MAX_DURATION = 120   # minutes
 DEFAULT_HUMIDITY_THRESHOLD = 60.0 # RH%
 DEFAULT_VENT_AUTO_INTERVAL = 12   # hours
-DEFAULT_VENT_FAN_SPEED = 100      # % (High speed)
\ No newline at end of file
+DEFAULT_VENT_FAN_SPEED = 100      # % (High speed)
+DEFAULT_HUMIDITY_RISE_RATE = 0  # RH% per minute, off until set
+DEFAULT_HUMIDITY_RISE_WINDOW = 5  # minutes
+DEFAULT_VENT_CYCLE_MODE = VENT_CYCLE_MODE_FIXED
+DEFAULT_VENT_CYCLE_MIN = 45       # seconds
+DEFAULT_VENT_CYCLE_MAX = 120      # seconds
+DEFAULT_VENT_HEATING_COORDINATION = False
+DEFAULT_VENT_HEATING_FAN_SPEED = 50  # %
+HEAVY_HEATING_DEFICIT = 1.0       # °C below target that counts as heavy heating
@@ -0,0 +1,61 @@
+"""Weather compensation heating curve.
+
+The compensation is a continuous function of the outside temperature: either a
+slope starting at a configurable outside temperature (capped), or a piecewise
+linear curve given as "outside:offset" points. The resulting setpoint is
+quantized to the heat pump's own temperature step, so the pump only gets
+setpoints it can actually apply.
+"""
+import math
+from typing import Any, List, Optional, Tuple
+
+CurvePoint = Tuple[float, float] # (outside temperature, offset)
+
+
+def parse_curve_points(raw: Any) -> List[CurvePoint]:
+    """Parse "outside:offset, ..." into points sorted by outside temperature.
+
+    Raises ValueError on malformed input. Empty input means no piecewise curve.
+    """
+    if not raw:
+        return []
+    points = []
+    for item in str(raw).replace(";", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        outside, sep, offset = item.partition(":")
+        if not sep:
+            raise ValueError(f"Expected outside:offset, got '{item}'")
+        points.append((float(outside), float(offset)))
+    points.sort()
+    if len({outside for outside, _ in points}) != len(points):
+        raise ValueError("Duplicate outside temperature in heating curve")
+    return points
+
+
+def curve_offset(
+    outside: float, start: float, slope: float, max_offset: float,
+    points: Optional[List[CurvePoint]] = None,
+) -> float:
+    """Compensation (°C) for an outside temperature.
+
+    With points the curve is interpolated between them and flat beyond the
+    ends, otherwise it rises by slope per degree below start, up to max_offset.
+    """
+    if points:
+        if outside <= points[0][0]:
+            return points[0][1]
+        if outside >= points[-1][0]:
+            return points[-1][1]
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            if outside <= x1:
+                return y0 + (y1 - y0) * (outside - x0) / (x1 - x0)
+    return min(max(0.0, (start - outside) * slope), max_offset)
+
+
+def quantize(value: float, step: Optional[float]) -> float:
+    """Round to the nearest multiple of step (halves round up)."""
+    if not step or step <= 0:
+        return value
+    return round(math.floor(value / step + 0.5) * step, 2)
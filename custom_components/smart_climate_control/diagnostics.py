@@ -0,0 +1,33 @@
+"""Diagnostics support for Smart Climate Control."""
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .schedule import describe
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "startup_timings": coordinator.startup_timings,
+        "climate": coordinator.climate.snapshot(),
+        "window": coordinator.window.snapshot(),
+        "sleep": coordinator.sleep.snapshot(),
+        "compressor": coordinator.compressor.snapshot(),
+        "staging": coordinator.staging.snapshot(),
+        "actuator": coordinator.actuator.snapshot(),
+        "inputs": {entity_id: flt.snapshot() for entity_id, flt in coordinator.inputs.items()},
+        "room": coordinator.room.snapshot(),
+        "schedule": {"mode": coordinator.schedule_mode, "timeline": describe(coordinator.schedule)},
+        "last_decision": coordinator.last_decision,
+        "skipped_updates": coordinator.skipped_updates,
+        "ventilation": {
+            "enabled": coordinator.vent_enabled,
+            "zones": [zone.snapshot() for zone in coordinator.vent_zones],
+        },
+    }
@@ -0,0 +1,100 @@
+"""Outside temperature forecast, cached per hour.
+
+The points come from a weather entity (weather.get_forecasts, or the legacy
+forecast attribute) or from a local file standing in for it in tests and
+replays. The file holds either the service response / a list of
+{"datetime", "temperature"} items as JSON, or CSV with those two columns.
+"""
+import csv
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Tuple
+
+ForecastPoint = Tuple[float, float] # (epoch seconds, temperature)
+
+
+def parse_datetime(value: Any) -> float:
+    """ISO string, datetime or epoch number to epoch seconds (naive means UTC)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_forecast(items: Iterable[Any]) -> List[ForecastPoint]:
+    """Forecast items ({"datetime", "temperature"}) to sorted points, bad items are skipped."""
+    points = []
+    for item in items or []:
+        try:
+            points.append((parse_datetime(item["datetime"]), float(item["temperature"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    points.sort()
+    return points
+
+
+def forecast_items(data: Any) -> List[Any]:
+    """Forecast list out of a service response, a {"forecast": [...]} mapping or a plain list."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        if "forecast" in data:
+            return data["forecast"] or []
+        for value in data.values():
+            if isinstance(value, dict) and "forecast" in value:
+                return value["forecast"] or []
+    return []
+
+
+def load_forecast_file(path: str) -> List[ForecastPoint]:
+    """Read a forecast file (JSON or CSV). Blocking, run it in the executor."""
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith(".csv"):
+            return parse_forecast(csv.DictReader(handle))
+        return parse_forecast(forecast_items(json.load(handle)))
+
+
+class ForecastCache:
+    """Hourly outside temperature points, refreshed at most once per clock hour."""
+
+    __slots__ = ("points", "hour")
+
+    def __init__(self) -> None:
+        self.points: List[ForecastPoint] = []
+        self.hour: Optional[int] = None # Clock hour of the last refresh
+
+    def needs_refresh(self, now: float) -> bool:
+        return self.hour != int(now // 3600)
+
+    def store(self, points: Optional[List[ForecastPoint]], now: float) -> None:
+        """Keep new points (None keeps the old ones after a failed fetch) until the next hour."""
+        if points is not None:
+            self.points = points
+        self.hour = int(now // 3600)
+
+    def temperature_at(self, ts: float) -> Optional[float]:
+        """Interpolated forecast temperature, None outside the forecast range."""
+        points = self.points
+        if not points or ts < points[0][0] or ts > points[-1][0]:
+            return None
+        for (t0, v0), (t1, v1) in zip(points, points[1:]):
+            if ts <= t1:
+                return v0 + (v1 - v0) * (ts - t0) / (t1 - t0) if t1 > t0 else v1
+        return points[-1][1]
+
+    def min_between(self, start: float, end: float) -> Optional[float]:
+        """Lowest forecast temperature in [start, end], None without forecast data for it."""
+        values = [value for ts, value in self.points if start <= ts <= end]
+        for ts in (start, end):
+            value = self.temperature_at(ts)
+            if value is not None:
+                values.append(value)
+        return min(values) if values else None
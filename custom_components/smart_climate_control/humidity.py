@@ -0,0 +1,83 @@
+"""Humidity helpers for the ventilation logic."""
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+# A rise must be at least this large (RH%) before the rate counts as an event
+HUMIDITY_RISE_MIN_DELTA = 5.0
+# A rise-triggered run stops once humidity is back within this margin (RH%) of the baseline
+HUMIDITY_BASELINE_MARGIN = 2.0
+# Outdoor air must be at least this much drier (g/m³) before a moisture run starts
+HUMIDITY_EXCHANGE_MARGIN = 0.5
+# Added to the measured span so a single jump is not read as an instantaneous rise
+_MIN_RATE_SPAN = 60.0
+
+
+def _saturation_vapour_pressure(temp_c: float) -> float:
+    """Saturation vapour pressure in hPa (Magnus formula)."""
+    return 6.112 * math.exp(17.67 * temp_c / (temp_c + 243.5))
+
+
+def absolute_humidity(temp_c: float, rh: float) -> float:
+    """Water content of the air in g/m³."""
+    return _saturation_vapour_pressure(temp_c) * rh * 2.1674 / (273.15 + temp_c)
+
+
+def dew_point(temp_c: float, rh: float) -> float:
+    """Dew point in °C."""
+    gamma = math.log(max(rh, 0.1) / 100) + 17.67 * temp_c / (temp_c + 243.5)
+    return 243.5 * gamma / (17.67 - gamma)
+
+
+class HumidityTrend:
+    """Rolling window of humidity samples for one sensor.
+
+    Samples are only stored when the value changes, the oldest sample that is
+    still in effect at the start of the window is kept as the reference point.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self.samples: Deque[Tuple[float, float]] = deque()
+
+    def add(self, ts: float, value: float) -> None:
+        """Record a reading taken at ts."""
+        if self.samples and self.samples[-1][1] == value:
+            return
+        self.samples.append((ts, value))
+        self._prune(ts)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while len(self.samples) >= 2 and self.samples[1][0] <= cutoff:
+            self.samples.popleft()
+
+    @property
+    def latest(self) -> Optional[float]:
+        return self.samples[-1][1] if self.samples else None
+
+    def rise(self, now: float) -> Tuple[float, Optional[float]]:
+        """Return (rise rate in RH%/min, baseline) over the window.
+
+        The baseline is the lowest value in the window, i.e. the humidity
+        before the current event started.
+        """
+        self._prune(now)
+        if len(self.samples) < 2:
+            return 0.0, None
+
+        latest_ts, latest = self.samples[-1]
+        base_idx = 0
+        for idx, (_, value) in enumerate(self.samples):
+            if value < self.samples[base_idx][1]:
+                base_idx = idx
+        baseline = self.samples[base_idx][1]
+
+        delta = latest - baseline
+        if delta < HUMIDITY_RISE_MIN_DELTA:
+            return 0.0, baseline
+
+        # The rise started when the baseline value was replaced by the next reading
+        rise_start = self.samples[base_idx + 1][0]
+        span = latest_ts - rise_start + _MIN_RATE_SPAN
+        return delta / (span / 60), baseline
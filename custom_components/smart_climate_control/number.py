@@ -149,8 +149,7 @@ class SmartClimateVentNumber(NumberEntity):
         elif self._param_type == "fan_speed":
             self.coordinator.vent_fan_speed = int(value)
             # If running, update speed immediately
-            if self.coordinator.vent_is_running:
-                await self.coordinator._apply_fan_directions(self.coordinator.vent_current_phase)
+            await self.coordinator.async_refresh_fan_speed()
         
         # Save state to persist changes
         await self.coordinator.async_save_state()
\ No newline at end of file
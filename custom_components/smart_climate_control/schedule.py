@@ -0,0 +1,159 @@
+"""Built-in weekly schedule.
+
+The schedule maps days to blocks, e.g.
+
+    weekdays: ["06:00-08:00 comfort", "17:00-22:30 comfort", "22:30-06:00 eco"]
+    sat: ["08:00-23:00 comfort"]
+
+Keys are mon..sun, weekdays, weekend or daily; a specific day replaces the blocks
+of a group and a group those of daily. Blocks ending before they start run past
+midnight.
+Outside the blocks the schedule has no say. It is compiled once into a sorted
+transition timeline over the week, so the coordinator only arms one timer for
+the next transition. Transitions are local wall-clock times: the next one is
+returned as an aware datetime, so a DST change in between does not move it.
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEDULE_COMFORT = "comfort"
+SCHEDULE_ECO = "eco"
+SCHEDULE_BOOST = "boost"
+SCHEDULE_OFF = "off"
+SCHEDULE_MODES = (SCHEDULE_COMFORT, SCHEDULE_ECO, SCHEDULE_BOOST, SCHEDULE_OFF)
+
+WEEK = 7 * 86400
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+# In this order, a later key naming a day replaces the blocks of an earlier one
+DAY_KEYS = (("daily", range(7)), ("weekdays", range(5)), ("weekend", (5, 6))) + tuple(
+    (day, (idx,)) for idx, day in enumerate(DAYS)
+)
+_WARM = (SCHEDULE_COMFORT, SCHEDULE_BOOST)
+
+
+def _minutes(text: str) -> int:
+    hours, sep, minutes = text.strip().partition(":")
+    value = int(hours) * 60 + (int(minutes) if sep else 0)
+    if not 0 <= value <= 24 * 60:
+        raise ValueError(f"Invalid time '{text}'")
+    return value
+
+
+def _parse_block(text: str) -> Tuple[int, int, str]:
+    """"HH:MM-HH:MM mode" to (start minute, end minute, mode)."""
+    span, _, mode = text.strip().partition(" ")
+    mode = mode.strip().lower()
+    if mode not in SCHEDULE_MODES:
+        raise ValueError(f"Unknown schedule mode '{mode}' in '{text}'")
+    start, sep, end = span.partition("-")
+    if not sep:
+        raise ValueError(f"Expected HH:MM-HH:MM, got '{span}'")
+    return _minutes(start), _minutes(end), mode
+
+
+class WeeklySchedule:
+    """Compiled schedule: week offsets (seconds since Monday 00:00) where the mode changes."""
+
+    __slots__ = ("offsets", "modes")
+
+    def __init__(self, offsets: Optional[List[int]] = None, modes: Optional[List[Optional[str]]] = None) -> None:
+        self.offsets: List[int] = offsets or []
+        self.modes: List[Optional[str]] = modes or []
+
+    def __bool__(self) -> bool:
+        return bool(self.offsets)
+
+    @staticmethod
+    def week_offset(local: datetime) -> int:
+        return local.weekday() * 86400 + local.hour * 3600 + local.minute * 60 + local.second
+
+    def mode_at(self, local: datetime) -> Optional[str]:
+        """Scheduled mode at a local time, None where no block applies."""
+        if not self.offsets:
+            return None
+        # Before the first transition of the week the last one (from last week) still holds
+        return self.modes[bisect_right(self.offsets, self.week_offset(local)) - 1]
+
+    def next_transition(self, local: datetime) -> Optional[datetime]:
+        """Local time of the next transition, None without transitions.
+
+        local must be timezone aware (Home Assistant's local time). The wall
+        clock distance is added to the naive time and the result localised
+        again, so the UTC offset of the transition day applies.
+        """
+        if not self.offsets:
+            return None
+        offset = self.week_offset(local)
+        idx = bisect_right(self.offsets, offset)
+        target = self.offsets[idx] if idx < len(self.offsets) else self.offsets[0] + WEEK
+        wall = local.replace(tzinfo=None, microsecond=0) + timedelta(seconds=target - offset)
+        return wall.replace(tzinfo=local.tzinfo)
+
+
+def parse_schedule(raw: Any, preheat_minutes: float = 0) -> WeeklySchedule:
+    """Compile a schedule mapping. Raises ValueError on malformed input.
+
+    preheat_minutes moves every transition into comfort or boost earlier, so
+    the house is warm when the block starts.
+    """
+    if not raw:
+        return WeeklySchedule()
+    if not isinstance(raw, dict):
+        raise ValueError("Schedule must be a mapping of days to blocks")
+    unknown = set(raw) - {key for key, _ in DAY_KEYS}
+    if unknown:
+        raise ValueError(f"Unknown schedule day(s): {', '.join(sorted(unknown))}")
+
+    day_blocks: List[List[Tuple[int, int, str]]] = [[] for _ in DAYS]
+    for key, days in DAY_KEYS:
+        blocks = raw.get(key)
+        if not blocks:
+            continue
+        if isinstance(blocks, str):
+            blocks = blocks.split(",")
+        parsed = [_parse_block(str(text)) for text in blocks]
+        for day in days:
+            day_blocks[day] = parsed
+
+    grid: List[Optional[str]] = [None] * (7 * 24 * 60)
+    # Parts running past midnight first, so the next day's own blocks win over them
+    for spill in (True, False):
+        for day, blocks in enumerate(day_blocks):
+            midnight = (day + 1) * 24 * 60
+            for start, end, mode in blocks:
+                length = (end - start) % (24 * 60) or 24 * 60
+                base = day * 24 * 60 + start
+                span = range(midnight, base + length) if spill else range(base, min(base + length, midnight))
+                for minute in span:
+                    grid[minute % len(grid)] = mode
+
+    # Compress the grid into transitions
+    offsets, modes = [], []
+    for minute, mode in enumerate(grid):
+        if not modes or modes[-1] != mode:
+            offsets.append(minute * 60)
+            modes.append(mode)
+    if modes == [None]:
+        return WeeklySchedule()
+    if len(modes) > 1 and modes[0] == modes[-1]:
+        # Sunday runs on into Monday, 00:00 is not a real transition
+        offsets.pop(0)
+        modes.pop(0)
+
+    lead = int(preheat_minutes * 60)
+    if lead:
+        for idx, mode in enumerate(modes):
+            if mode in _WARM and modes[idx - 1] not in _WARM:
+                # Never before the previous transition (or Monday 00:00 for the first one)
+                earliest = offsets[idx - 1] + 60 if idx > 0 else 0
+                offsets[idx] = max(offsets[idx] - lead, earliest)
+    return WeeklySchedule(offsets, modes)
+
+
+def describe(schedule: WeeklySchedule) -> List[Dict[str, Any]]:
+    """Human readable timeline (for attributes and diagnostics)."""
+    return [
+        {"at": f"{DAYS[offset // 86400]} {offset % 86400 // 3600:02d}:{offset % 3600 // 60:02d}", "mode": mode}
+        for offset, mode in zip(schedule.offsets, schedule.modes)
+    ]
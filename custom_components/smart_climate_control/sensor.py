@@ -63,7 +63,7 @@ class SmartClimateStatusSensor(SmartClimateBaseSensor):
 
     @property
     def state(self):
-        if not self.coordinator.smart_control_enabled:
+        if not self.coordinator.climate.smart_control_enabled:
             return "Smart control disabled"
         return self.coordinator.debug_text
 
@@ -71,25 +71,24 @@ class SmartClimateStatusSensor(SmartClimateBaseSensor):
     def extra_state_attributes(self):
         """Return extensive details about the current state."""
         heat_pump_state = self.coordinator.current_heat_pump_state
-        is_temperating = "Temperating" in self.coordinator.debug_text
+        is_temperating = self.coordinator.is_temperating
         
         # Calculate window timer (Open or Cooldown)
-        import time
         window_timer_min = 0
         window_mode_desc = "None"
         
-        if self.coordinator.window_open_start is not None:
-            window_timer_min = round((time.time() - self.coordinator.window_open_start) / 60, 1)
+        if self.coordinator.window.open_start is not None:
+            window_timer_min = round((self.coordinator.clock.monotonic() - self.coordinator.window.open_start) / 60, 1)
             window_mode_desc = "Open Timer"
-        elif self.coordinator.window_cooldown_start is not None:
-            window_timer_min = round((time.time() - self.coordinator.window_cooldown_start) / 60, 1)
+        elif self.coordinator.window.cooldown_start is not None:
+            window_timer_min = round((self.coordinator.clock.monotonic() - self.coordinator.window.cooldown_start) / 60, 1)
             window_mode_desc = "Cooldown (Restore)"
 
         return {
             # --- General System State ---
-            "smart_control_enabled": self.coordinator.smart_control_enabled,
-            "current_action": self.coordinator.current_action,
-            "current_hvac_mode": self.coordinator.current_hvac_mode,
+            "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
+            "current_action": self.coordinator.climate.current_action,
+            "current_hvac_mode": self.coordinator.climate.current_hvac_mode,
             
             # --- Heat Pump Details ---
             "controlled_entity": self.coordinator.heat_pump_entity_id,
@@ -105,20 +104,21 @@ class SmartClimateStatusSensor(SmartClimateBaseSensor):
             "weather_comp_factor": self.coordinator.weather_comp_factor,
             "max_comp_temp": self.coordinator.max_comp_temp,
             "min_comp_temp": self.coordinator.min_comp_temp,
+            "debug_verbosity": self.coordinator.debug_verbosity,
             
             # --- Advanced Logic States ---
-            "comfort_offset_applied": self.coordinator.comfort_offset_applied,
-            "min_runtime_remaining_minutes": self.coordinator.min_runtime_remaining_minutes,
+            "comfort_offset_applied": self.coordinator.climate.comfort_offset_applied,
+            "min_runtime_remaining_minutes": self.coordinator.climate.min_runtime_remaining_minutes,
             "is_temperating": is_temperating,
-            "last_avg_house_over_limit": self.coordinator.last_avg_house_over_limit,
+            "last_avg_house_over_limit": self.coordinator.climate.last_avg_house_over_limit,
             
             # --- Window Logic ---
-            "window_open_active": self.coordinator.window_open_start is not None,
-            "window_cooldown_active": self.coordinator.window_cooldown_start is not None,
+            "window_open_active": self.coordinator.window.open_start is not None,
+            "window_cooldown_active": self.coordinator.window.cooldown_start is not None,
             "window_timer_mode": window_mode_desc,
             "window_timer_min": window_timer_min,
             "window_delay_setting": self.coordinator.window_delay_minutes,
-            "open_windows": self.coordinator.open_window_details, # New List of Open Windows
+            "open_windows": self.coordinator.window.open_details, # New List of Open Windows
         }
 
 
@@ -131,12 +131,12 @@ class SmartClimateModeSensor(SmartClimateBaseSensor):
     
     @property
     def state(self):
-        if not self.coordinator.smart_control_enabled:
+        if not self.coordinator.climate.smart_control_enabled:
             return "Disabled"
             
-        if self.coordinator.force_eco_mode or self.coordinator.sleep_mode_active:
-            return "Force Eco" if self.coordinator.force_eco_mode else "Sleep Eco"
-        elif self.coordinator.override_mode:
+        if self.coordinator.climate.force_eco_mode or self.coordinator.climate.sleep_mode_active:
+            return "Force Eco" if self.coordinator.climate.force_eco_mode else "Sleep Eco"
+        elif self.coordinator.climate.override_mode:
             return "Force Comfort"
         else:
             return "Comfort"
@@ -144,10 +144,10 @@ class SmartClimateModeSensor(SmartClimateBaseSensor):
     @property
     def extra_state_attributes(self):
         return {
-            "smart_control_enabled": self.coordinator.smart_control_enabled,
-            "force_comfort": self.coordinator.override_mode,
-            "force_eco": self.coordinator.force_eco_mode,
-            "sleep_active": self.coordinator.sleep_mode_active,
+            "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
+            "force_comfort": self.coordinator.climate.override_mode,
+            "force_eco": self.coordinator.climate.force_eco_mode,
+            "sleep_active": self.coordinator.climate.sleep_mode_active,
         }
 
 class SmartClimateTargetSensor(SmartClimateBaseSensor):
@@ -184,38 +184,59 @@ class SmartClimateVentStatusSensor(SmartClimateBaseSensor):
     def state(self):
         if not self.coordinator.vent_enabled:
             return "Disabled"
-        if self.coordinator.vent_is_running:
-            return f"Running ({self.coordinator.vent_reason})"
+        running = [zone for zone in self.coordinator.vent_zones if zone.is_running]
+        if running and all(zone.is_paused for zone in running):
+            return "Paused (Window open)"
+        if len(running) == 1:
+            return f"Running ({running[0].reason})"
+        if running:
+            return f"Running ({len(running)} zones)"
         return "Idle"
 
     @property
     def extra_state_attributes(self):
         """Return ventilation details."""
+        # Top level attributes describe the main zone, the others are listed under "zones"
+        zone = self.coordinator.vent_main_zone
         phase_text = "OFF"
-        if self.coordinator.vent_current_phase == 1:
+        if zone.phase == 1:
             phase_text = "Phase 1 (A OUT / B IN)"
-        elif self.coordinator.vent_current_phase == 2:
+        elif zone.phase == 2:
             phase_text = "Phase 2 (A IN / B OUT)"
             
-        import time
+        now = self.coordinator.clock.monotonic()
         cycle_elapsed = 0
-        if self.coordinator.vent_cycle_start_time:
-             cycle_elapsed = int(time.time() - self.coordinator.vent_cycle_start_time)
+        if zone.is_running and zone.cycle_start_time:
+             cycle_elapsed = int(now - zone.cycle_start_time)
              
         run_elapsed_min = 0
-        if self.coordinator.vent_start_time:
-             run_elapsed_min = round((time.time() - self.coordinator.vent_start_time) / 60, 1)
+        if zone.is_running and zone.start_time:
+             run_elapsed_min = round((now - zone.start_time) / 60, 1)
 
         return {
             "is_running": self.coordinator.vent_is_running,
-            "reason": self.coordinator.vent_reason,
-            "current_phase_id": self.coordinator.vent_current_phase,
+            "reason": zone.reason,
+            "current_phase_id": zone.phase,
             "current_phase_desc": phase_text,
             "cycle_time_setting": self.coordinator.vent_cycle_time,
+            "cycle_mode": self.coordinator.vent_cycle_mode,
+            "effective_cycle_time": zone.effective_cycle_time,
+            "estimated_recovery_efficiency": zone.recovery_efficiency,
+            "paused_for_window": zone.is_paused,
+            "deferred": self.coordinator.vent_deferred_reason,
+            "effective_fan_speed": self.coordinator.vent_effective_fan_speed,
+            "heating_coordination": self.coordinator.vent_heating_coordination,
             "cycle_elapsed_sec": cycle_elapsed,
             "run_duration_setting": self.coordinator.vent_run_duration,
             "run_elapsed_min": run_elapsed_min,
             "auto_interval_hours": self.coordinator.vent_auto_interval,
             "humidity_threshold": self.coordinator.humidity_threshold,
+            "humidity_rise_rate": self.coordinator.humidity_rise_rate,
+            "humidity_baseline": zone.humidity_baseline,
+            "indoor_abs_humidity": self.coordinator.indoor_abs_humidity,
+            "outdoor_abs_humidity": self.coordinator.outdoor_abs_humidity,
+            "outdoor_dew_point": self.coordinator.outdoor_dew_point,
+            "moisture_exchange_blocked": self.coordinator.vent_moisture_blocked,
             "last_auto_run": self.coordinator.last_vent_auto_run,
+            "zones": [z.as_dict(now) for z in self.coordinator.vent_zones],
         }
\ No newline at end of file
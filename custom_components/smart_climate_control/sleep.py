@@ -0,0 +1,92 @@
+"""Sleep detection from bed occupancy sensors.
+
+Fed incrementally from the bed sensors' state events: occupied/voting counts
+are kept current so the aggregate (any / all / majority) is O(1). A change of
+the aggregate only becomes the sleep state after it held for the debounce time,
+so a bed sensor flickering while someone turns over does not toggle eco mode.
+Unavailable or unknown sensors do not vote.
+"""
+from typing import Dict, Optional
+
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+
+from .const import SLEEP_AGGREGATION_ALL, SLEEP_AGGREGATION_ANY, SLEEP_AGGREGATION_MAJORITY
+from .state import _Snapshot
+
+OCCUPIED_STATES = (STATE_ON, "true", "occupied")
+
+
+def bed_vote(state) -> Optional[bool]:
+    """Occupied / empty vote of a bed sensor state object, None if it has no reading."""
+    if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN, ""):
+        return None
+    return state.state in OCCUPIED_STATES
+
+
+class SleepMonitor(_Snapshot):
+    """Aggregated, debounced bed occupancy."""
+
+    __slots__ = ("aggregation", "debounce", "active", "votes", "pending_since", "_occupied")
+
+    def __init__(self, aggregation: str = SLEEP_AGGREGATION_ANY, debounce: float = 0) -> None:
+        self.aggregation = aggregation
+        self.debounce = debounce # Seconds
+        self.active = False # Debounced sleep state
+        self.votes: Dict[str, bool] = {} # Sensors with a reading: occupied or not
+        self.pending_since: Optional[float] = None # The aggregate differs from active since then
+        self._occupied = 0
+
+    def configure(self, aggregation: str, debounce: float) -> None:
+        """New settings from the options, the votes and the debounced state are kept."""
+        self.aggregation = aggregation
+        self.debounce = debounce
+
+    @property
+    def occupied(self) -> bool:
+        """Raw aggregate of the current votes, before debouncing."""
+        voters = len(self.votes)
+        if not voters:
+            return False
+        if self.aggregation == SLEEP_AGGREGATION_ALL:
+            return self._occupied == voters
+        if self.aggregation == SLEEP_AGGREGATION_MAJORITY:
+            return self._occupied * 2 > voters
+        return self._occupied > 0
+
+    def update(self, entity_id: str, vote: Optional[bool], now: float) -> bool:
+        """Apply one sensor's new vote. True if the debounced state changed."""
+        previous = self.votes.pop(entity_id, None)
+        if previous:
+            self._occupied -= 1
+        if vote is not None:
+            self.votes[entity_id] = vote
+            if vote:
+                self._occupied += 1
+        return self._settle(now)
+
+    def remove(self, entity_id: str, now: float) -> bool:
+        """Sensor no longer configured."""
+        return self.update(entity_id, None, now)
+
+    def advance(self, now: float) -> bool:
+        """Apply a debounced change that fell due. True if the state changed."""
+        deadline = self.next_deadline()
+        if deadline is None or now < deadline:
+            return False
+        self.active = not self.active
+        self.pending_since = None
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        """Monotonic time the pending change takes effect, None if nothing is pending."""
+        if self.pending_since is None:
+            return None
+        return self.pending_since + self.debounce
+
+    def _settle(self, now: float) -> bool:
+        if self.occupied == self.active:
+            self.pending_since = None
+            return False
+        if self.pending_since is None:
+            self.pending_since = now
+        return self.advance(now)
@@ -0,0 +1,89 @@
+"""Lead/lag staging of several heat pumps in one zone.
+
+The lead unit follows the normal control decision. Lag units are added one at
+a time, only after the error (degrees still missing to the target) has held
+above the staging threshold for the stage delay, and are dropped one at a time
+once the target is reached. Stage changes are at least the stage delay apart,
+so compressors never start (or stop) together. Whenever the whole zone stops,
+the unit with the least accumulated runtime becomes the next lead.
+"""
+from typing import Dict, List, Optional
+
+from .state import _Snapshot
+
+
+class StagingState(_Snapshot):
+    """Units in the zone, how many of them run, and their runtime."""
+
+    __slots__ = ("units", "lead", "stages", "stage_changed", "error_since", "runtime", "started")
+
+    def __init__(self, units: List[str], runtime: Optional[Dict[str, float]] = None) -> None:
+        self.units = list(units) # Configured order, the first one is the primary heat pump
+        self.lead = self.units[0]
+        self.stages = 0 # Units currently engaged, counted from the lead
+        self.stage_changed: Optional[float] = None # Monotonic time of the last stage change
+        self.error_since: Optional[float] = None # Monotonic time the error last rose to the staging threshold
+        runtime = runtime or {}
+        self.runtime: Dict[str, float] = {unit: float(runtime.get(unit, 0.0)) for unit in self.units} # Seconds
+        self.started: Dict[str, float] = {} # Running units: monotonic start
+
+    @property
+    def order(self) -> List[str]:
+        """Units in staging order, lead first."""
+        idx = self.units.index(self.lead)
+        return self.units[idx:] + self.units[:idx]
+
+    @property
+    def active(self) -> List[str]:
+        return self.order[:self.stages]
+
+    def update(self, on: bool, error: Optional[float], now: float, stage_delay: float, stage_error: float) -> bool:
+        """Apply a control decision. True if the number of engaged units changed.
+
+        error is the target minus the room temperature (the other way round when
+        cooling), None if the room temperature is unknown.
+        """
+        if not on or self.stages == 0 or error is None or error < stage_error:
+            self.error_since = None
+        elif self.error_since is None:
+            self.error_since = now
+        if not on:
+            target = 0
+        elif self.stages == 0:
+            target = 1
+        else:
+            target = self.stages
+            settled = self.stage_changed is None or now - self.stage_changed >= stage_delay
+            if settled and error is not None:
+                if (
+                    self.error_since is not None
+                    and now - self.error_since >= stage_delay
+                    and self.stages < len(self.units)
+                ):
+                    target += 1
+                elif error <= 0 and self.stages > 1:
+                    target -= 1
+        if target == self.stages:
+            return False
+
+        if self.stages == 0:
+            self._rotate()
+        order = self.order
+        for unit in order[target:self.stages]:
+            self.runtime[unit] += now - self.started.pop(unit, now)
+        for unit in order[self.stages:target]:
+            self.started[unit] = now
+        self.stages = target
+        self.stage_changed = now
+        # The next unit needs the error to hold for a full stage delay again
+        self.error_since = None
+        return True
+
+    def runtime_of(self, unit: str, now: float) -> float:
+        """Accumulated runtime including the current run."""
+        running = now - self.started[unit] if unit in self.started else 0.0
+        return self.runtime.get(unit, 0.0) + running
+
+    def _rotate(self) -> None:
+        # Ties keep the configured order, so a fresh zone starts with the primary unit
+        self.lead = min(self.units, key=lambda unit: (self.runtime[unit], self.units.index(unit)))
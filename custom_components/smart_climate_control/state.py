@@ -0,0 +1,305 @@
+"""Runtime state of the coordinator, grouped by concern.
+
+Each group is a slotted object that is only changed through its transition
+methods, and can be snapshotted cheaply for diagnostics and persistence.
+"""
+from typing import Any, Dict, Optional
+
+VENT_STATE_IDLE = "idle"
+VENT_STATE_RUNNING = "running"
+VENT_STATE_PAUSED = "paused"
+
+
+class _Snapshot:
+    __slots__ = ()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain dict copy of every slot (lists and dicts are copied)."""
+        result = {}
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot.startswith("_") or slot in result:
+                    continue
+                value = getattr(self, slot)
+                result[slot] = type(value)(value) if isinstance(value, (list, dict)) else value
+        return result
+
+
+class ClimateState(_Snapshot):
+    """Control mode flags and the last heating/cooling decision."""
+
+    __slots__ = (
+        "smart_control_enabled",
+        "smart_control_active",
+        "override_mode",
+        "force_eco_mode",
+        "force_comfort_mode",
+        "current_action",
+        "current_hvac_mode",
+        "last_avg_house_over_limit",
+        "sleep_mode_active",
+        "comfort_offset_applied",
+        "min_runtime_remaining_minutes",
+        "boost_until",
+        "curve_offset",
+    )
+
+    def __init__(self) -> None:
+        self.smart_control_enabled = True
+        self.smart_control_active = False
+        self.override_mode = False
+        self.force_eco_mode = False
+        self.force_comfort_mode = False
+        self.current_action = "off"
+        self.current_hvac_mode = "heat"
+        self.last_avg_house_over_limit = False
+        self.sleep_mode_active = False
+        self.comfort_offset_applied = 0.0
+        self.min_runtime_remaining_minutes = 0
+        self.boost_until: Optional[float] = None # Monotonic end of a running boost
+        self.curve_offset: Optional[float] = None # Weather compensation currently applied (hysteresis)
+
+    def set_enabled(self, enable: bool) -> None:
+        """Smart control switched on or off (climate entity, switch, restored state)."""
+        self.smart_control_enabled = enable
+
+    def activate(self) -> None:
+        """Smart control took over the heat pump."""
+        self.smart_control_active = True
+
+    def set_override(self, enable: bool) -> None:
+        """Force comfort (override) on or off, the HVAC mode is kept."""
+        self.override_mode = enable
+
+    def set_force_eco(self, enable: bool) -> None:
+        """Force eco, which cancels force comfort."""
+        self.force_eco_mode = enable
+        if enable:
+            self.force_comfort_mode = False
+
+    def set_force_comfort(self, enable: bool) -> None:
+        """Force comfort, which cancels force eco."""
+        self.force_comfort_mode = enable
+        if enable:
+            self.force_eco_mode = False
+
+    def select_mode(self, hvac_mode: str, override: bool = False, force_eco: bool = False) -> None:
+        """Switch HVAC mode and the preset flags together (climate entity, mode switches)."""
+        self.current_hvac_mode = hvac_mode
+        self.override_mode = override
+        self.force_eco_mode = force_eco
+
+    def set_hvac_mode(self, hvac_mode: str) -> None:
+        """Switch HVAC mode only, the preset flags are kept."""
+        self.current_hvac_mode = hvac_mode
+
+    def set_sleep(self, active: bool) -> None:
+        self.sleep_mode_active = active
+
+    def set_house_over_limit(self, over: bool) -> None:
+        """House average above its limit (kept until it drops below the hysteresis)."""
+        self.last_avg_house_over_limit = over
+
+    def apply_curve_offset(self, offset: float, hysteresis: float) -> float:
+        """Take a new weather compensation only if it moved by the hysteresis (or is 0)."""
+        if self.curve_offset is None or offset == 0 or abs(offset - self.curve_offset) >= hysteresis:
+            self.curve_offset = round(offset, 2)
+        return self.curve_offset
+
+    def record_decision(self, action: str, offset: float = 0.0, remaining_minutes: int = 0) -> None:
+        """Outcome of a control cycle: action, comfort offset and min runtime left."""
+        self.current_action = action
+        self.comfort_offset_applied = offset
+        self.min_runtime_remaining_minutes = remaining_minutes
+
+    @property
+    def boost_active(self) -> bool:
+        return self.boost_until is not None
+
+    def start_boost(self, until: float) -> None:
+        self.boost_until = until
+
+    def end_boost(self) -> None:
+        self.boost_until = None
+
+    def boost_remaining(self, now: float) -> float:
+        """Seconds left of the boost (0 when not boosting)."""
+        return max(0.0, self.boost_until - now) if self.boost_until is not None else 0.0
+
+    def release(self) -> None:
+        """Smart control handed the heat pump back."""
+        self.smart_control_active = False
+        self.current_action = "off"
+
+
+class CompressorState(_Snapshot):
+    """Heat pump run timing and the last command sent to it."""
+
+    __slots__ = (
+        "start",
+        "restored_start",
+        "reconciled",
+        "last_sent_action",
+        "last_sent_temperature",
+        "last_sent_hvac_mode",
+    )
+
+    def __init__(self) -> None:
+        self.start: Optional[float] = None # Monotonic time the compressor started
+        self.restored_start: Optional[float] = None # Checked against the pump once HA has started
+        self.reconciled = False # First command compares with the pump's actual state
+        self.last_sent_action: Optional[str] = None
+        self.last_sent_temperature: Optional[float] = None
+        self.last_sent_hvac_mode: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self.start is not None
+
+    def started(self, now: float, restart: bool = False) -> None:
+        """Compressor (re)started. Without restart an earlier start time is kept."""
+        if restart or self.start is None:
+            self.start = now
+
+    def stopped(self) -> None:
+        """Compressor stopped, a stale start time must not count towards the next run."""
+        self.start = None
+
+    def runtime(self, now: float) -> Optional[float]:
+        return now - self.start if self.start is not None else None
+
+    def in_min_runtime(self, now: float, min_runtime: float) -> bool:
+        return self.start is not None and now - self.start < min_runtime
+
+    def command_sent(self, action: str, temperature: Optional[float], hvac_mode: str) -> None:
+        self.last_sent_action = action
+        self.last_sent_temperature = temperature
+        self.last_sent_hvac_mode = hvac_mode
+
+    def is_last_sent(self, action: str, temperature: Optional[float], hvac_mode: str) -> bool:
+        return (
+            action == self.last_sent_action
+            and temperature == self.last_sent_temperature
+            and hvac_mode == self.last_sent_hvac_mode
+        )
+
+    def forget_sent(self) -> None:
+        """Next command is always sent (control released or restarted)."""
+        self.last_sent_action = None
+
+    def restore(self, start: Optional[float]) -> None:
+        """Start time read from storage, checked against the pump on reconciliation."""
+        self.restored_start = start
+
+    def take_restored(self) -> Optional[float]:
+        """Restored start time, handed out once."""
+        start, self.restored_start = self.restored_start, None
+        return start
+
+    def first_command(self) -> bool:
+        """True only for the first command after a restart."""
+        first, self.reconciled = not self.reconciled, True
+        return first
+
+
+class VentState(_Snapshot):
+    """Run state of one ventilation zone."""
+
+    __slots__ = (
+        "state",
+        "manual_mode",
+        "reason",
+        "phase",
+        "start_time",
+        "cycle_start_time",
+        "run_duration",
+        "humidity_source",
+        "humidity_baseline",
+        "humidity_cooldown_end",
+        "applied_fan_speed",
+        "effective_cycle_time",
+        "recovery_efficiency",
+    )
+
+    def __init__(self) -> None:
+        self.state = VENT_STATE_IDLE
+        self.manual_mode = False
+        self.reason = "Idle"
+        self.phase = 0
+        self.start_time: Optional[float] = None
+        self.cycle_start_time: Optional[float] = None
+        self.run_duration: float = 0
+        self.humidity_source: Optional[str] = None # Sensor that triggered a rise run
+        self.humidity_baseline: Optional[float] = None # Pre-event humidity of that sensor
+        self.humidity_cooldown_end: float = 0
+        self.applied_fan_speed: Optional[int] = None
+        self.effective_cycle_time: Optional[float] = None
+        self.recovery_efficiency: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.state != VENT_STATE_IDLE
+
+    @property
+    def is_paused(self) -> bool:
+        return self.state == VENT_STATE_PAUSED
+
+    def start(
+        self, now: float, reason: str, phase: int, run_duration: float,
+        humidity_source: Optional[str] = None, humidity_baseline: Optional[float] = None,
+        manual: bool = False,
+    ) -> None:
+        self.state = VENT_STATE_RUNNING
+        self.manual_mode = manual
+        self.reason = reason
+        self.phase = phase
+        self.start_time = now
+        self.cycle_start_time = now
+        self.run_duration = run_duration
+        self.humidity_source = humidity_source
+        self.humidity_baseline = humidity_baseline
+
+    def stop(self) -> None:
+        self.state = VENT_STATE_IDLE
+        self.manual_mode = False
+        self.reason = "Idle"
+        self.phase = 0
+        self.applied_fan_speed = None
+        self.humidity_source = None
+        self.humidity_baseline = None
+
+    def pause(self) -> None:
+        self.state = VENT_STATE_PAUSED
+        self.applied_fan_speed = None
+
+    def resume(self, now: float) -> None:
+        self.state = VENT_STATE_RUNNING
+        self.cycle_start_time = now
+
+    def flip(self, now: float) -> None:
+        """Switch to the opposite phase."""
+        self.phase = 2 if self.phase == 1 else 1
+        self.cycle_start_time = now
+
+    def merge_humidity(self, reason: str, source: Optional[str] = None, baseline: Optional[float] = None) -> None:
+        """A running non-humidity run takes over a humidity event."""
+        self.reason = reason
+        if source is not None:
+            self.humidity_source = source
+            self.humidity_baseline = baseline
+
+    def set_reason(self, reason: str) -> None:
+        """Live reason text of a running run (current humidity)."""
+        self.reason = reason
+
+    def set_cycle(self, cycle_time: float, efficiency: Optional[float]) -> None:
+        """Phase length in use and the heat recovery it gives."""
+        self.effective_cycle_time = cycle_time
+        self.recovery_efficiency = efficiency
+
+    def fans_applied(self, speed: Optional[int]) -> None:
+        self.applied_fan_speed = speed
+
+    def start_cooldown(self, until: float) -> None:
+        """No humidity triggers until the given time."""
+        self.humidity_cooldown_end = until
@@ -22,6 +22,7 @@ async def async_setup_entry(
         SmartClimateForceEcoSwitch(coordinator, config_entry),     # Force Eco
         SmartClimateForceCoolingSwitch(coordinator, config_entry), # Force Cooling
         SmartClimateEnableSwitch(coordinator, config_entry),       # Climate Management
+        SmartClimateBoostSwitch(coordinator, config_entry),        # Timed Boost
         # Ventilation Switches
         SmartClimateVentEnableSwitch(coordinator, config_entry),   # Enable Vent Auto
         SmartClimateVentManualSwitch(coordinator, config_entry),   # Start Manual Vent
@@ -61,7 +62,7 @@ class SmartClimateEnableSwitch(SmartClimateBaseSwitch):
 
     @property
     def is_on(self):
-        return self.coordinator.smart_control_enabled
+        return self.coordinator.climate.smart_control_enabled
 
     @property
     def extra_state_attributes(self):
@@ -70,8 +71,8 @@ class SmartClimateEnableSwitch(SmartClimateBaseSwitch):
             "controlled_entity": self.coordinator.heat_pump_entity_id,
             "heat_pump_mode": heat_pump_state.get("hvac_mode"),
             "heat_pump_temperature": heat_pump_state.get("temperature"),
-            "smart_control_active": self.coordinator.smart_control_active,
-            "current_mode": self.coordinator.current_hvac_mode,
+            "smart_control_active": self.coordinator.climate.smart_control_active,
+            "current_mode": self.coordinator.climate.current_hvac_mode,
         }
 
     async def async_turn_on(self, **kwargs):
@@ -90,32 +91,57 @@ class SmartClimateOverrideSwitch(SmartClimateBaseSwitch):
 
     @property
     def is_on(self):
-        return self.coordinator.override_mode and self.coordinator.current_hvac_mode == "heat"
+        return self.coordinator.climate.override_mode and self.coordinator.climate.current_hvac_mode == "heat"
 
     @property
     def extra_state_attributes(self):
         attrs = {
-            "force_comfort_mode": self.coordinator.override_mode,
-            "smart_control_enabled": self.coordinator.smart_control_enabled,
-            "current_hvac_mode": self.coordinator.current_hvac_mode,
+            "force_comfort_mode": self.coordinator.climate.override_mode,
+            "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
+            "current_hvac_mode": self.coordinator.climate.current_hvac_mode,
         }
-        if self.coordinator.current_hvac_mode == "cool":
+        if self.coordinator.climate.current_hvac_mode == "cool":
             attrs["note"] = "Force comfort not available in cooling mode"
-        elif self.coordinator.override_mode and not self.coordinator.smart_control_enabled:
+        elif self.coordinator.climate.override_mode and not self.coordinator.climate.smart_control_enabled:
             attrs["note"] = "Force comfort set but smart control is disabled"
         return attrs
 
     async def async_turn_on(self, **kwargs):
-        self.coordinator.current_hvac_mode = "heat"
-        self.coordinator.override_mode = True
-        self.coordinator.force_eco_mode = False
+        self.coordinator.climate.select_mode("heat", override=True)
         await self.coordinator.async_update()
 
     async def async_turn_off(self, **kwargs):
-        self.coordinator.override_mode = False
+        self.coordinator.climate.set_override(False)
         await self.coordinator.async_update()
 
 
+class SmartClimateBoostSwitch(SmartClimateBaseSwitch):
+    """Timed boost switch - heats to the boost temperature, turns itself off when it expires."""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry, "boost", "Boost")
+        self._attr_icon = "mdi:fire"
+
+    @property
+    def is_on(self):
+        return self.coordinator.climate.boost_active
+
+    @property
+    def extra_state_attributes(self):
+        remaining = self.coordinator.climate.boost_remaining(self.coordinator.clock.monotonic())
+        return {
+            "boost_temp": self.coordinator.boost_temp,
+            "boost_duration": self.coordinator.boost_duration,
+            "remaining_minutes": round(remaining / 60, 1),
+        }
+
+    async def async_turn_on(self, **kwargs):
+        await self.coordinator.async_start_boost()
+
+    async def async_turn_off(self, **kwargs):
+        await self.coordinator.async_stop_boost()
+
+
 class SmartClimateForceEcoSwitch(SmartClimateBaseSwitch):
     """Force eco switch."""
 
@@ -125,30 +151,28 @@ class SmartClimateForceEcoSwitch(SmartClimateBaseSwitch):
 
     @property
     def is_on(self):
-        return self.coordinator.force_eco_mode and self.coordinator.current_hvac_mode == "heat"
+        return self.coordinator.climate.force_eco_mode and self.coordinator.climate.current_hvac_mode == "heat"
 
     @property
     def extra_state_attributes(self):
         attrs = {
-            "force_eco_mode": self.coordinator.force_eco_mode,
-            "smart_control_enabled": self.coordinator.smart_control_enabled,
-            "current_hvac_mode": self.coordinator.current_hvac_mode,
+            "force_eco_mode": self.coordinator.climate.force_eco_mode,
+            "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
+            "current_hvac_mode": self.coordinator.climate.current_hvac_mode,
             "eco_temp": self.coordinator.eco_temp,
         }
-        if self.coordinator.current_hvac_mode == "cool":
+        if self.coordinator.climate.current_hvac_mode == "cool":
             attrs["note"] = "Force eco not available in cooling mode"
-        elif self.coordinator.force_eco_mode and not self.coordinator.smart_control_enabled:
+        elif self.coordinator.climate.force_eco_mode and not self.coordinator.climate.smart_control_enabled:
             attrs["note"] = "Force eco set but smart control is disabled"
         return attrs
 
     async def async_turn_on(self, **kwargs):
-        self.coordinator.current_hvac_mode = "heat"
-        self.coordinator.force_eco_mode = True
-        self.coordinator.override_mode = False
+        self.coordinator.climate.select_mode("heat", force_eco=True)
         await self.coordinator.async_update()
 
     async def async_turn_off(self, **kwargs):
-        self.coordinator.force_eco_mode = False
+        self.coordinator.climate.set_force_eco(False)
         await self.coordinator.async_update()
 
 
@@ -161,19 +185,19 @@ class SmartClimateForceCoolingSwitch(SmartClimateBaseSwitch):
 
     @property
     def is_on(self):
-        return self.coordinator.current_hvac_mode == "cool"
+        return self.coordinator.climate.current_hvac_mode == "cool"
 
     @property
     def extra_state_attributes(self):
         attrs = {
-            "cooling_mode": self.coordinator.current_hvac_mode == "cool",
-            "smart_control_enabled": self.coordinator.smart_control_enabled,
+            "cooling_mode": self.coordinator.climate.current_hvac_mode == "cool",
+            "smart_control_enabled": self.coordinator.climate.smart_control_enabled,
             "cooling_temperature": self.coordinator.cooling_temp,
         }
         
-        if not self.coordinator.smart_control_enabled:
+        if not self.coordinator.climate.smart_control_enabled:
             attrs["note"] = "Cooling mode set but smart control is disabled"
-        elif self.coordinator.current_hvac_mode == "cool":
+        elif self.coordinator.climate.current_hvac_mode == "cool":
             attrs["note"] = "Cooling mode active"
         else:
             attrs["note"] = "Cooling mode not active"
@@ -182,14 +206,12 @@ class SmartClimateForceCoolingSwitch(SmartClimateBaseSwitch):
 
     async def async_turn_on(self, **kwargs):
         _LOGGER.info("Force Cooling: Switching to cooling mode")
-        self.coordinator.current_hvac_mode = "cool"
-        self.coordinator.override_mode = False
-        self.coordinator.force_eco_mode = False
+        self.coordinator.climate.select_mode("cool")
         await self.coordinator.async_update()
 
     async def async_turn_off(self, **kwargs):
         _LOGGER.info("Force Cooling: Switching back to heating mode")
-        self.coordinator.current_hvac_mode = "heat"
+        self.coordinator.climate.set_hvac_mode("heat")
         await self.coordinator.async_update()
 
 # --- VENTILATION SWITCHES ---
@@ -225,16 +247,16 @@ class SmartClimateVentManualSwitch(SmartClimateBaseSwitch):
 
     @property
     def extra_state_attributes(self):
+        zone = self.coordinator.vent_main_zone
         return {
-            "reason": self.coordinator.vent_reason,
-            "phase": self.coordinator.vent_current_phase,
-            "duration": self.coordinator.vent_run_duration
+            "reason": zone.reason,
+            "phase": zone.phase,
+            "duration": self.coordinator.vent_run_duration,
+            "running_zones": [z.name for z in self.coordinator.vent_zones if z.is_running],
         }
 
     async def async_turn_on(self, **kwargs):
-        self.coordinator.vent_manual_mode = True
-        await self.coordinator.start_ventilation_cycle("Manual Switch")
+        await self.coordinator.start_ventilation_cycle("Manual Switch", manual=True)
 
     async def async_turn_off(self, **kwargs):
-        self.coordinator.vent_manual_mode = False
         await self.coordinator.stop_ventilation("Manual Switch Off")
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Energy price aware heating plan.
+
+A price series (sensor attribute such as Nord Pool's raw_today/raw_tomorrow,
+or a local CSV/JSON file) is turned into a plan once per price change:
+expensive slots coast towards eco, cheap slots shortly before them pre-heat
+towards the top of the comfort band. The coordinator only looks the current
+slot up (bisect), nothing is optimised per tick.
+"""
+import csv
+import json
+from bisect import bisect_right
+from typing import Any, Iterable, List, Tuple
+
+from .forecast import parse_datetime
+
+TARIFF_NORMAL = "normal"
+TARIFF_PREHEAT = "preheat"
+TARIFF_COAST = "coast"
+
+PricePoint = Tuple[float, float] # (slot start epoch seconds, price)
+
+_START_KEYS = ("start", "datetime", "time", "from", "startsAt")
+_PRICE_KEYS = ("value", "price", "total")
+
+
+def parse_prices(items: Iterable[Any]) -> List[PricePoint]:
+    """Price items (mappings with a start and a price key) to sorted points, bad items are skipped."""
+    points = {}
+    for item in items or []:
+        if not isinstance(item, dict):
+            continue
+        start = next((item[key] for key in _START_KEYS if item.get(key) is not None), None)
+        price = next((item[key] for key in _PRICE_KEYS if item.get(key) is not None), None)
+        try:
+            points[parse_datetime(start)] = float(price)
+        except (TypeError, ValueError):
+            continue
+    return sorted(points.items())
+
+
+def load_price_file(path: str) -> List[PricePoint]:
+    """Read a price file: CSV with start,price columns or a JSON list (or {"prices": [...]}).
+
+    Blocking, run it in the executor.
+    """
+    with open(path, encoding="utf-8") as handle:
+        if path.endswith(".csv"):
+            return parse_prices(csv.DictReader(handle))
+        data = json.load(handle)
+    if isinstance(data, dict):
+        data = data.get("prices", [])
+    return parse_prices(data)
+
+
+class TariffPlan:
+    """Precomputed pre-heat / coast transitions over the known price slots."""
+
+    __slots__ = ("prices", "starts", "modes", "average")
+
+    def __init__(self) -> None:
+        self.prices: List[PricePoint] = []
+        self.starts: List[float] = [] # Transition times, sorted
+        self.modes: List[str] = [] # Mode from the matching start on
+        self.average = None
+
+    def rebuild(self, prices: List[PricePoint], preheat_hours: float, threshold_pct: float) -> bool:
+        """Recompute the plan for a new price series. False if the prices did not change."""
+        if prices == self.prices:
+            return False
+        self.prices = prices
+        self.starts, self.modes = [], []
+        self.average = None
+        if not prices:
+            return True
+
+        values = [price for _, price in prices]
+        average = sum(values) / len(values)
+        self.average = average
+        limit = average + abs(average) * threshold_pct / 100
+        # Slot ends: the next start, the last slot is as long as the one before it (1 h if alone)
+        ends = [start for start, _ in prices[1:]]
+        ends.append(prices[-1][0] + (prices[-1][0] - prices[-2][0] if len(prices) > 1 else 3600))
+
+        modes = [TARIFF_COAST if price > limit else TARIFF_NORMAL for _, price in prices]
+        next_expensive = None
+        for idx in range(len(prices) - 1, -1, -1):
+            if modes[idx] == TARIFF_COAST:
+                next_expensive = prices[idx][0]
+            elif (
+                next_expensive is not None
+                and prices[idx][1] <= average
+                and next_expensive - ends[idx] < preheat_hours * 3600
+            ):
+                modes[idx] = TARIFF_PREHEAT
+
+        for idx, (start, _) in enumerate(prices):
+            if not self.modes or self.modes[-1] != modes[idx]:
+                self.starts.append(start)
+                self.modes.append(modes[idx])
+        if self.modes[-1] != TARIFF_NORMAL:
+            self.starts.append(ends[-1])
+            self.modes.append(TARIFF_NORMAL)
+        return True
+
+    def mode_at(self, ts: float) -> str:
+        idx = bisect_right(self.starts, ts) - 1
+        return self.modes[idx] if idx >= 0 else TARIFF_NORMAL
+
+    def next_change(self, ts: float):
+        """Time of the next plan transition after ts, None if there is none."""
+        idx = bisect_right(self.starts, ts)
+        return self.starts[idx] if idx < len(self.starts) else None
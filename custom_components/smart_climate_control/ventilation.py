@@ -0,0 +1,139 @@
+"""Ventilation zones and heat recovery model for the alternating (push-pull) units."""
+import math
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .state import VentState
+
+# Best case recovery of a ceramic regenerator with very short phases
+RECOVERY_MAX_EFFICIENCY = 0.9
+# Time (seconds) for the core to give up ~63 % of its stored heat at 100 % fan speed
+CORE_TIME_CONSTANT = 120.0
+# Indoor/outdoor difference (°C) at which the shortest phase is used
+REFERENCE_DELTA_T = 25.0
+
+
+def _core_time_constant(fan_speed: float) -> float:
+    """Slower air moves less heat per second, so the core saturates later."""
+    return CORE_TIME_CONSTANT * 100 / max(fan_speed, 10)
+
+
+def adaptive_cycle_time(delta_t: float, fan_speed: float, min_cycle: float, max_cycle: float) -> float:
+    """Phase length in seconds for the given indoor/outdoor temperature difference.
+
+    Small differences allow long phases (fewer direction changes), large differences
+    need short phases before the core is saturated. Lower fan speeds stretch the phase.
+    """
+    ratio = min(abs(delta_t) / REFERENCE_DELTA_T, 1.0)
+    cycle = max_cycle - (max_cycle - min_cycle) * ratio
+    cycle *= _core_time_constant(fan_speed) / CORE_TIME_CONSTANT
+    return round(max(min_cycle, min(max_cycle, cycle)))
+
+
+def recovery_efficiency(cycle_time: float, fan_speed: float) -> float:
+    """Estimated share of heat recovered (0-1) for a phase length and fan speed."""
+    x = max(cycle_time, 1) / _core_time_constant(fan_speed)
+    return RECOVERY_MAX_EFFICIENCY * (1 - math.exp(-x)) / x
+
+
+def as_list(value: Union[str, List[str], None]) -> List[str]:
+    """Normalize an entity selector value (single id, list or empty) to a list."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class VentZone(VentState):
+    """One push-pull fan pair with its own humidity sources and run state.
+
+    Phase 1 exhausts through group A and supplies through group B, phase 2 is
+    the reverse, so the two groups of a pair always run in counter-phase.
+    Threshold and fan speed fall back to the shared settings when not set.
+    """
+
+    __slots__ = ("name", "fans_a", "fans_b", "humidity_a", "humidity_b", "humidity_threshold", "fan_speed")
+
+    def __init__(
+        self,
+        name: str,
+        fans_a: List[str],
+        fans_b: List[str],
+        humidity_a: List[str],
+        humidity_b: List[str],
+        humidity_threshold: Optional[float] = None,
+        fan_speed: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.name = name
+        self.fans_a = fans_a
+        self.fans_b = fans_b
+        self.humidity_a = humidity_a
+        self.humidity_b = humidity_b
+        self.humidity_threshold = humidity_threshold
+        self.fan_speed = fan_speed
+
+    @property
+    def config_key(self) -> Tuple:
+        """Identity of the zone configuration, used to keep state across option reloads."""
+        return (
+            self.name, tuple(self.fans_a), tuple(self.fans_b),
+            tuple(self.humidity_a), tuple(self.humidity_b),
+            self.humidity_threshold, self.fan_speed,
+        )
+
+    @property
+    def fans(self) -> List[str]:
+        return self.fans_a + self.fans_b
+
+    @property
+    def directions(self) -> Tuple[str, str]:
+        """Fan directions (group A, group B) for the current phase."""
+        if self.phase == 1:
+            return "forward", "reverse"
+        return "reverse", "forward"
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        """Summary for state attributes."""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "reason": self.reason,
+            "phase": self.phase,
+            "fan_speed": self.applied_fan_speed,
+            "cycle_time": self.effective_cycle_time,
+            "recovery_efficiency": self.recovery_efficiency,
+            "run_elapsed_min": round((now - self.start_time) / 60, 1) if self.is_running and self.start_time else 0,
+        }
+
+
+def parse_vent_zones(raw: Any) -> List[VentZone]:
+    """Build extra zones from the vent_zones option (a list of mappings).
+
+    Raises ValueError when the structure is not usable.
+    """
+    if not raw:
+        return []
+    if not isinstance(raw, list):
+        raise ValueError("vent_zones must be a list")
+
+    zones = []
+    for idx, item in enumerate(raw):
+        if not isinstance(item, dict):
+            raise ValueError(f"zone {idx + 1} must be a mapping")
+        fans_a = as_list(item.get("fan_group_a"))
+        fans_b = as_list(item.get("fan_group_b"))
+        if not fans_a and not fans_b:
+            raise ValueError(f"zone {idx + 1} has no fans")
+        threshold = item.get("humidity_threshold")
+        fan_speed = item.get("vent_fan_speed")
+        zones.append(VentZone(
+            name=str(item.get("name", f"Zone {idx + 2}")),
+            fans_a=fans_a,
+            fans_b=fans_b,
+            humidity_a=as_list(item.get("humidity_sensor_a")),
+            humidity_b=as_list(item.get("humidity_sensor_b")),
+            humidity_threshold=float(threshold) if threshold is not None else None,
+            fan_speed=int(fan_speed) if fan_speed is not None else None,
+        ))
+    return zones
@@ -0,0 +1,113 @@
+"""Open window / door state machine.
+
+Fed incrementally from the sensors' state events: every sensor keeps its own
+open timestamp, so "is anything open beyond the delay" is O(1) and nothing is
+re-scanned per tick. next_deadline() tells the coordinator when the next timed
+transition is due, so it can arm an exact timer instead of waiting for the
+60 s update.
+
+    closed  --any open-->    pending  --delay-->   stopped
+    pending --all closed-->  closed
+    stopped --all closed-->  cooldown --delay-->   closed
+    cooldown --any open-->   stopped
+"""
+from typing import Dict, List, Optional
+
+from homeassistant.const import STATE_ON, STATE_OPEN
+
+from .state import _Snapshot
+
+WINDOW_CLOSED = "closed"
+WINDOW_PENDING = "pending" # Open, within the delay
+WINDOW_STOPPED = "stopped" # Open beyond the delay, climate is off
+WINDOW_COOLDOWN = "cooldown" # Closed after a stop, waiting to restore
+
+OPEN_STATES = (STATE_ON, "true", STATE_OPEN)
+
+
+def is_open_state(state) -> bool:
+    """Whether a window/door sensor state object reads as open."""
+    return state is not None and state.state in OPEN_STATES
+
+
+class WindowMonitor(_Snapshot):
+    """Open window timer and the restore cooldown after closing."""
+
+    __slots__ = ("state", "delay", "open_start", "cooldown_start", "open_since", "stop_active", "_names")
+
+    def __init__(self, delay: float = 0) -> None:
+        self.state = WINDOW_CLOSED
+        self.delay = delay # Seconds, both for the open delay and the restore cooldown
+        self.open_start: Optional[float] = None # Start of the current open period (any sensor)
+        self.cooldown_start: Optional[float] = None # Tracks time after closing window
+        self.open_since: Dict[str, float] = {} # Open sensors and when each of them opened
+        self.stop_active = False # Heating stopped by open window (read by the vent loop)
+        self._names: Dict[str, str] = {}
+
+    def set_delay(self, delay: float) -> None:
+        """New delay from the options, a running stop or cooldown keeps its start."""
+        self.delay = delay
+
+    def set_stop(self, active: bool) -> None:
+        """Whether heating is currently stopped for an open window."""
+        self.stop_active = active
+
+    @property
+    def open_details(self) -> List[str]:
+        """Names of currently open windows."""
+        return [self._names.get(entity_id, entity_id) for entity_id in self.open_since]
+
+    @property
+    def stop_climate(self) -> bool:
+        """Climate must stay off: open beyond the delay, or in the restore cooldown."""
+        return self.state in (WINDOW_STOPPED, WINDOW_COOLDOWN)
+
+    def update(self, entity_id: str, is_open: bool, now: float, name: Optional[str] = None) -> bool:
+        """Apply one sensor's new state. True if the machine changed state."""
+        before = self.state
+        self.advance(now)
+        if is_open:
+            if name:
+                self._names[entity_id] = name
+            self.open_since.setdefault(entity_id, now)
+            if self.state == WINDOW_CLOSED:
+                self.state = WINDOW_PENDING
+                self.open_start = now
+            elif self.state == WINDOW_COOLDOWN:
+                self.state = WINDOW_STOPPED
+                self.open_start = now
+                self.cooldown_start = None
+        elif self.open_since.pop(entity_id, None) is not None and not self.open_since:
+            if self.state == WINDOW_PENDING:
+                # Closed before the delay passed: no stop happened, no cooldown needed
+                self._reset()
+            elif self.state == WINDOW_STOPPED:
+                self.state = WINDOW_COOLDOWN
+                self.open_start = None
+                self.cooldown_start = now
+        self.advance(now)
+        return self.state != before
+
+    def advance(self, now: float) -> bool:
+        """Apply the timed transitions that are due. True if the state changed."""
+        deadline = self.next_deadline()
+        if deadline is None or now < deadline:
+            return False
+        if self.state == WINDOW_PENDING:
+            self.state = WINDOW_STOPPED
+        else:
+            self._reset()
+        return True
+
+    def next_deadline(self) -> Optional[float]:
+        """Monotonic time of the next timed transition, None if nothing is pending."""
+        if self.state == WINDOW_PENDING:
+            return self.open_start + self.delay
+        if self.state == WINDOW_COOLDOWN:
+            return self.cooldown_start + self.delay
+        return None
+
+    def _reset(self) -> None:
+        self.state = WINDOW_CLOSED
+        self.open_start = None
+        self.cooldown_start = None
@@ -0,0 +1,121 @@
+"""Deduplicating, rate limited service calls."""
+import asyncio
+
+from custom_components.smart_climate_control.actuator import (
+    CALL_DEDUPLICATED,
+    CALL_DEFERRED,
+    CALL_SENT,
+    DEDUP_REFRESH,
+    ActuatorGateway,
+)
+from tools.fakes import FakeClock
+
+
+class _Services:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def async_call(self, domain, service, data, blocking=False):
+        self.calls.append((domain, service, dict(data)))
+
+
+class _Hass:
+    def __init__(self) -> None:
+        self.services = _Services()
+
+
+def _gateway(min_interval: float = 0, budget: int = 0):
+    hass = _Hass()
+    clock = FakeClock(1_700_000_000)
+    return ActuatorGateway(hass, clock, clock.call_later, min_interval, budget), hass, clock
+
+
+def test_repeated_state_is_deduplicated_until_the_refresh():
+    async def run():
+        gateway, hass, clock = _gateway()
+        data = {"entity_id": "climate.hp", "temperature": 21}
+        assert await gateway.call("climate", "set_temperature", data) == CALL_SENT
+        assert await gateway.call("climate", "set_temperature", dict(data)) == CALL_DEDUPLICATED
+        assert await gateway.call("climate", "set_temperature", dict(data), force=True) == CALL_SENT
+        await clock.run_until(clock.monotonic() + DEDUP_REFRESH)
+        assert await gateway.call("climate", "set_temperature", dict(data)) == CALL_SENT
+        assert len(hass.services.calls) == 3
+        assert gateway.stats["deduplicated"] == 1
+
+    asyncio.run(run())
+
+
+def test_turn_off_is_never_deduplicated_or_deferred():
+    async def run():
+        gateway, hass, _ = _gateway(min_interval=60, budget=1)
+        for _ in range(3):
+            assert await gateway.call("fan", "turn_off", {"entity_id": "fan.a"}) == CALL_SENT
+        assert len(hass.services.calls) == 3
+
+    asyncio.run(run())
+
+
+def test_min_interval_defers_and_sends_later():
+    async def run():
+        gateway, hass, clock = _gateway(min_interval=30)
+        assert await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 20}) == CALL_SENT
+        result = await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 21})
+        assert result == CALL_DEFERRED
+        assert gateway.is_pending("climate.hp")
+        # A newer command replaces the queued one
+        result = await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 22})
+        assert result == CALL_DEFERRED
+        await clock.run_until(30)
+        assert not gateway.is_pending("climate.hp")
+        assert [call[2]["temperature"] for call in hass.services.calls] == [20, 22]
+        assert gateway.stats["merged"] == 1
+
+    asyncio.run(run())
+
+
+def test_min_interval_is_per_service():
+    async def run():
+        gateway, hass, _ = _gateway(min_interval=30)
+        assert await gateway.call("fan", "set_percentage", {"entity_id": "fan.a", "percentage": 40}) == CALL_SENT
+        assert await gateway.call("fan", "set_direction", {"entity_id": "fan.a", "direction": "forward"}) == CALL_SENT
+        assert len(hass.services.calls) == 2
+
+    asyncio.run(run())
+
+
+def test_turn_off_overrides_a_queued_command():
+    async def run():
+        gateway, hass, clock = _gateway(min_interval=30)
+        await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 20})
+        await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 21})
+        assert await gateway.call("climate", "turn_off", {"entity_id": "climate.hp"}) == CALL_SENT
+        assert not gateway.is_pending("climate.hp")
+        await clock.run_until(60)
+        assert [call[1] for call in hass.services.calls] == ["set_temperature", "turn_off"]
+
+    asyncio.run(run())
+
+
+def test_budget_defers_over_the_limit():
+    async def run():
+        gateway, hass, clock = _gateway(budget=2)
+        for idx in range(3):
+            await gateway.call("climate", "set_temperature", {"entity_id": f"climate.hp{idx}", "temperature": 20})
+        assert len(hass.services.calls) == 2
+        assert gateway.is_pending("climate.hp2")
+        await clock.run_until(60)
+        assert len(hass.services.calls) == 3
+
+    asyncio.run(run())
+
+
+def test_close_drops_deferred_calls():
+    async def run():
+        gateway, hass, clock = _gateway(min_interval=30)
+        await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 20})
+        await gateway.call("climate", "set_temperature", {"entity_id": "climate.hp", "temperature": 21})
+        gateway.close()
+        await clock.run_until(60)
+        assert len(hass.services.calls) == 1
+
+    asyncio.run(run())
@@ -0,0 +1,95 @@
+"""Input conditioning and room sensor fusion."""
+import pytest
+
+from custom_components.smart_climate_control.conditioning import InputFilter, RoomFusion, parse_room_sensors
+from custom_components.smart_climate_control.const import SENSOR_FILTER_EMA, SENSOR_FILTER_MEDIAN
+
+
+def test_glitch_is_dropped_and_real_step_is_confirmed():
+    flt = InputFilter(max_rate=1.0)
+    flt.update(20.5, 0)
+    flt.update(85.0, 60)
+    assert flt.value == 20.5
+    assert flt.rejected == 1
+    flt.update(20.6, 120)
+    assert flt.value == 20.6
+    flt.update(17.0, 180)
+    flt.update(17.1, 240)
+    assert flt.value == 17.1
+
+
+def test_first_reading_after_unavailable_is_taken():
+    flt = InputFilter(max_rate=1.0)
+    flt.update(20.0, 0)
+    flt.update(None, 60)
+    flt.update(25.0, 120)
+    assert flt.value == 25.0
+    assert flt.rejected == 0
+
+
+def test_rate_check_is_off_by_default():
+    flt = InputFilter()
+    flt.update(20.0, 0)
+    flt.update(30.0, 1)
+    assert flt.value == 30.0
+
+
+def test_median_and_ema():
+    median = InputFilter(SENSOR_FILTER_MEDIAN, window=3)
+    for at, value in enumerate((20.0, 18.9, 20.1)):
+        median.update(value, at * 60)
+    assert median.value == 20.0
+
+    ema = InputFilter(SENSOR_FILTER_EMA, window=3)
+    ema.update(20.0, 0)
+    ema.update(21.0, 60)
+    assert ema.value == 20.5
+
+
+def test_staleness():
+    flt = InputFilter(stale_after=1800)
+    flt.update(20.0, 0)
+    assert flt.current(1799) == 20.0
+    assert flt.current(1800) is None
+    assert flt.stale_at() == 1800
+    flt.reported(1700)
+    assert flt.current(1800) == 20.0
+
+
+def test_unavailable_has_no_value():
+    flt = InputFilter()
+    flt.update(20.0, 0)
+    flt.update(None, 60)
+    assert flt.current(60) is None
+    assert flt.stale_at() is None
+
+
+def test_parse_room_sensors():
+    assert parse_room_sensors(None, "sensor.room") == {"sensor.room": 1.0}
+    assert parse_room_sensors(["sensor.a"], "sensor.room") == {"sensor.room": 1.0, "sensor.a": 1.0}
+    assert parse_room_sensors({"sensor.a": 3, "sensor.room": 2}, "sensor.room") == {"sensor.room": 2.0, "sensor.a": 3.0}
+    for raw in ({"sensor.a": 0}, ["light.a"], 5):
+        with pytest.raises(ValueError):
+            parse_room_sensors(raw, "sensor.room")
+
+
+def test_fusion_weights_and_missing_members():
+    fusion = RoomFusion({"sensor.room": 1.0, "sensor.b": 3.0})
+    assert fusion.fuse({"sensor.room": 19.0, "sensor.b": 20.0}) == 19.75
+    assert fusion.fuse({"sensor.room": 19.0, "sensor.b": None}) == 19.0
+    assert fusion.used == ["sensor.room"]
+    assert fusion.fuse({"sensor.room": None, "sensor.b": None}) is None
+
+
+def test_fusion_rejects_an_outlier_with_three_sensors():
+    fusion = RoomFusion({"a": 1.0, "b": 1.0, "c": 1.0}, outlier=1.5)
+    assert fusion.fuse({"a": 19.6, "b": 19.8, "c": 23.5}) == 19.7
+    assert fusion.outliers == ["c"]
+    # Two sensors cannot outvote each other
+    assert fusion.fuse({"a": 19.6, "b": None, "c": 23.5}) == 21.55
+    assert fusion.outliers == []
+
+
+def test_fusion_without_consensus_keeps_every_reading():
+    fusion = RoomFusion({"a": 1.0, "b": 1.0, "c": 1.0, "d": 1.0}, outlier=1.5)
+    assert fusion.fuse({"a": 18.0, "b": 18.0, "c": 22.0, "d": 22.0}) == 20.0
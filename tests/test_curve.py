@@ -0,0 +1,32 @@
+"""Heating curve and setpoint quantization."""
+import pytest
+
+from custom_components.smart_climate_control.curve import curve_offset, parse_curve_points, quantize
+
+
+def test_slope_curve_is_capped():
+    assert curve_offset(5, start=0, slope=0.5, max_offset=5) == 0.0
+    assert curve_offset(-4, start=0, slope=0.5, max_offset=5) == 2.0
+    assert curve_offset(-30, start=0, slope=0.5, max_offset=5) == 5
+
+
+def test_piecewise_curve_interpolates_and_is_flat_beyond_the_ends():
+    points = parse_curve_points("5:0, -15:4, -5:2")
+    assert points == [(-15.0, 4.0), (-5.0, 2.0), (5.0, 0.0)]
+    assert curve_offset(-10, 0, 0, 0, points) == 3.0
+    assert curve_offset(-20, 0, 0, 0, points) == 4.0
+    assert curve_offset(10, 0, 0, 0, points) == 0.0
+
+
+@pytest.mark.parametrize("raw", ["5", "a:1", "5:1, 5:2"])
+def test_invalid_curve_points_raise(raw):
+    with pytest.raises(ValueError):
+        parse_curve_points(raw)
+
+
+def test_quantize():
+    assert quantize(20.5, 0.5) == 20.5
+    assert quantize(20.74, 0.5) == 20.5
+    assert quantize(20.75, 0.5) == 21.0
+    assert quantize(20.5, 1.0) == 21.0
+    assert quantize(20.37, None) == 20.37
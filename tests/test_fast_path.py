@@ -0,0 +1,62 @@
+"""Skipping ticks with unchanged inputs never delays a timed decision."""
+import asyncio
+
+from tools import replay
+
+T0 = 1704909600 # 2024-01-10 18:00 UTC
+
+DATA = {
+    "name": "Test", "heat_pump": "climate.hp",
+    "room_sensor": "sensor.room", "outside_sensor": "sensor.outside", "average_sensor": "sensor.avg",
+}
+
+
+def _replay(options, history):
+    return asyncio.run(replay.replay({"data": DATA, "options": options}, history, ventilation=False))
+
+
+def test_min_runtime_expiry_is_not_skipped():
+    history = [
+        (T0, "sensor.outside", "5", None),
+        (T0, "sensor.avg", "19", None),
+        (T0, "sensor.room", "19", None),
+        # Warm enough to stop two minutes in, min runtime holds the pump on until +10 min
+        (T0 + 120, "sensor.room", "21.5", None),
+        (T0 + 3600, "sensor.outside", "5.1", None),
+    ]
+    coordinator, timeline = _replay({"min_run_time": 10}, history)
+    assert timeline[0]["action"] == "on"
+    stops = [entry["time"] for entry in timeline if entry["action"] == "off"]
+    assert stops and T0 + 600 <= stops[0] <= T0 + 660
+    # The ticks after the stop had nothing to do
+    assert coordinator.skipped_updates > 0
+
+
+def test_stale_room_sensor_is_noticed_on_its_deadline():
+    history = [
+        (T0, "sensor.outside", "5", None),
+        (T0, "sensor.avg", "20", None),
+        (T0, "sensor.room", "19", None),
+        (T0 + 200, "sensor.outside", "5.1", None),
+        (T0 + 200, "sensor.avg", "20.1", None),
+        (T0 + 3600, "sensor.outside", "5.2", None),
+    ]
+    coordinator, timeline = _replay({"min_run_time": 0, "sensor_stale_timeout": 5}, history)
+    # The room sensor goes stale at +5 min without any state event, the average takes over
+    switched = [entry["time"] for entry in timeline if entry["room_source"] == "average"]
+    assert switched and T0 + 300 <= switched[0] <= T0 + 360
+    assert all(entry["room_source"] == "room" for entry in timeline if entry["time"] < T0 + 300)
+    assert coordinator.skipped_updates > 0
+
+
+def test_unchanged_inputs_skip_the_evaluation():
+    history = [
+        (T0, "sensor.outside", "5", None),
+        (T0, "sensor.avg", "20.6", None),
+        (T0, "sensor.room", "20.6", None),
+        (T0 + 3600, "sensor.outside", "5", None),
+    ]
+    coordinator, timeline = _replay({"min_run_time": 0}, history)
+    assert len(timeline) == 1
+    # Apart from the start the hour of ticks is skipped
+    assert coordinator.skipped_updates >= 55
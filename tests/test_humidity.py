@@ -0,0 +1,36 @@
+"""Humidity helpers of the ventilation logic."""
+import pytest
+
+from custom_components.smart_climate_control.humidity import HumidityTrend, absolute_humidity, dew_point
+
+
+def test_absolute_humidity_and_dew_point():
+    assert absolute_humidity(20, 50) == pytest.approx(8.6, abs=0.1)
+    assert dew_point(20, 50) == pytest.approx(9.3, abs=0.1)
+    assert dew_point(20, 100) == pytest.approx(20.0, abs=0.01)
+
+
+def test_rise_needs_a_minimum_delta():
+    trend = HumidityTrend(600)
+    trend.add(0, 50)
+    trend.add(60, 53)
+    assert trend.rise(60) == (0.0, 50)
+
+
+def test_rise_rate_from_the_baseline():
+    trend = HumidityTrend(600)
+    trend.add(0, 50)
+    trend.add(60, 55)
+    trend.add(180, 60)
+    rate, baseline = trend.rise(180)
+    assert baseline == 50
+    # 10 % over the 120 s since the rise started plus the 60 s minimum span
+    assert rate == pytest.approx(10 / 3)
+
+
+def test_unchanged_values_are_not_stored():
+    trend = HumidityTrend(600)
+    trend.add(0, 50)
+    trend.add(60, 50)
+    assert len(trend.samples) == 1
+    assert trend.latest == 50
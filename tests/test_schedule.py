@@ -0,0 +1,91 @@
+"""Weekly schedule parsing and transitions."""
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.smart_climate_control.schedule import (
+    SCHEDULE_COMFORT,
+    SCHEDULE_ECO,
+    describe,
+    parse_schedule,
+)
+
+BUDAPEST = ZoneInfo("Europe/Budapest")
+
+
+def _utc_delta(start: datetime, end: datetime) -> float:
+    # Aware datetimes sharing a tzinfo subtract as wall time, compare in UTC
+    return (end.astimezone(timezone.utc) - start.astimezone(timezone.utc)).total_seconds()
+
+
+def test_blocks_and_day_overrides():
+    schedule = parse_schedule({
+        "daily": ["06:00-22:00 comfort"],
+        "sat": ["08:00-23:00 comfort"],
+    })
+    assert schedule.mode_at(datetime(2024, 1, 8, 7, 0, tzinfo=BUDAPEST)) == SCHEDULE_COMFORT # Monday
+    assert schedule.mode_at(datetime(2024, 1, 8, 23, 0, tzinfo=BUDAPEST)) is None
+    assert schedule.mode_at(datetime(2024, 1, 13, 7, 0, tzinfo=BUDAPEST)) is None # Saturday
+    assert schedule.mode_at(datetime(2024, 1, 13, 22, 30, tzinfo=BUDAPEST)) == SCHEDULE_COMFORT
+
+
+def test_block_past_midnight():
+    schedule = parse_schedule({"daily": ["22:00-06:00 eco"]})
+    assert schedule.mode_at(datetime(2024, 1, 8, 23, 0, tzinfo=BUDAPEST)) == SCHEDULE_ECO
+    assert schedule.mode_at(datetime(2024, 1, 9, 5, 59, tzinfo=BUDAPEST)) == SCHEDULE_ECO
+    assert schedule.mode_at(datetime(2024, 1, 9, 6, 0, tzinfo=BUDAPEST)) is None
+
+
+def test_preheat_moves_warm_transitions_earlier():
+    schedule = parse_schedule({"daily": ["06:00-22:00 comfort"]}, preheat_minutes=30)
+    assert describe(schedule)[0] == {"at": "mon 05:30", "mode": SCHEDULE_COMFORT}
+
+
+@pytest.mark.parametrize("raw", [
+    {"someday": ["06:00-08:00 comfort"]},
+    {"daily": ["06:00-08:00 warm"]},
+    {"daily": ["06:00 comfort"]},
+    {"daily": ["25:00-26:00 comfort"]},
+    ["06:00-08:00 comfort"],
+])
+def test_invalid_schedules_raise(raw):
+    with pytest.raises(ValueError):
+        parse_schedule(raw)
+
+
+def test_empty_schedule_has_no_transitions():
+    schedule = parse_schedule(None)
+    assert not schedule
+    assert schedule.next_transition(datetime(2024, 1, 8, tzinfo=BUDAPEST)) is None
+
+
+def test_next_transition_same_day():
+    schedule = parse_schedule({"daily": ["06:00-22:00 comfort"]})
+    now = datetime(2024, 1, 8, 5, 0, 30, tzinfo=BUDAPEST)
+    assert _utc_delta(now, schedule.next_transition(now)) == 3600 - 30
+
+
+def test_next_transition_across_spring_forward():
+    # Clocks go from 02:00 to 03:00 on 31 March 2024: 6 real hours to 06:00
+    schedule = parse_schedule({"daily": ["06:00-22:00 comfort"]})
+    now = datetime(2024, 3, 30, 23, 0, tzinfo=BUDAPEST)
+    next_at = schedule.next_transition(now)
+    assert (next_at.day, next_at.hour, next_at.minute) == (31, 6, 0)
+    assert _utc_delta(now, next_at) == 6 * 3600
+
+
+def test_next_transition_across_fall_back():
+    # Clocks go from 03:00 back to 02:00 on 27 October 2024: 8 real hours to 06:00
+    schedule = parse_schedule({"daily": ["06:00-22:00 comfort"]})
+    now = datetime(2024, 10, 26, 23, 0, tzinfo=BUDAPEST)
+    next_at = schedule.next_transition(now)
+    assert (next_at.day, next_at.hour) == (27, 6)
+    assert _utc_delta(now, next_at) == 8 * 3600
+
+
+def test_next_transition_wraps_into_next_week():
+    schedule = parse_schedule({"mon": ["06:00-08:00 comfort"]})
+    now = datetime(2024, 1, 8, 9, 0, tzinfo=BUDAPEST) # Monday after the block
+    next_at = schedule.next_transition(now)
+    assert (next_at.day, next_at.hour) == (15, 6)
@@ -0,0 +1,75 @@
+"""Bed sensor aggregation and debounce."""
+from custom_components.smart_climate_control.const import (
+    SLEEP_AGGREGATION_ALL,
+    SLEEP_AGGREGATION_ANY,
+    SLEEP_AGGREGATION_MAJORITY,
+)
+from custom_components.smart_climate_control.sleep import SleepMonitor
+
+
+def _monitor(aggregation, debounce=60, beds=2):
+    sleep = SleepMonitor(aggregation, debounce)
+    for idx in range(beds):
+        sleep.update(f"binary_sensor.bed_{idx}", False, 0)
+    return sleep
+
+
+def test_any_bed_starts_sleep_after_the_debounce():
+    sleep = _monitor(SLEEP_AGGREGATION_ANY)
+    assert not sleep.update("binary_sensor.bed_0", True, 100)
+    assert sleep.occupied and not sleep.active
+    assert sleep.next_deadline() == 160
+    assert not sleep.advance(159)
+    assert sleep.advance(160)
+    assert sleep.active
+    assert sleep.next_deadline() is None
+
+
+def test_change_back_within_the_debounce_is_dropped():
+    sleep = _monitor(SLEEP_AGGREGATION_ANY)
+    sleep.update("binary_sensor.bed_0", True, 100)
+    sleep.update("binary_sensor.bed_0", False, 130)
+    assert sleep.next_deadline() is None
+    assert not sleep.advance(200)
+    assert not sleep.active
+
+
+def test_all_beds_must_be_occupied():
+    sleep = _monitor(SLEEP_AGGREGATION_ALL, debounce=0)
+    assert not sleep.update("binary_sensor.bed_0", True, 0)
+    assert sleep.update("binary_sensor.bed_1", True, 10)
+    assert sleep.active
+    # Leaving one bed ends sleep mode
+    assert sleep.update("binary_sensor.bed_0", False, 20)
+    assert not sleep.active
+
+
+def test_majority_tie_is_not_occupied():
+    sleep = _monitor(SLEEP_AGGREGATION_MAJORITY, debounce=0, beds=4)
+    sleep.update("binary_sensor.bed_0", True, 0)
+    sleep.update("binary_sensor.bed_1", True, 0)
+    assert not sleep.active
+    assert sleep.update("binary_sensor.bed_2", True, 0)
+    assert sleep.active
+
+
+def test_unavailable_bed_leaves_the_vote():
+    sleep = _monitor(SLEEP_AGGREGATION_MAJORITY, beds=3)
+    sleep.update("binary_sensor.bed_0", True, 0)
+    sleep.update("binary_sensor.bed_1", True, 0)
+    sleep.advance(60)
+    assert sleep.active
+    # 1 of the 2 remaining voters is a tie: sleep ends after the debounce
+    sleep.update("binary_sensor.bed_1", None, 100)
+    assert sleep.votes == {"binary_sensor.bed_0": True, "binary_sensor.bed_2": False}
+    assert sleep.active
+    assert sleep.advance(160)
+    assert not sleep.active
+
+
+def test_no_bed_sensors_is_never_occupied():
+    sleep = SleepMonitor(SLEEP_AGGREGATION_ALL)
+    assert not sleep.occupied
+    assert sleep.update("binary_sensor.bed_0", True, 0)
+    assert sleep.remove("binary_sensor.bed_0", 10)
+    assert not sleep.occupied and not sleep.active
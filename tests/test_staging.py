@@ -0,0 +1,73 @@
+"""Lead/lag staging of several heat pumps."""
+from custom_components.smart_climate_control.staging import StagingState
+
+DELAY = 600
+THRESHOLD = 0.5
+
+
+def test_single_reading_after_delay_does_not_stage_up():
+    staging = StagingState(["climate.hp", "climate.hp2"])
+    staging.update(True, 0.2, 0, DELAY, THRESHOLD)
+    assert staging.stages == 1
+    # Delay since the lead started is over, but the error only just rose
+    assert not staging.update(True, 1.0, DELAY + 60, DELAY, THRESHOLD)
+    assert staging.stages == 1
+
+
+def test_error_must_persist_for_the_stage_delay():
+    staging = StagingState(["climate.hp", "climate.hp2"])
+    staging.update(True, 1.0, 0, DELAY, THRESHOLD)
+    staging.update(True, 1.0, 60, DELAY, THRESHOLD)
+    assert not staging.update(True, 1.0, 60 + DELAY - 1, DELAY, THRESHOLD)
+    assert staging.update(True, 1.0, 60 + DELAY, DELAY, THRESHOLD)
+    assert staging.active == ["climate.hp", "climate.hp2"]
+
+
+def test_error_dropping_below_restarts_the_wait():
+    staging = StagingState(["climate.hp", "climate.hp2"])
+    staging.update(True, 1.0, 0, DELAY, THRESHOLD)
+    staging.update(True, 1.0, 60, DELAY, THRESHOLD)
+    staging.update(True, 0.1, 300, DELAY, THRESHOLD)
+    staging.update(True, 1.0, 360, DELAY, THRESHOLD)
+    assert not staging.update(True, 1.0, 60 + DELAY, DELAY, THRESHOLD)
+    assert staging.update(True, 1.0, 360 + DELAY, DELAY, THRESHOLD)
+
+
+def test_stages_drop_one_at_a_time_and_all_stop_together():
+    staging = StagingState(["a", "b", "c"])
+    staging.update(True, 2.0, 0, DELAY, THRESHOLD)
+    staging.update(True, 2.0, 10, DELAY, THRESHOLD)
+    staging.update(True, 2.0, 10 + DELAY, DELAY, THRESHOLD)
+    staging.update(True, 2.0, 20 + DELAY, DELAY, THRESHOLD)
+    staging.update(True, 2.0, 20 + 2 * DELAY, DELAY, THRESHOLD)
+    assert staging.stages == 3
+    assert staging.update(True, -0.1, 20 + 3 * DELAY, DELAY, THRESHOLD)
+    assert staging.stages == 2
+    assert staging.update(False, None, 30 + 3 * DELAY, DELAY, THRESHOLD)
+    assert staging.stages == 0
+    assert staging.started == {}
+
+
+def test_runtime_accumulates_and_survives_a_restart():
+    staging = StagingState(["a", "b"])
+    staging.update(True, 0.0, 0, DELAY, THRESHOLD)
+    assert staging.runtime_of("a", 100) == 100
+    staging.update(False, None, 3600, DELAY, THRESHOLD)
+    stored = staging.snapshot()["runtime"]
+    assert stored == {"a": 3600.0, "b": 0.0}
+
+    restored = StagingState(["a", "b"], stored)
+    assert restored.runtime == stored
+
+
+def test_least_runtime_unit_leads_the_next_run():
+    staging = StagingState(["a", "b", "c"], {"a": 500, "b": 100, "c": 300})
+    staging.update(True, 0.0, 0, DELAY, THRESHOLD)
+    assert staging.lead == "b"
+    assert staging.order == ["b", "c", "a"]
+
+
+def test_ties_keep_the_configured_order():
+    staging = StagingState(["a", "b"])
+    staging.update(True, 0.0, 0, DELAY, THRESHOLD)
+    assert staging.lead == "a"
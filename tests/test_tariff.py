@@ -0,0 +1,68 @@
+"""Price aware pre-heat / coast plan."""
+import asyncio
+import json
+
+from custom_components.smart_climate_control.tariff import (
+    TARIFF_COAST,
+    TARIFF_NORMAL,
+    TARIFF_PREHEAT,
+    TariffPlan,
+    parse_prices,
+)
+from tools import replay
+
+T0 = 1704909600 # 2024-01-10 18:00 UTC
+
+
+def _prices(*values):
+    return [{"start": T0 + idx * 3600, "price": value} for idx, value in enumerate(values)]
+
+
+def test_parse_prices_skips_bad_items_and_sorts():
+    points = parse_prices([
+        {"start": T0 + 3600, "value": 2},
+        {"start": T0, "price": "1.5"},
+        {"start": T0 + 7200},
+        "junk",
+    ])
+    assert points == [(T0, 1.5), (T0 + 3600, 2.0)]
+
+
+def test_plan_preheats_before_expensive_slots():
+    plan = TariffPlan()
+    assert plan.rebuild(parse_prices(_prices(0.1, 0.1, 0.1, 0.6, 0.1)), preheat_hours=1, threshold_pct=20)
+    assert plan.mode_at(T0) == TARIFF_NORMAL
+    assert plan.mode_at(T0 + 2 * 3600) == TARIFF_PREHEAT
+    assert plan.mode_at(T0 + 3 * 3600) == TARIFF_COAST
+    assert plan.mode_at(T0 + 4 * 3600) == TARIFF_NORMAL
+    assert plan.next_change(T0) == T0 + 2 * 3600
+    # Same prices again: nothing to rebuild
+    assert not plan.rebuild(parse_prices(_prices(0.1, 0.1, 0.1, 0.6, 0.1)), 1, 20)
+
+
+def test_preheat_stops_at_the_top_of_the_comfort_band(tmp_path):
+    price_file = tmp_path / "prices.json"
+    price_file.write_text(json.dumps(_prices(0.1, 0.6)))
+    config = {
+        "data": {
+            "name": "Test", "heat_pump": "climate.hp",
+            "room_sensor": "sensor.room", "outside_sensor": "sensor.outside",
+        },
+        "options": {"min_run_time": 0, "price_file": str(price_file)},
+    }
+    history = [
+        (T0, "sensor.outside", "10", None),
+        (T0, "sensor.room", "19.9", None),
+        (T0 + 600, "sensor.room", "20.3", None),
+        (T0 + 1200, "sensor.room", "20.5", None),
+        (T0 + 1800, "sensor.outside", "10.1", None),
+    ]
+    _, timeline = asyncio.run(replay.replay(config, history, ventilation=False))
+    by_room = {entry["room_temp"]: entry for entry in timeline}
+    # Comfort 20 °C with a 0.5 °C band: pre-heat starts inside the band...
+    assert by_room[19.9]["tariff"] == TARIFF_PREHEAT
+    assert by_room[19.9]["action"] == "on"
+    assert by_room[19.9]["base_temp"] == 20.0
+    assert by_room[20.3]["action"] == "on"
+    # ...and stops at its top like normal heating, not a deadband higher
+    assert by_room[20.5]["action"] == "off"
@@ -0,0 +1,95 @@
+"""Open window state machine and its exact timers."""
+import asyncio
+
+from custom_components.smart_climate_control.window import (
+    WINDOW_CLOSED,
+    WINDOW_COOLDOWN,
+    WINDOW_PENDING,
+    WINDOW_STOPPED,
+    WindowMonitor,
+)
+from tools import replay
+
+T0 = 1704909600 # 2024-01-10 18:00 UTC
+
+
+def test_open_pending_stopped_cooldown_closed():
+    window = WindowMonitor(delay=120)
+    assert window.update("binary_sensor.a", True, 10)
+    assert window.state == WINDOW_PENDING
+    assert window.next_deadline() == 130
+    assert not window.advance(129)
+    assert not window.stop_climate
+    assert window.advance(130)
+    assert window.state == WINDOW_STOPPED
+    assert window.stop_climate
+
+    assert window.update("binary_sensor.a", False, 200)
+    assert window.state == WINDOW_COOLDOWN
+    assert window.stop_climate
+    assert window.next_deadline() == 320
+    assert window.advance(320)
+    assert window.state == WINDOW_CLOSED
+    assert window.next_deadline() is None
+
+
+def test_closing_within_the_delay_needs_no_cooldown():
+    window = WindowMonitor(delay=120)
+    window.update("binary_sensor.a", True, 0)
+    assert window.update("binary_sensor.a", False, 60)
+    assert window.state == WINDOW_CLOSED
+    assert not window.stop_climate
+
+
+def test_reopening_in_the_cooldown_stops_at_once():
+    window = WindowMonitor(delay=120)
+    window.update("binary_sensor.a", True, 0)
+    window.update("binary_sensor.a", False, 200)
+    assert window.update("binary_sensor.b", True, 250)
+    assert window.state == WINDOW_STOPPED
+    assert window.next_deadline() is None
+
+
+def test_open_since_is_kept_per_sensor():
+    window = WindowMonitor(delay=120)
+    window.update("binary_sensor.a", True, 0, "Kitchen")
+    window.update("binary_sensor.b", True, 50, "Bedroom")
+    # Repeated open reports keep the first timestamp
+    window.update("binary_sensor.a", True, 90)
+    assert window.open_since == {"binary_sensor.a": 0, "binary_sensor.b": 50}
+    assert window.open_details == ["Kitchen", "Bedroom"]
+
+    # The delay runs from the first opening, closing one of two changes nothing
+    assert not window.update("binary_sensor.a", False, 100)
+    assert window.open_since == {"binary_sensor.b": 50}
+    assert window.next_deadline() == 120
+    window.advance(120)
+    assert window.state == WINDOW_STOPPED
+    window.update("binary_sensor.b", False, 300)
+    assert window.state == WINDOW_COOLDOWN
+    assert window.open_since == {}
+
+
+def test_coordinator_stops_and_restores_on_the_exact_deadline():
+    config = {
+        "data": {
+            "name": "Test", "heat_pump": "climate.hp",
+            "room_sensor": "sensor.room", "outside_sensor": "sensor.outside",
+            "window_sensors": ["binary_sensor.window"],
+        },
+        "options": {"min_run_time": 0, "window_delay": 2},
+    }
+    history = [
+        (T0, "sensor.outside", "5", None),
+        (T0, "sensor.room", "19", None),
+        (T0, "binary_sensor.window", "off", None),
+        (T0 + 90, "binary_sensor.window", "on", None),
+        (T0 + 400, "binary_sensor.window", "off", None),
+        (T0 + 1200, "sensor.outside", "5.1", None),
+    ]
+    _, timeline = asyncio.run(replay.replay(config, history, ventilation=False))
+    changes = [(entry["time"], entry["window_stop"], entry["action"]) for entry in timeline]
+    # Open at +90 with a 2 min delay, closed at +400 with a 2 min cooldown: neither waits for a 60 s tick
+    assert (T0 + 210, True, "off") in changes
+    assert (T0 + 520, False, "on") in changes
+    assert not [change for change in changes if T0 + 90 <= change[0] < T0 + 210 and change[1]]
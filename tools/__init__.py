@@ -0,0 +1 @@
+"""Offline developer tools: history replay and load testing with simulated Home Assistant."""
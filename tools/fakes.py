@@ -0,0 +1,333 @@
+"""In-memory stand-ins for the parts of Home Assistant the coordinator touches.
+
+Used by the offline tools (replay, load test). Only the real decision code runs:
+states, services, the event bus, storage and time are simulated.
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from custom_components.smart_climate_control import SmartClimateCoordinator
+from custom_components.smart_climate_control.clock import Clock
+
+
+async def _run(action: Callable, *args) -> None:
+    """Call a HA style callback, awaiting it when it is a coroutine."""
+    result = action(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+class FakeClock(Clock):
+    """Simulated time with a timer queue, sleeping returns immediately."""
+
+    def __init__(self, start_wall: float = 0.0) -> None:
+        self._mono = 0.0
+        self._wall_offset = start_wall
+        self._timers: List[Tuple[float, int, Callable]] = []
+        self._seq = itertools.count()
+        self._cancelled = set()
+
+    def monotonic(self) -> float:
+        return self._mono
+
+    def now(self) -> float:
+        return self._wall_offset + self._mono
+
+    def now_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.now(), tz=timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        self._mono += max(seconds, 0)
+
+    def call_later(self, delay: float, action: Callable) -> Callable[[], None]:
+        """Schedule action(now) on the simulated clock, returns a cancel function."""
+        seq = next(self._seq)
+        heapq.heappush(self._timers, (self._mono + max(delay, 0), seq, action))
+        return lambda: self._cancelled.add(seq)
+
+    def track_interval(self, interval: float, action: Callable) -> Callable[[], None]:
+        """Run action(now) every interval seconds."""
+        cancel: Dict[str, Callable[[], None]] = {}
+
+        async def _tick(now) -> None:
+            cancel["next"] = self.call_later(interval, _tick)
+            await _run(action, now)
+
+        cancel["next"] = self.call_later(interval, _tick)
+        return lambda: cancel["next"]()
+
+    async def run_until(self, mono_ts: float) -> None:
+        """Fire every timer due up to mono_ts, then move the clock there.
+
+        Timers that became overdue while a command slept fire at the current time,
+        the clock never goes backwards.
+        """
+        while self._timers and self._timers[0][0] <= mono_ts:
+            due, seq, action = heapq.heappop(self._timers)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            self._mono = max(self._mono, due)
+            await _run(action, self.now_datetime())
+        self._mono = max(self._mono, mono_ts)
+
+
+class ScaledClock(Clock):
+    """Real event loop time running speed times faster, for load tests.
+
+    Timers are real loop callbacks, so event loop lag and CPU cost are real,
+    while simulated minutes pass faster.
+    """
+
+    def __init__(self, speed: float = 1.0, start_wall: Optional[float] = None) -> None:
+        self.speed = speed
+        self._real_start = time.monotonic()
+        self._wall_start = time.time() if start_wall is None else start_wall
+
+    def monotonic(self) -> float:
+        return (time.monotonic() - self._real_start) * self.speed
+
+    def now(self) -> float:
+        return self._wall_start + self.monotonic()
+
+    def now_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.now(), tz=timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds / self.speed)
+
+    def call_later(self, delay: float, action: Callable) -> Callable[[], None]:
+        loop = asyncio.get_running_loop()
+        handle = loop.call_later(
+            max(delay, 0) / self.speed, lambda: loop.create_task(_run(action, self.now_datetime()))
+        )
+        return handle.cancel
+
+    def track_interval(self, interval: float, action: Callable) -> Callable[[], None]:
+        cancel: Dict[str, Callable[[], None]] = {}
+
+        async def _tick(now) -> None:
+            cancel["next"] = self.call_later(interval, _tick)
+            await _run(action, now)
+
+        cancel["next"] = self.call_later(interval, _tick)
+        return lambda: cancel["next"]()
+
+
+class FakeState:
+    """Minimal State object (state, attributes, name, last_updated)."""
+
+    def __init__(self, entity_id: str, state: str, attributes: Optional[Dict[str, Any]], last_updated: datetime) -> None:
+        self.entity_id = entity_id
+        self.domain = entity_id.split(".")[0]
+        self.state = state
+        self.attributes = dict(attributes or {})
+        self.last_updated = last_updated
+        self.last_changed = last_updated
+
+    @property
+    def name(self) -> str:
+        return self.attributes.get("friendly_name", self.entity_id)
+
+
+class FakeEvent:
+    def __init__(self, event_type: str, data: Dict[str, Any]) -> None:
+        self.event_type = event_type
+        self.data = data
+
+
+class FakeStates:
+    """State machine with per-entity change listeners."""
+
+    def __init__(self, clock: Clock) -> None:
+        self._clock = clock
+        self._states: Dict[str, FakeState] = {}
+        self._listeners: Dict[str, List[Callable]] = {}
+
+    def get(self, entity_id: str) -> Optional[FakeState]:
+        return self._states.get(entity_id)
+
+    def async_all(self) -> List[FakeState]:
+        return list(self._states.values())
+
+    def track(self, entity_ids: List[str], action: Callable) -> Callable[[], None]:
+        for entity_id in entity_ids:
+            self._listeners.setdefault(entity_id, []).append(action)
+
+        def _remove() -> None:
+            for entity_id in entity_ids:
+                if action in self._listeners.get(entity_id, []):
+                    self._listeners[entity_id].remove(action)
+        return _remove
+
+    async def async_set(self, entity_id: str, state: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Set a state and notify listeners when state or attributes changed."""
+        old_state = self._states.get(entity_id)
+        if attributes is None and old_state is not None:
+            attributes = old_state.attributes
+        if old_state is not None and old_state.state == state and old_state.attributes == (attributes or {}):
+            return
+        new_state = FakeState(entity_id, state, attributes, self._clock.now_datetime())
+        self._states[entity_id] = new_state
+        event = FakeEvent("state_changed", {"entity_id": entity_id, "old_state": old_state, "new_state": new_state})
+        for action in list(self._listeners.get(entity_id, [])):
+            await _run(action, event)
+
+
+class FakeServices:
+    """Service layer that records every call and echoes device commands into the states.
+
+    Echoing lets the coordinator's acknowledge/retry loops see the device follow
+    the command, like a healthy heat pump and fans would.
+    """
+
+    def __init__(self, clock: Clock, states: FakeStates) -> None:
+        self._clock = clock
+        self._states = states
+        self.calls: List[Dict[str, Any]] = []
+        self.echo = True
+
+    def async_register(self, domain: str, service: str, handler: Callable, schema: Any = None) -> None:
+        pass
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return True
+
+    async def async_call(self, domain: str, service: str, service_data: Optional[Dict[str, Any]] = None,
+                         blocking: bool = False, **kwargs) -> None:
+        data = dict(service_data or {})
+        self.calls.append({
+            "time": self._clock.now(),
+            "monotonic": self._clock.monotonic(),
+            "domain": domain,
+            "service": service,
+            "data": data,
+        })
+        if self.echo:
+            await self._echo(domain, service, data)
+
+    async def _echo(self, domain: str, service: str, data: Dict[str, Any]) -> None:
+        entity_ids = data.get("entity_id")
+        if not entity_ids:
+            return
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for entity_id in entity_ids:
+            current = self._states.get(entity_id)
+            attributes = dict(current.attributes) if current else {}
+            state = current.state if current else "off"
+            if domain == "climate" and service == "set_temperature":
+                state = data.get("hvac_mode", state)
+                attributes["temperature"] = data.get("temperature")
+                attributes["hvac_action"] = "cooling" if state == "cool" else "heating"
+            elif domain == "climate" and service == "set_hvac_mode":
+                state = data.get("hvac_mode", state)
+            elif service == "turn_off":
+                state = "off"
+                if domain == "climate":
+                    attributes["hvac_action"] = "off"
+            elif service == "turn_on":
+                state = "on" if domain != "climate" else state
+            elif domain == "fan" and service == "set_percentage":
+                state = "on"
+                attributes["percentage"] = data.get("percentage")
+            elif domain == "fan" and service == "set_direction":
+                attributes["direction"] = data.get("direction")
+            else:
+                continue
+            await self._states.async_set(entity_id, state, attributes)
+
+
+class FakeBus:
+    def __init__(self, clock: Clock) -> None:
+        self._clock = clock
+        self.events: List[Dict[str, Any]] = []
+
+    def async_fire(self, event_type: str, event_data: Optional[Dict[str, Any]] = None, **kwargs) -> None:
+        self.events.append({"time": self._clock.now(), "event_type": event_type, "data": dict(event_data or {})})
+
+
+class FakeConfig:
+    def __init__(self, config_dir: str) -> None:
+        self.config_dir = config_dir
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.config_dir, *parts)
+
+
+class FakeHass:
+    """Just enough of HomeAssistant for the coordinator and its Store."""
+
+    def __init__(self, clock: Clock, config_dir: Optional[str] = None) -> None:
+        self.clock = clock
+        self.data: Dict[str, Any] = {}
+        self.states = FakeStates(clock)
+        self.services = FakeServices(clock, self.states)
+        self.bus = FakeBus(clock)
+        self.config = FakeConfig(config_dir or tempfile.mkdtemp(prefix="smart_climate_"))
+
+    async def async_add_executor_job(self, func: Callable, *args) -> Any:
+        return func(*args)
+
+
+class FakeStore:
+    """In-memory replacement for helpers.storage.Store."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        self.data = data
+
+    async def async_load(self) -> Optional[Dict[str, Any]]:
+        return self.data
+
+    async def async_save(self, data: Dict[str, Any]) -> None:
+        self.data = data
+
+
+class FakeConfigEntry:
+    def __init__(self, entry_id: str, data: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> None:
+        self.entry_id = entry_id
+        self.data = data
+        self.options = options or {}
+        self.title = data.get("name", "Smart Climate Control")
+        self._on_unload: List[Callable] = []
+
+    def add_update_listener(self, listener: Callable) -> Callable[[], None]:
+        return lambda: None
+
+    def async_on_unload(self, func: Callable) -> None:
+        self._on_unload.append(func)
+
+
+class SimulatedCoordinator(SmartClimateCoordinator):
+    """The real coordinator wired to the fakes: listeners and timers run on the fake clock."""
+
+    def __init__(self, hass: FakeHass, entry: FakeConfigEntry, stored_data: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(hass, entry, clock=hass.clock)
+        self.store = FakeStore(stored_data)
+        self.decisions: List[Dict[str, Any]] = [] # Every changed decision with its wall time
+
+    def _set_decision(self, record: Dict[str, Any]) -> None:
+        if record != self.last_decision:
+            self.decisions.append({"time": self.clock.now(), **record})
+        super()._set_decision(record)
+
+    def _async_track_state(self, entity_ids: List[str], action: Callable) -> Callable[[], None]:
+        return self.hass.states.track(entity_ids, action)
+
+    def _async_call_later(self, delay: float, action: Callable) -> Callable[[], None]:
+        return self.clock.call_later(delay, action)
+
+    def _async_track_interval(self, interval: float, action: Callable) -> Callable[[], None]:
+        return self.clock.track_interval(interval, action)
+
+    async def async_start(self, ventilation: bool = True) -> List[Callable[[], None]]:
+        """Setup and the deferred start of async_setup_entry, on the fake clock."""
+        await self.async_initialize()
+        return await self.async_start_control(ventilation)
@@ -0,0 +1,243 @@
+"""Load test: many coordinators against one simulated Home Assistant core.
+
+Spins up N entries (default scenarios 10, 100 and 500) that share one fake
+state machine, service layer and event bus on the real event loop, feeds them
+realistic sensor streams and reports:
+
+- event loop lag (p50 / p95 / max, ms)
+- CPU time per entry per simulated minute
+- memory per coordinator (tracemalloc) and peak
+- service calls per entry per simulated minute
+
+Simulated time runs --speed times faster than real time. Lag is only
+representative of production at --speed 1, CPU and call rates at any speed.
+
+    python -m tools.loadtest --save-baseline tools/loadtest_baseline.json
+    python -m tools.loadtest --compare tools/loadtest_baseline.json
+
+The baseline records the machine and settings it was taken with under
+"_meta". Comparing against a baseline from another machine or speed only
+makes sense for the call rate.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from .fakes import FakeConfigEntry, FakeHass, ScaledClock, SimulatedCoordinator
+
+# Metrics compared against the baseline, all "lower is better"
+COMPARED_METRICS = (
+    "loop_lag_p95_ms",
+    "cpu_ms_per_entry_min",
+    "memory_kib_per_coordinator",
+    "calls_per_entry_min",
+)
+LAG_PROBE_INTERVAL = 0.05 # Real seconds between loop lag probes
+
+
+def entry_config(idx: int) -> Dict[str, Any]:
+    """Config of one simulated entry: a heat pump, two windows and one fan pair."""
+    return {
+        "name": f"Load {idx}",
+        "heat_pump": f"climate.hp_{idx}",
+        "room_sensor": f"sensor.room_{idx}",
+        "outside_sensor": "sensor.outside",
+        "average_sensor": f"sensor.avg_{idx}",
+        "window_sensors": [f"binary_sensor.window_{idx}_1", f"binary_sensor.window_{idx}_2"],
+        "fan_group_a": [f"fan.vent_{idx}_a"],
+        "fan_group_b": [f"fan.vent_{idx}_b"],
+        "humidity_sensor_a": [f"sensor.humidity_{idx}_a"],
+        "humidity_sensor_b": [f"sensor.humidity_{idx}_b"],
+    }
+
+
+async def _sensor_stream(hass: FakeHass, clock: ScaledClock, idx: int, rng: random.Random) -> None:
+    """Room temperature random walk, humidity with shower spikes and occasional window openings."""
+    room = rng.uniform(20.0, 22.5)
+    humidity = rng.uniform(45, 60)
+    shower_left = 0
+    while True:
+        await clock.sleep(30)
+        room += rng.uniform(-0.1, 0.1) + (0.03 if hass.states.get(f"climate.hp_{idx}").state == "heat" else -0.03)
+        await hass.states.async_set(f"sensor.room_{idx}", f"{room:.1f}")
+        await hass.states.async_set(f"sensor.avg_{idx}", f"{room - 0.3:.1f}")
+
+        if shower_left == 0 and rng.random() < 0.002:
+            shower_left = 20
+        humidity += 2.0 if shower_left else rng.uniform(-0.5, 0.4)
+        humidity = max(35.0, min(95.0, humidity))
+        shower_left = max(0, shower_left - 1)
+        await hass.states.async_set(f"sensor.humidity_{idx}_a", f"{humidity:.0f}")
+        await hass.states.async_set(f"sensor.humidity_{idx}_b", f"{humidity - 3:.0f}")
+
+        window = f"binary_sensor.window_{idx}_{rng.randint(1, 2)}"
+        if rng.random() < 0.003:
+            await hass.states.async_set(window, "on")
+        elif hass.states.get(window).state == "on" and rng.random() < 0.1:
+            await hass.states.async_set(window, "off")
+
+
+async def _outside_stream(hass: FakeHass, clock: ScaledClock, rng: random.Random) -> None:
+    outside = rng.uniform(-5, 8)
+    while True:
+        await clock.sleep(300)
+        outside += rng.uniform(-0.3, 0.3)
+        await hass.states.async_set("sensor.outside", f"{outside:.1f}")
+
+
+async def _lag_probe(lags: List[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_scenario(entries: int, minutes: float, speed: float, seed: int = 1) -> Dict[str, Any]:
+    """Run one scenario and return its metrics."""
+    rng = random.Random(seed)
+    clock = ScaledClock(speed)
+    hass = FakeHass(clock)
+
+    # Initial states
+    await hass.states.async_set("sensor.outside", "3.0")
+    for idx in range(entries):
+        await hass.states.async_set(f"climate.hp_{idx}", "off", {"hvac_action": "off"})
+        await hass.states.async_set(f"sensor.room_{idx}", "21.0")
+        await hass.states.async_set(f"sensor.avg_{idx}", "20.7")
+        await hass.states.async_set(f"sensor.humidity_{idx}_a", "50")
+        await hass.states.async_set(f"sensor.humidity_{idx}_b", "48")
+        for window in (1, 2):
+            await hass.states.async_set(f"binary_sensor.window_{idx}_{window}", "off")
+
+    gc.collect()
+    tracemalloc.start()
+    mem_before = tracemalloc.get_traced_memory()[0]
+    coordinators = [
+        SimulatedCoordinator(hass, FakeConfigEntry(f"load_{idx}", entry_config(idx), {"min_run_time": 10}))
+        for idx in range(entries)
+    ]
+    unsubs = []
+    for coordinator in coordinators:
+        unsubs.extend(await coordinator.async_start())
+    gc.collect()
+    mem_per_coordinator = (tracemalloc.get_traced_memory()[0] - mem_before) / entries
+    tracemalloc.stop()
+
+    lags: List[float] = []
+    tasks = [asyncio.create_task(_lag_probe(lags)), asyncio.create_task(_outside_stream(hass, clock, rng))]
+    tasks.extend(asyncio.create_task(_sensor_stream(hass, clock, idx, rng)) for idx in range(entries))
+
+    calls_before = len(hass.services.calls)
+    cpu_start = time.process_time()
+    sim_start = clock.monotonic()
+    await asyncio.sleep(minutes * 60 / speed)
+    sim_minutes = (clock.monotonic() - sim_start) / 60
+    cpu_used = time.process_time() - cpu_start
+    calls = len(hass.services.calls) - calls_before
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for unsub in unsubs:
+        unsub()
+
+    return {
+        "entries": entries,
+        "sim_minutes": round(sim_minutes, 1),
+        "speed": speed,
+        "loop_lag_p50_ms": round(statistics.median(lags), 2) if lags else 0.0,
+        "loop_lag_p95_ms": round(_percentile(lags, 95), 2),
+        "loop_lag_max_ms": round(max(lags), 2) if lags else 0.0,
+        "cpu_ms_per_entry_min": round(cpu_used * 1000 / entries / sim_minutes, 3),
+        "memory_kib_per_coordinator": round(mem_per_coordinator / 1024, 1),
+        "calls_per_entry_min": round(calls / entries / sim_minutes, 2),
+        "calls_total": calls,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a line per metric that got worse than baseline by more than tolerance (fraction)."""
+    regressions = []
+    for result in results:
+        base = baseline.get(str(result["entries"]))
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result[metric]
+            if old is None:
+                continue
+            # Small absolute values are noise (e.g. sub-millisecond lag)
+            if new > old * (1 + tolerance) and new - old > 0.5:
+                regressions.append(f"{result['entries']} entries: {metric} {old} -> {new}")
+    return regressions
+
+
+def run_meta(args: argparse.Namespace) -> Dict[str, Any]:
+    """Machine and settings a set of results was taken with."""
+    return {
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "minutes": args.minutes,
+        "speed": args.speed,
+        "seed": args.seed,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--minutes", type=float, default=30, help="Simulated minutes per scenario")
+    parser.add_argument("--speed", type=float, default=10, help="Simulated seconds per real second")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", help="Write results as the new baseline JSON")
+    parser.add_argument("--compare", help="Baseline JSON to compare against (exit 1 on regression)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression as a fraction")
+    args = parser.parse_args(argv)
+
+    results = []
+    for entries in args.entries:
+        result = asyncio.run(run_scenario(entries, args.minutes, args.speed, args.seed))
+        results.append(result)
+        print(json.dumps(result))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            baseline = {"_meta": run_meta(args)}
+            baseline.update((str(result["entries"]), result) for result in results)
+            json.dump(baseline, handle, indent=2)
+            handle.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        meta = baseline.get("_meta", {})
+        for key, value in run_meta(args).items():
+            if key in meta and meta[key] != value:
+                print(f"NOTE baseline {key} was {meta[key]}, this run {value}", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
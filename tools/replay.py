@@ -0,0 +1,231 @@
+"""Replay recorded Home Assistant history through the real coordinator.
+
+Streams a history export (CSV from the history panel, or the recorder's SQLite
+database) for the configured entities through SmartClimateCoordinator on a
+simulated clock, and prints the exact service calls it would have made.
+Weeks of data replay in seconds, so config changes can be compared offline.
+
+Usage (from the repository root, with homeassistant installed):
+
+    python -m tools.replay --config diagnostics.json --history home-assistant_v2.db
+    python -m tools.replay --config diagnostics.json --history history.csv \\
+        --options '{"deadband_below": 0.3}' --out commands.csv
+
+The config file is the diagnostics download of the entry (or any JSON with
+"data" and "options"). Heat pump and fan states in the history are ignored by
+default: they are outputs, the simulated devices follow the replayed commands.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from custom_components.smart_climate_control.const import (
+    CONF_AVERAGE_SENSOR,
+    CONF_BED_SENSORS,
+    CONF_DOOR_SENSOR,
+    CONF_FAN_GROUP_A,
+    CONF_FAN_GROUP_B,
+    CONF_HEAT_PUMP,
+    CONF_HEAT_PUMP_CONTACT,
+    CONF_HUMIDITY_SENSOR_A,
+    CONF_HUMIDITY_SENSOR_B,
+    CONF_LAG_HEAT_PUMPS,
+    CONF_OUTSIDE_HUMIDITY_SENSOR,
+    CONF_OUTSIDE_SENSOR,
+    CONF_PRESENCE_TRACKER,
+    CONF_PRICE_ENTITY,
+    CONF_ROOM_SENSOR,
+    CONF_ROOM_SENSORS,
+    CONF_VENT_ZONES,
+    CONF_WINDOW_SENSORS,
+)
+from custom_components.smart_climate_control.ventilation import as_list, parse_vent_zones
+
+from .fakes import FakeClock, FakeConfigEntry, FakeHass, SimulatedCoordinator
+
+# (timestamp, entity_id, state, attributes)
+HistoryRow = Tuple[float, str, str, Optional[Dict[str, Any]]]
+
+INPUT_KEYS = (
+    CONF_ROOM_SENSOR, CONF_ROOM_SENSORS, CONF_OUTSIDE_SENSOR, CONF_AVERAGE_SENSOR, CONF_DOOR_SENSOR,
+    CONF_WINDOW_SENSORS, CONF_BED_SENSORS, CONF_HEAT_PUMP_CONTACT, CONF_PRESENCE_TRACKER,
+    CONF_HUMIDITY_SENSOR_A, CONF_HUMIDITY_SENSOR_B, CONF_OUTSIDE_HUMIDITY_SENSOR, CONF_PRICE_ENTITY,
+)
+OUTPUT_KEYS = (CONF_HEAT_PUMP, CONF_LAG_HEAT_PUMPS, CONF_FAN_GROUP_A, CONF_FAN_GROUP_B)
+
+
+def _parse_time(value: str) -> float:
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _config_entities(config: Dict[str, Any], keys: Iterable[str], outputs: bool = False) -> Set[str]:
+    """Entities referenced by the given config keys, including the extra ventilation zones."""
+    entities = set()
+    for key in keys:
+        value = config["options"].get(key, config["data"].get(key))
+        entities.update(as_list(value))
+    for zone in parse_vent_zones(config["options"].get(CONF_VENT_ZONES)):
+        entities.update(zone.fans if outputs else zone.humidity_a + zone.humidity_b)
+    return entities
+
+
+def load_csv(path: str, entities: Optional[Set[str]] = None) -> List[HistoryRow]:
+    """Read a history panel CSV export (entity_id, state, last_changed)."""
+    rows = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        for record in csv.DictReader(handle):
+            entity_id = record["entity_id"]
+            if entities is not None and entity_id not in entities:
+                continue
+            ts = record.get("last_changed") or record.get("last_updated")
+            attributes = json.loads(record["attributes"]) if record.get("attributes") else None
+            rows.append((_parse_time(ts), entity_id, record["state"], attributes))
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def load_recorder(path: str, entities: Set[str], start: Optional[float] = None, end: Optional[float] = None) -> List[HistoryRow]:
+    """Read states from a recorder SQLite database (current and pre-2023.4 schema)."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(states)")}
+        placeholders = ",".join("?" * len(entities))
+        if "metadata_id" in columns and "last_updated_ts" in columns:
+            query = (
+                "SELECT s.last_updated_ts, m.entity_id, s.state, a.shared_attrs "
+                "FROM states s JOIN states_meta m ON s.metadata_id = m.metadata_id "
+                "LEFT JOIN state_attributes a ON s.attributes_id = a.attributes_id "
+                f"WHERE m.entity_id IN ({placeholders}) ORDER BY s.last_updated_ts"
+            )
+        else:
+            query = (
+                "SELECT s.last_updated, s.entity_id, s.state, s.attributes "
+                f"FROM states s WHERE s.entity_id IN ({placeholders}) ORDER BY s.last_updated"
+            )
+        rows = []
+        for ts, entity_id, state, attributes in conn.execute(query, sorted(entities)):
+            ts = ts if isinstance(ts, (int, float)) else _parse_time(ts)
+            if (start is not None and ts < start) or (end is not None and ts > end):
+                continue
+            rows.append((ts, entity_id, state, json.loads(attributes) if attributes else None))
+        return rows
+    finally:
+        conn.close()
+
+
+async def replay(
+    config: Dict[str, Any], history: List[HistoryRow], ventilation: bool = True,
+    stored_data: Optional[Dict[str, Any]] = None,
+) -> Tuple[SimulatedCoordinator, List[Dict[str, Any]]]:
+    """Stream history through a simulated coordinator.
+
+    Returns the coordinator and the decision timeline (one entry per changed decision).
+    """
+    if not history:
+        raise ValueError("History is empty for the configured entities")
+
+    start_wall = history[0][0]
+    clock = FakeClock(start_wall)
+    hass = FakeHass(clock)
+    entry = FakeConfigEntry("replay", dict(config["data"]), dict(config["options"]))
+    coordinator = SimulatedCoordinator(hass, entry, stored_data)
+
+    # Initial state: the first known value of every entity
+    seen = set()
+    for ts, entity_id, state, attributes in history:
+        if entity_id not in seen:
+            seen.add(entity_id)
+            await hass.states.async_set(entity_id, state, attributes)
+    for unit in coordinator.staging.units:
+        if hass.states.get(unit) is None:
+            # Outputs are not replayed, start from stopped heat pumps
+            await hass.states.async_set(unit, "off", {"hvac_action": "off"})
+    await coordinator.async_start(ventilation=ventilation)
+
+    for ts, entity_id, state, attributes in history:
+        await clock.run_until(ts - start_wall)
+        await hass.states.async_set(entity_id, state, attributes)
+    return coordinator, coordinator.decisions
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", required=True, help="Diagnostics JSON (or {\"data\": .., \"options\": ..})")
+    parser.add_argument("--history", required=True, help="History CSV export or recorder .db file")
+    parser.add_argument("--options", help="JSON object merged over the entry options (A/B comparisons)")
+    parser.add_argument("--start", help="ISO start time (recorder only)")
+    parser.add_argument("--end", help="ISO end time (recorder only)")
+    parser.add_argument("--no-ventilation", action="store_true", help="Skip the 2 s ventilation loop")
+    parser.add_argument("--keep-outputs", action="store_true", help="Also replay recorded heat pump/fan states")
+    parser.add_argument("--out", help="Write the command log as CSV instead of printing it")
+    parser.add_argument("--timeline", help="Write the decision timeline as JSON lines")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as handle:
+        config = json.load(handle)
+    if "data" in config:
+        config = {"data": config["data"], "options": config.get("options", {})}
+    else:
+        config = {"data": config, "options": {}}
+    if args.options:
+        config["options"] = {**config.get("options", {}), **json.loads(args.options)}
+
+    entities = _config_entities(config, INPUT_KEYS)
+    if args.keep_outputs:
+        entities |= _config_entities(config, OUTPUT_KEYS, outputs=True)
+
+    if args.history.endswith((".db", ".sqlite", ".sqlite3")):
+        start = _parse_time(args.start) if args.start else None
+        end = _parse_time(args.end) if args.end else None
+        history = load_recorder(args.history, entities, start, end)
+    else:
+        history = load_csv(args.history, entities)
+
+    coordinator, timeline = asyncio.run(replay(config, history, ventilation=not args.no_ventilation))
+    calls = coordinator.hass.services.calls
+
+    if args.timeline:
+        with open(args.timeline, "w", encoding="utf-8") as handle:
+            for item in timeline:
+                handle.write(json.dumps({**item, "time": _iso(item["time"])}) + "\n")
+
+    handle = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        writer = csv.writer(handle)
+        writer.writerow(["time", "domain", "service", "data"])
+        for call in calls:
+            writer.writerow([_iso(call["time"]), call["domain"], call["service"], json.dumps(call["data"])])
+    finally:
+        if args.out:
+            handle.close()
+
+    heat_pump_commands = sum(1 for call in calls if call["domain"] == "climate" and call["service"] == "set_temperature")
+    print(
+        f"Replayed {len(history)} states from {_iso(history[0][0])} to {_iso(history[-1][0])}: "
+        f"{len(calls)} service calls ({heat_pump_commands} set_temperature), {len(timeline)} decisions",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())